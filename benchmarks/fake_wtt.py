@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs
+
+from benchmarks.synthetic_tree import (
+    CITIES,
+    DATE_FORMAT,
+    EXCLUDED_NAMES,
+    SENIOR_NAMES,
+    make_match_row,
+)
+
+# Paths of the WTTRoutes urls - the host is ignored, so the real route dicts work as-is
+EVENTS_PATH = "/api/eventcalendar"
+EVENT_MATCHES_PATH = "/api/cms/GetOfficialResult"
+MATCH_DETAILS_PATH = "/api/cms/GetMatchCardDetails/"
+
+
+class FakeWTTConfig(NamedTuple):
+    latency_ms: float = 80.0  # Median response latency
+    latency_sigma: float = 0.6  # Log-normal spread, 0 gives a fixed latency
+    error_rate: float = 0.0  # Share of requests answered with a random 5xx
+    rate_limit: Optional[float] = None  # Requests/s above which the server answers 429
+    storm_every: Optional[float] = None  # Seconds between 429 storms
+    storm_seconds: float = 2.0  # Length of each 429 storm
+    retry_after: int = 1  # Retry-After sent with every 429
+    events_per_year: int = 200
+    matches_per_event: int = 125
+    padding_bytes: int = 0  # Extra bytes per match row, for multi-megabyte payloads
+    etags: bool = True  # Send ETags and answer If-None-Match with 304
+    seed: int = 0
+
+
+class FakeWTTStats(NamedTuple):
+    requests: int
+    by_status: Dict[int, int]
+    bytes_sent: int
+
+
+class FakeWTTServer:
+    """
+    ASGI stand-in for the WTT routes the collectors use.
+
+    eventcalendar (POST, year in the custom_filter payload) returns a
+    deterministic events page for the year. GetOfficialResult (GET, EventId
+    query) returns that event's matches, GetMatchCardDetails (GET,
+    /<event_id>/<document_code>) the match card of one of them. Latency, 5xx errors, 429 rate limits /
+    storms and payload sizes come from FakeWTTConfig.
+
+    Run it in-process with httpx.ASGITransport(app=FakeWTTServer(...)).
+    """
+
+    def __init__(self, config: FakeWTTConfig = FakeWTTConfig()):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._started = time.monotonic()
+        self._recent: Deque[float] = deque()
+        self._statuses: Counter = Counter()
+        self._bytes_sent = 0
+        self._events_cache: Dict[int, bytes] = {}
+
+    def stats(self) -> FakeWTTStats:
+        return FakeWTTStats(
+            requests=sum(self._statuses.values()),
+            by_status=dict(self._statuses),
+            bytes_sent=self._bytes_sent,
+        )
+
+    def events_for_year(self, year: int) -> List[dict]:
+        """
+        Returns the event rows of a year. Most events of past years are completed,
+        the current year is a mix and later years are in the future.
+        """
+        rng = random.Random(f"{self.config.seed}-{year}")
+        rows = []
+        for i in range(self.config.events_per_year):
+            senior = rng.random() < 0.7
+            template = rng.choice(SENIOR_NAMES if senior else EXCLUDED_NAMES)
+            start = datetime(year, 1, 1) + timedelta(days=rng.randint(0, 350))
+            end = start + timedelta(days=rng.randint(2, 9))
+            rows.append(
+                {
+                    "EventId": year * 10_000 + i,
+                    "EventName": template.format(city=rng.choice(CITIES), year=year),
+                    "StartDateTime": start.strftime(DATE_FORMAT),
+                    "EndDateTime": end.strftime(DATE_FORMAT),
+                }
+            )
+        return rows
+
+    def matches_for_event(self, event_id: int) -> List[dict]:
+        rng = random.Random(f"{self.config.seed}-{event_id}")
+        count = max(1, int(self.config.matches_per_event * rng.uniform(0.8, 1.2)))
+        rows = [make_match_row(event_id, m, rng) for m in range(count)]
+        if self.config.padding_bytes:
+            padding = "x" * self.config.padding_bytes
+            for row in rows:
+                row["padding"] = padding
+        return rows
+
+    def _latency(self) -> float:
+        median = self.config.latency_ms / 1000
+        if median <= 0:
+            return 0.0
+        if self.config.latency_sigma <= 0:
+            return median
+        return self._rng.lognormvariate(math.log(median), self.config.latency_sigma)
+
+    def _throttled(self) -> bool:
+        now = time.monotonic()
+        if self.config.storm_every:
+            into_cycle = (now - self._started) % self.config.storm_every
+            if into_cycle < self.config.storm_seconds:
+                return True
+        if self.config.rate_limit:
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.config.rate_limit:
+                return True
+            self._recent.append(now)
+        return False
+
+    def _route(
+        self, method: str, path: str, query: Dict[str, List[str]], body: bytes
+    ) -> Tuple[int, bytes]:
+        if path.endswith(EVENTS_PATH) and method == "POST":
+            try:
+                custom_filter = json.loads(json.loads(body)["custom_filter"])
+                year = int(custom_filter[0]["value"])
+            except (ValueError, KeyError, IndexError, TypeError):
+                return 400, b'{"error": "Bad custom_filter"}'
+            if year not in self._events_cache:
+                rows = self.events_for_year(year)
+                self._events_cache[year] = json.dumps(
+                    [{"Count": len(rows), "rows": rows}]
+                ).encode()
+            return 200, self._events_cache[year]
+
+        if path.endswith(EVENT_MATCHES_PATH) and method == "GET":
+            try:
+                event_id = int(query["EventId"][0])
+            except (KeyError, ValueError):
+                return 400, b'{"error": "Missing EventId"}'
+            return 200, json.dumps(self.matches_for_event(event_id)).encode()
+
+        if MATCH_DETAILS_PATH in path and method == "GET":
+            event_id, _, document_code = path.split(MATCH_DETAILS_PATH, 1)[1].partition(
+                "/"
+            )
+            rng = random.Random(f"{self.config.seed}-{event_id}-{document_code}")
+            games = [
+                f"{rng.choice([11, 12])}-{rng.randint(0, 9)}"
+                for _ in range(rng.randint(3, 5))
+            ]
+            card = {
+                "documentCode": document_code,
+                "eventId": event_id,
+                "gameScores": ",".join(games),
+            }
+            return 200, json.dumps({"match_card": card}).encode()
+
+        return 404, b'{"error": "Not Found"}'
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        await asyncio.sleep(self._latency())
+
+        headers = [(b"content-type", b"application/json")]
+        request_headers = dict(scope["headers"])
+        if self._throttled():
+            status, payload = 429, b'{"error": "Too Many Requests"}'
+            headers.append((b"retry-after", str(self.config.retry_after).encode()))
+        elif self._rng.random() < self.config.error_rate:
+            status = self._rng.choice([500, 502, 503, 504])
+            payload = b'{"error": "Injected error"}'
+        else:
+            query = parse_qs(scope["query_string"].decode())
+            status, payload = self._route(scope["method"], scope["path"], query, body)
+            if status == 200 and self.config.etags:
+                etag = f'"{hashlib.sha1(payload).hexdigest()}"'.encode()
+                headers.append((b"etag", etag))
+                if request_headers.get(b"if-none-match") == etag:
+                    status, payload = 304, b""
+
+        self._statuses[status] += 1
+        self._bytes_sent += len(payload)
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": payload})
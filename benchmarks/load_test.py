@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+import httpx
+
+from benchmarks.fake_wtt import FakeWTTConfig, FakeWTTServer, FakeWTTStats
+from src.collectors.event_collector import run_event_scraper
+from src.collectors.event_matches_collector import run_event_matches_scraper
+from src.collectors.pipeline import run_pipeline
+from src.config import EVENT_MATCHES_WORKERS
+from src.utils.api_client import TTStatsClient
+from src.utils.raw_catalog import RawCatalog
+from src.utils.task_journal import TaskJournal
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+SCENARIOS: Dict[str, FakeWTTConfig] = {
+    "baseline": FakeWTTConfig(),
+    "slow": FakeWTTConfig(latency_ms=600, latency_sigma=1.0),
+    "429-storm": FakeWTTConfig(rate_limit=40, storm_every=15, storm_seconds=3),
+    "errors": FakeWTTConfig(error_rate=0.1),
+    "big-payloads": FakeWTTConfig(
+        events_per_year=60, matches_per_event=400, padding_bytes=5000
+    ),
+}
+
+
+class TimingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a transport and records the latency and status of every response,
+    as seen by the client (including time spent queued in the fake server).
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        self.latencies.append(time.perf_counter() - start)
+        self.statuses[response.status_code] += 1
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class PhaseReport(NamedTuple):
+    phase: str
+    elapsed_s: float
+    requests: int
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    by_status: Dict[int, int]
+    peak_mb: float  # tracemalloc peak during the phase
+    files: int  # Raw files on disk after the phase
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+async def run_phase(name: str, run, transport: TimingTransport, folder: Path):
+    """
+    Runs one collector against the fake server and summarises what the client saw.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        await run()
+    finally:
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies = sorted(transport.latencies)
+    return PhaseReport(
+        phase=name,
+        elapsed_s=elapsed,
+        requests=len(latencies),
+        throughput_rps=len(latencies) / elapsed if elapsed else 0.0,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        max_ms=(latencies[-1] if latencies else 0.0) * 1000,
+        by_status=dict(sorted(transport.statuses.items())),
+        peak_mb=peak / 1_000_000,
+        files=sum(1 for path in folder.rglob("*.json*") if path.is_file()),
+    )
+
+
+async def run_load_test(
+    config: FakeWTTConfig,
+    years: List[int],
+    work_dir: Path,
+    num_workers: int,
+    pipeline: bool = False,
+) -> Tuple[List[PhaseReport], FakeWTTStats]:
+    """
+    Runs the real event and event matches scrapers against a fake WTT server.
+
+    Args:
+        config (FakeWTTConfig): Latency, error and payload settings of the server.
+        years (List[int]): The years to scrape.
+        work_dir (Path): Empty directory for the raw files and the catalog.
+        num_workers (int): Workers of the event matches scraper.
+        pipeline (bool): Also run the events -> event matches -> match details
+            pipeline from scratch, in its own directory.
+
+    Returns:
+        Tuple[List[PhaseReport], FakeWTTStats]: One report per scraper, and what the server saw.
+    """
+    server = FakeWTTServer(config)
+    events_dir = work_dir / "events"
+    matches_dir = work_dir / "event_matches"
+
+    reports = []
+    with (
+        RawCatalog(work_dir / "catalog.sqlite") as catalog,
+        TaskJournal(work_dir / "journal.sqlite") as journal,
+    ):
+        transport = TimingTransport(httpx.ASGITransport(app=server))
+        reports.append(
+            await run_phase(
+                "events",
+                lambda: run_event_scraper(
+                    years,
+                    output_dir=events_dir,
+                    catalog=catalog,
+                    stats_client=TTStatsClient(),
+                    transport=transport,
+                ),
+                transport,
+                events_dir,
+            )
+        )
+
+        transport = TimingTransport(httpx.ASGITransport(app=server))
+        reports.append(
+            await run_phase(
+                "event_matches",
+                lambda: run_event_matches_scraper(
+                    num_workers=num_workers,
+                    events_dir=events_dir,
+                    output_dir=matches_dir,
+                    catalog=catalog,
+                    stats_client=TTStatsClient(),
+                    transport=transport,
+                    journal=journal,
+                ),
+                transport,
+                matches_dir,
+            )
+        )
+
+        if pipeline:
+            pipeline_dir = work_dir / "pipeline"
+            transport = TimingTransport(httpx.ASGITransport(app=server))
+            reports.append(
+                await run_phase(
+                    "pipeline",
+                    lambda: run_pipeline(
+                        years,
+                        events_dir=pipeline_dir / "events",
+                        event_matches_dir=pipeline_dir / "event_matches",
+                        match_details_dir=pipeline_dir / "match_details",
+                        catalog=catalog,
+                        stats_client=TTStatsClient(),
+                        transport=transport,
+                    ),
+                    transport,
+                    pipeline_dir,
+                )
+            )
+    return reports, server.stats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the WTT collectors against a local fake server under load."
+    )
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="baseline")
+    parser.add_argument("--years", type=int, default=3, help="Years up to this year")
+    parser.add_argument("--events-per-year", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=EVENT_MATCHES_WORKERS)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Also run the collection pipeline, including match details",
+    )
+    args = parser.parse_args()
+
+    config = SCENARIOS[args.scenario]
+    if args.events_per_year is not None:
+        config = config._replace(events_per_year=args.events_per_year)
+    current_year = datetime.now().year
+    years = list(range(current_year - args.years + 1, current_year + 1))
+
+    with tempfile.TemporaryDirectory(prefix="tt_load_") as work_dir:
+        reports, server_stats = asyncio.run(
+            run_load_test(config, years, Path(work_dir), args.workers, args.pipeline)
+        )
+
+    print(f"\n--- 📊 Load test: {args.scenario} ---")
+    for r in reports:
+        print(
+            f"{r.phase:<14} {r.requests:>6} req in {r.elapsed_s:6.1f}s "
+            f"({r.throughput_rps:6.1f} req/s) | p50 {r.p50_ms:7.0f}ms "
+            f"p95 {r.p95_ms:7.0f}ms p99 {r.p99_ms:7.0f}ms max {r.max_ms:7.0f}ms | "
+            f"peak {r.peak_mb:6.1f}MB | {r.files} files | {r.by_status}"
+        )
+    print(f"Server sent {server_stats.bytes_sent / 1_000_000:.1f}MB")
+
+    output = args.output or RESULTS_DIR / f"load_{args.scenario}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "scenario": args.scenario,
+                "config": config._asdict(),
+                "years": years,
+                "phases": [r._asdict() for r in reports],
+                "server": server_stats._asdict(),
+            },
+            indent=4,
+        ),
+        encoding="utf-8",
+    )
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
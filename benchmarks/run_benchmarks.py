@@ -0,0 +1,430 @@
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks.synthetic_tree import (
+    SyntheticTree,
+    build_synthetic_tree,
+    make_match_row,
+)
+from src.collectors.event_collector import get_years_to_scrape
+from src.collectors.event_matches_collector import get_event_tasks
+from src.utils import event_index, match_index
+from src.utils.helper_logic import (
+    classify_events,
+    get_event_date_status,
+    is_senior_event,
+)
+from src.utils.io_handler import (
+    json_exists,
+    load_raw_bytes,
+    load_raw_json,
+    save_raw_json,
+)
+from src.utils.raw_catalog import RawCatalog
+from src.utils.raw_data_reporter import (
+    get_raw_event_matches_summary,
+    get_raw_events_summary,
+)
+from src.utils.raw_storage import iter_raw_files
+from src.utils.wtt_models import decode_match_records
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Tree sizes - "production" matches the full WTT backfill, "small" is a quick check
+SCALES = {
+    "production": {"years": 22, "events": 50_000, "match_rows": 500_000},
+    "small": {"years": 5, "events": 2_000, "match_rows": 20_000},
+}
+
+# A result is a regression when it is this much worse than the baseline
+DEFAULT_THRESHOLD = 1.25
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable[[], Any]
+    setup: Optional[Callable[[], None]] = None  # Run before every round, not timed
+    ops: int = 1  # Operations per call, e.g. files checked
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    wall_s: float  # Best wall time over the rounds
+    mean_s: float  # Mean wall time over the rounds
+    rounds: int
+    peak_mb: float  # Peak traced Python allocations during one call
+    files_opened: int  # open() calls during one call
+    ops: int
+
+
+class _OpenCounter:
+    """
+    Counts file opens through the "open" audit event.
+    Audit hooks cannot be removed, so the hook is installed once and toggled.
+    """
+
+    def __init__(self):
+        self.active = False
+        self.count = 0
+        sys.addaudithook(self._hook)
+
+    def _hook(self, event: str, args: tuple) -> None:
+        if self.active and event == "open":
+            self.count += 1
+
+
+_open_counter: Optional[_OpenCounter] = None
+
+
+def measure(benchmark: Benchmark, rounds: int = 3) -> BenchmarkResult:
+    """
+    Runs a benchmark `rounds` times for wall time, then once more under
+    tracemalloc and the open counter. The extra run keeps tracing overhead
+    out of the timings.
+
+    Args:
+        benchmark (Benchmark): The benchmark to run.
+        rounds (int): Number of timed rounds.
+
+    Returns:
+        BenchmarkResult: Timing, memory and file-open figures.
+    """
+    global _open_counter
+    if _open_counter is None:
+        _open_counter = _OpenCounter()
+
+    timings = []
+    for _ in range(rounds):
+        if benchmark.setup is not None:
+            benchmark.setup()
+        start = time.perf_counter()
+        benchmark.func()
+        timings.append(time.perf_counter() - start)
+
+    if benchmark.setup is not None:
+        benchmark.setup()
+    tracemalloc.start()
+    _open_counter.count = 0
+    _open_counter.active = True
+    try:
+        benchmark.func()
+    finally:
+        _open_counter.active = False
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=benchmark.name,
+        wall_s=min(timings),
+        mean_s=sum(timings) / len(timings),
+        rounds=rounds,
+        peak_mb=peak / 1_000_000,
+        files_opened=_open_counter.count,
+        ops=benchmark.ops,
+    )
+
+
+def build_benchmarks(
+    tree: SyntheticTree, scratch: Path, catalog: RawCatalog
+) -> List[Benchmark]:
+    """
+    Returns the planning / reporting hot path benchmarks over a synthetic tree.
+
+    Args:
+        tree (SyntheticTree): The generated raw data tree.
+        scratch (Path): Directory for files written by the benchmarks.
+        catalog (RawCatalog): Catalog used by the catalog variants, warmed up here.
+
+    Returns:
+        List[Benchmark]: The benchmarks, in run order.
+    """
+    now = datetime.now()
+    cut_off = now + timedelta(days=1)
+
+    event_rows = []
+    for event_file in iter_raw_files(tree.events_dir, "events_*.json"):
+        event_rows.extend(load_raw_json(tree.events_dir, event_file.name)[0]["rows"])
+    names = [row["EventName"] for row in event_rows]
+
+    match_files = [
+        (path.parent, path.name)
+        for year in tree.years
+        for path in iter_raw_files(
+            tree.event_matches_dir / str(year), "event_matches_*.json"
+        )
+    ]
+
+    for folder, filename in match_files:
+        catalog.lookup(folder / filename)
+    payload_files = match_files[:2000]
+
+    def cold_index() -> None:
+        event_index._indexes.clear()
+        (tree.events_dir / event_index.EVENT_INDEX_FILENAME).unlink(missing_ok=True)
+
+    def snapshot_index() -> None:
+        event_index._indexes.clear()
+        event_index.get_event_index(tree.events_dir)
+        event_index._indexes.clear()
+
+    def cold_match_index() -> None:
+        snapshot_index()
+        match_index._indexes.clear()
+        (tree.event_matches_dir / match_index.MATCH_INDEX_FILENAME).unlink(
+            missing_ok=True
+        )
+
+    def snapshot_match_index() -> None:
+        snapshot_index()
+        match_index._indexes.clear()
+        match_index.get_match_index(tree.event_matches_dir)
+        match_index._indexes.clear()
+
+    def matches_summary() -> str:
+        return get_raw_event_matches_summary(tree.events_dir, tree.event_matches_dir)
+
+    def event_tasks(with_catalog: bool) -> Callable[[], Any]:
+        return lambda: get_event_tasks(
+            tree.events_dir,
+            tree.event_matches_dir,
+            now.year,
+            cut_off,
+            catalog=catalog if with_catalog else None,
+        )
+
+    write_dir = scratch / "writes"
+    rng = random.Random(0)
+    payload = [make_match_row(1, m, rng) for m in range(15)]
+
+    def clean_writes() -> None:
+        shutil.rmtree(write_dir, ignore_errors=True)
+
+    def write_files() -> None:
+        for i in range(1000):
+            save_raw_json(payload, write_dir, f"event_matches_{i}.json")
+
+    return [
+        Benchmark(
+            "get_years_to_scrape",
+            lambda: get_years_to_scrape(tree.events_dir, tree.years[0], now.year),
+            ops=len(tree.years),
+        ),
+        Benchmark(
+            "is_senior_event",
+            lambda: [is_senior_event(name) for name in names],
+            ops=len(names),
+        ),
+        Benchmark(
+            "get_event_date_status",
+            lambda: [get_event_date_status(row) for row in event_rows],
+            ops=len(event_rows),
+        ),
+        Benchmark(
+            "classify_events",
+            lambda: classify_events(event_rows, current_date=now),
+            ops=len(event_rows),
+        ),
+        Benchmark("get_event_tasks[cold]", event_tasks(False), setup=cold_index),
+        Benchmark(
+            "get_event_tasks[snapshot]", event_tasks(False), setup=snapshot_index
+        ),
+        Benchmark(
+            "get_event_tasks[snapshot+catalog]", event_tasks(True), setup=snapshot_index
+        ),
+        Benchmark(
+            "json_exists",
+            lambda: [json_exists(folder, name) for folder, name in match_files],
+            ops=len(match_files),
+        ),
+        Benchmark(
+            "json_exists[catalog]",
+            lambda: [
+                json_exists(folder, name, catalog) for folder, name in match_files
+            ],
+            ops=len(match_files),
+        ),
+        Benchmark("save_raw_json", write_files, setup=clean_writes, ops=1000),
+        Benchmark(
+            "load_match_payloads[dicts]",
+            lambda: [load_raw_json(folder, name) for folder, name in payload_files],
+            ops=len(payload_files),
+        ),
+        Benchmark(
+            "load_match_payloads[structs]",
+            lambda: [
+                decode_match_records(load_raw_bytes(folder, name))
+                for folder, name in payload_files
+            ],
+            ops=len(payload_files),
+        ),
+        Benchmark(
+            "get_raw_events_summary[cold]",
+            lambda: get_raw_events_summary(tree.events_dir),
+            setup=cold_index,
+        ),
+        Benchmark(
+            "get_raw_events_summary[snapshot]",
+            lambda: get_raw_events_summary(tree.events_dir),
+            setup=snapshot_index,
+        ),
+        Benchmark(
+            "get_raw_event_matches_summary[cold]",
+            matches_summary,
+            setup=cold_match_index,
+            ops=len(match_files),
+        ),
+        Benchmark(
+            "get_raw_event_matches_summary[snapshot]",
+            matches_summary,
+            setup=snapshot_match_index,
+            ops=len(match_files),
+        ),
+    ]
+
+
+def compare_results(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, dict],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """
+    Compares results against a saved baseline.
+
+    Args:
+        results (List[BenchmarkResult]): The current results.
+        baseline (Dict[str, dict]): Baseline results keyed by benchmark name.
+        threshold (float): Allowed slowdown / memory growth factor.
+
+    Returns:
+        List[str]: One line per regression (wall time, peak memory or more file opens).
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        if result.wall_s > base["wall_s"] * threshold:
+            regressions.append(
+                f"{result.name}: wall {base['wall_s']:.3f}s -> {result.wall_s:.3f}s"
+            )
+        if result.peak_mb > base["peak_mb"] * threshold:
+            regressions.append(
+                f"{result.name}: peak {base['peak_mb']:.1f}MB -> {result.peak_mb:.1f}MB"
+            )
+        if result.files_opened > base["files_opened"]:
+            regressions.append(
+                f"{result.name}: opens {base['files_opened']} -> {result.files_opened}"
+            )
+    return regressions
+
+
+def save_results(
+    results: List[BenchmarkResult], path: Path, tree: SyntheticTree
+) -> None:
+    """
+    Writes results as JSON, keyed by benchmark name, with the tree size they ran on.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "generated_on": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "tree": {
+            "years": len(tree.years),
+            "events": tree.events,
+            "match_files": tree.match_files,
+            "match_rows": tree.match_rows,
+        },
+        "results": {result.name: result._asdict() for result in results},
+    }
+    path.write_text(json.dumps(report, indent=4), encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the planning and reporting hot paths on a synthetic WTT tree."
+    )
+    parser.add_argument("--scale", choices=sorted(SCALES), default="production")
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=None,
+        help="Where to generate (and reuse) the synthetic tree, defaults to a temp dir",
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--only", default=None, help="Only run benchmarks containing this"
+    )
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Also save the results as the baseline for later --compare runs",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=RESULTS_DIR / "baseline.json",
+        default=None,
+        help="Baseline JSON to compare against (exit code 1 on regressions)",
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or Path(tempfile.gettempdir()) / f"tt_bench_{args.scale}"
+    print(f"Generating / reusing synthetic tree in {data_dir} ...")
+    start = time.perf_counter()
+    tree = build_synthetic_tree(data_dir, **SCALES[args.scale])
+    print(
+        f"Tree: {len(tree.years)} years, {tree.events} events, "
+        f"{tree.match_files} match files, {tree.match_rows} match rows "
+        f"({time.perf_counter() - start:.1f}s)\n"
+    )
+
+    with (
+        tempfile.TemporaryDirectory(prefix="tt_bench_scratch_") as scratch,
+        RawCatalog(Path(scratch) / "catalog.sqlite") as catalog,
+    ):
+        benchmarks = build_benchmarks(tree, Path(scratch), catalog)
+        if args.only:
+            benchmarks = [b for b in benchmarks if args.only in b.name]
+
+        results = []
+        print(f"{'benchmark':<36}{'best':>10}{'mean':>10}{'peak MB':>10}{'opens':>8}")
+        for benchmark in benchmarks:
+            result = measure(benchmark, args.rounds)
+            results.append(result)
+            print(
+                f"{result.name:<36}{result.wall_s:>9.3f}s{result.mean_s:>9.3f}s"
+                f"{result.peak_mb:>10.1f}{result.files_opened:>8}"
+            )
+
+    save_results(results, args.output, tree)
+    print(f"\nResults saved to {args.output}")
+    if args.save_baseline:
+        save_results(results, RESULTS_DIR / "baseline.json", tree)
+        print(f"Baseline saved to {RESULTS_DIR / 'baseline.json'}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\n✅ No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
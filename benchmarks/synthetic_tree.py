@@ -0,0 +1,171 @@
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, NamedTuple
+
+from src.config import RAW_STORAGE_FORMAT
+from src.utils.raw_storage import encode_raw_json, stored_path
+
+# Name templates - a realistic mix of senior and youth / para / veteran events
+SENIOR_NAMES = [
+    "WTT Contender {city} {year}",
+    "WTT Star Contender {city} {year}",
+    "WTT Champions {city} {year}",
+    "WTT Feeder {city} {year}",
+    "ITTF World Team Championships {year}",
+    "{city} Open {year}",
+]
+EXCLUDED_NAMES = [
+    "WTT Youth Contender {city} {year}",
+    "ITTF World Junior Championships {year}",
+    "{city} Para Open {year}",
+    "World Veterans Championships {year}",
+    "{city} U21 Open {year}",
+]
+CITIES = ["Doha", "Muscat", "Lima", "Tunis", "Zagreb", "Almaty", "Bangkok", "Rio"]
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# Marker file describing the generated tree, used to reuse it across runs
+MANIFEST_NAME = "synthetic_tree.json"
+
+
+class SyntheticTree(NamedTuple):
+    root: Path
+    events_dir: Path  # events_<year>.json files
+    event_matches_dir: Path  # <year>/event_matches_<id>.json files
+    years: List[int]
+    events: int  # Event rows written, including year boundary duplicates
+    match_files: int
+    match_rows: int
+
+
+def _tree_from_manifest(root: Path, manifest: dict) -> SyntheticTree:
+    return SyntheticTree(
+        root=root,
+        events_dir=root / "events",
+        event_matches_dir=root / "event_matches",
+        years=manifest["years"],
+        events=manifest["events"],
+        match_files=manifest["match_files"],
+        match_rows=manifest["match_rows"],
+    )
+
+
+def _write(data, folder: Path, filename: str) -> None:
+    # plain write - generation should not be slowed down by the code under test
+    folder.mkdir(parents=True, exist_ok=True)
+    path = stored_path(folder, filename, RAW_STORAGE_FORMAT)
+    path.write_bytes(encode_raw_json(data, RAW_STORAGE_FORMAT))
+
+
+def make_match_row(event_id: int, match_no: int, rng: random.Random) -> dict:
+    """
+    Returns one WTT-shaped row of an event matches payload.
+    """
+    return {
+        "documentCode": f"TTE{event_id:06d}{match_no:05d}",
+        "eventId": event_id,
+        "subEventName": rng.choice(
+            ["Men's Singles", "Women's Singles", "Mixed Doubles"]
+        ),
+        "matchDateTime": "2024-01-01T10:00:00",
+        "resultOverallScores": rng.choice(["3-0", "3-1", "3-2", "2-3", "1-3"]),
+        "competitiors": [
+            {"competitorId": str(rng.randint(1, 200_000)), "competitorType": "A"},
+            {"competitorId": str(rng.randint(1, 200_000)), "competitorType": "H"},
+        ],
+    }
+
+
+def build_synthetic_tree(
+    root: Path,
+    years: int = 22,
+    events: int = 50_000,
+    match_rows: int = 500_000,
+    seed: int = 0,
+) -> SyntheticTree:
+    """
+    Generates a WTT-shaped raw data tree for benchmarking.
+
+    Events are spread evenly over `years` years ending next year. About 2% of
+    them start in late December and are also listed in the next year's file,
+    like the real year route does. Every completed senior event gets an event
+    matches file, together holding `match_rows` rows.
+
+    An existing tree with the same parameters under root is reused.
+
+    Args:
+        root (Path): Directory to generate the tree in.
+        years (int): Number of events_<year>.json files.
+        events (int): Number of distinct events.
+        match_rows (int): Total rows across all event matches files.
+        seed (int): Random seed, the same parameters always give the same tree.
+
+    Returns:
+        SyntheticTree: Paths and counts of the generated tree.
+    """
+    params = {"years": years, "events": events, "match_rows": match_rows, "seed": seed}
+    manifest_path = root / MANIFEST_NAME
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("params") == params:
+            return _tree_from_manifest(root, manifest)
+
+    rng = random.Random(seed)
+    last_year = datetime.now().year + 1
+    year_list = list(range(last_year - years + 1, last_year + 1))
+    per_year = max(1, events // years)
+    now = datetime.now()
+
+    rows_by_year = {year: [] for year in year_list}
+    completed_senior = []
+    event_id = 1000
+    for year in year_list:
+        for i in range(per_year):
+            event_id += 1
+            senior = rng.random() < 0.7
+            template = rng.choice(SENIOR_NAMES if senior else EXCLUDED_NAMES)
+            boundary = rng.random() < 0.02
+            if boundary:
+                start = datetime(year, 12, 28)
+            else:
+                start = datetime(year, 1, 1) + timedelta(days=rng.randint(0, 350))
+            end = start + timedelta(days=rng.randint(2, 9))
+            row = {
+                "EventId": event_id,
+                "EventName": template.format(city=rng.choice(CITIES), year=year),
+                "StartDateTime": start.strftime(DATE_FORMAT),
+                "EndDateTime": end.strftime(DATE_FORMAT),
+                "Country": rng.choice(CITIES),
+            }
+            rows_by_year[year].append(row)
+            if boundary and year + 1 in rows_by_year:
+                rows_by_year[year + 1].append(row)
+            if senior and end < now:
+                completed_senior.append((event_id, year))
+
+    events_dir = root / "events"
+    total_rows = 0
+    for year, rows in rows_by_year.items():
+        _write([{"Count": len(rows), "rows": rows}], events_dir, f"events_{year}.json")
+        total_rows += len(rows)
+
+    event_matches_dir = root / "event_matches"
+    rows_left = match_rows
+    for n, (event_id, year) in enumerate(completed_senior):
+        count = rows_left // (len(completed_senior) - n)
+        rows_left -= count
+        payload = [make_match_row(event_id, m, rng) for m in range(count)]
+        _write(payload, event_matches_dir / str(year), f"event_matches_{event_id}.json")
+
+    manifest = {
+        "params": params,
+        "years": year_list,
+        "events": total_rows,
+        "match_files": len(completed_senior),
+        "match_rows": match_rows,
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=4))
+    return _tree_from_manifest(root, manifest)
@@ -1,7 +1,8 @@
 import asyncio
 import httpx
 import time
-from typing import Tuple
+from contextlib import nullcontext
+from typing import Any, Callable, Optional, Tuple
 from datetime import datetime
 from tqdm.asyncio import tqdm
 from pathlib import Path
@@ -9,14 +10,26 @@ from src.utils.api_client import TTStatsClient
 from src.utils.routes import WTTRoutes
 from src.utils.io_handler import save_raw_json, json_exists
 from src.utils.helper_logic import get_event_count_from_file
+from src.utils.raw_catalog import RawCatalog
+from src.utils.response_cache import open_response_cache
+from src.utils.change_detection import (
+    conditional_headers,
+    fetch_source,
+    is_unchanged,
+)
+from src.utils.write_behind import WriteBehindWriter
 from src.config import RAW_EVENTS_DIR
 
 
 def get_years_to_scrape(
-    output_dir: Path, start_yr: int = 2021, current_year: int = datetime.now().year
+    output_dir: Path,
+    start_yr: int = 2021,
+    current_year: int = datetime.now().year,
+    catalog: Optional[RawCatalog] = None,
 ) -> list[int]:
     """
     Determines which years to scrape based on existing data and the current year.
+    If a raw catalog is given, existing files are checked against it instead of being parsed.
     """
 
     # end_year is current + 2 to see future events out of interest.
@@ -27,7 +40,7 @@ def get_years_to_scrape(
     for year in all_years:
         filename = f"events_{year}.json"
 
-        if not json_exists(output_dir, filename) or year >= current_year:
+        if year >= current_year or not json_exists(output_dir, filename, catalog):
             years_to_scrape.append(year)
 
     return years_to_scrape
@@ -37,8 +50,11 @@ async def process_year(
     client: TTStatsClient,
     http_client: httpx.AsyncClient,
     year: int,
-    semaphore: asyncio.Semaphore,
+    semaphore: Optional[asyncio.Semaphore] = None,
     output_dir: Path = RAW_EVENTS_DIR,
+    catalog: Optional[RawCatalog] = None,
+    writer: Optional[WriteBehindWriter] = None,
+    on_payload: Optional[Callable[[Any], None]] = None,
 ) -> Tuple[int, int]:
     ### scrapes one year using sempahore and progress bar
 
@@ -49,29 +65,58 @@ async def process_year(
         client (TTStatsClient): The client to use for making requests.
         http_client (httpx.AsyncClient): The underlying HTTP client.
         year (int): The year to scrape.
-        semaphore (asyncio.Semaphore): The sempahore to use for limiting concurrent requests.
+        semaphore (Optional[asyncio.Semaphore]): Optional extra bound on concurrent requests,
+            the client's adaptive rate limiter always applies.
+        output_dir (Path): The directory to save the events file in.
+        catalog (Optional[RawCatalog]): Raw catalog used for the previous count and updated on write.
+            With a catalog, the request is conditional and an unchanged response is
+            neither decoded nor rewritten.
+        writer (Optional[WriteBehindWriter]): If given, the file is written in the background
+            instead of blocking the event loop.
+        on_payload (Optional[Callable[[Any], None]]): Called with the decoded payload of a
+            new or changed response, e.g. to hand its events to the next pipeline stage.
 
     Returns:
         Tuple[int, int]: A tuple containing the total number of events found and the number of new events added.
     """
 
-    async with semaphore:
+    async with semaphore if semaphore is not None else nullcontext():
         route = WTTRoutes.get_events_year_route(year)
 
         try:
 
             filename = f"events_{year}.json"
-            old_count = get_event_count_from_file(output_dir, filename)
-
-            data = await client.post_wtt_async(
-                client=http_client,
-                url=route["url"],
-                json_payload=route["json_payload"],
-                headers=route["headers"],
+            entry = None
+            if catalog is not None:
+                # SQLite, or a full read of the file on a miss - off the event loop
+                entry = await asyncio.to_thread(catalog.lookup, output_dir / filename)
+                old_count = entry.row_count if entry is not None else 0
+            else:
+                old_count = get_event_count_from_file(output_dir, filename)
+
+            response = await client.fetch_route_async(
+                http_client, route, extra_headers=conditional_headers(entry)
             )
 
-            filename = f"events_{year}.json"
-            save_raw_json(data, output_dir, filename)
+            # same payload as the stored copy - skip decoding and the write
+            if is_unchanged(response, entry):
+                await asyncio.to_thread(catalog.mark_checked, output_dir / filename)
+                return old_count, 0
+
+            response.raise_for_status()
+            data = response.json()
+            source = fetch_source(response)
+            if on_payload is not None:
+                on_payload(data)
+
+            if writer is not None:
+                await writer.submit(
+                    data, output_dir, filename, catalog=catalog, source=source
+                )
+            else:
+                save_raw_json(
+                    data, output_dir, filename, catalog=catalog, source=source
+                )
 
             new_count = 0
             if isinstance(data, list) and len(data) > 0:
@@ -89,55 +134,104 @@ async def process_year(
             return 0, 0
 
 
-async def run_event_scraper(years_to_scrape: list[int]) -> None:
+async def run_event_scraper(
+    years_to_scrape: list[int],
+    output_dir: Path = RAW_EVENTS_DIR,
+    catalog: Optional[RawCatalog] = None,
+    stats_client: Optional[TTStatsClient] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> None:
     """
     Runs the event scraper which scrapes all available event data from the WTT API.
 
     This function initializes a TTStatsClient with default settings, then launches
-    tasks to scrape each year of events from the WTT API. Each task is bounded
-    by a semaphore to limit the number of concurrent requests. The function
+    tasks to scrape each year of events from the WTT API. Requests are paced by
+    the client's adaptive rate limiter rather than a fixed semaphore. The function
     then gathers all the tasks and prints out the total number of events found,
     the number of new events found, and the total time taken to complete the
     scraping.
 
+    Args:
+        years_to_scrape (list[int]): The years to scrape.
+        output_dir (Path): The directory to save the events files in.
+        catalog (Optional[RawCatalog]): Raw catalog to use, defaults to the project catalog.
+        stats_client (Optional[TTStatsClient]): Client to use, defaults to a new client
+            with the project response cache (TT_RESPONSE_CACHE).
+        transport (Optional[httpx.AsyncBaseTransport]): Transport for the HTTP client,
+            e.g. to run against a local fake server instead of the WTT API.
+
     Returns:
         None
     """
 
     # Initialize Client with default settings
-    stats_client = TTStatsClient()
+    owns_client = stats_client is None
+    cache = None
+    if owns_client:
+        cache = open_response_cache()
+        stats_client = TTStatsClient(cache=cache)
     start_time = time.time()
-    semaphore = asyncio.Semaphore(50)
 
     print("--- 🟢 Commencing Event Scraper 🟢---")
 
-    async with httpx.AsyncClient(timeout=30.0) as http_client:
-        tasks = []
-        years = years_to_scrape
-
-        for year in years:
-            task = asyncio.create_task(
-                process_year(stats_client, http_client, year, semaphore)
-            )
-            tasks.append(task)
-
-        print(f"🚀 Launching {len(tasks)} tasks...")
-
-        results = await tqdm.gather(*tasks, desc="Scraping Events", unit="year")
-
-        total_events = sum([result[0] for result in results if result is not None])
-        new_events = sum([result[1] for result in results if result is not None])
-
-        elapsed = time.time() - start_time
-        minutes = int(elapsed // 60)
-        seconds = int(elapsed % 60)
-
-        print(f"\n🎉 Completed {len(results)} tasks in {minutes}m {seconds}s.")
-        print(f"Total events found: {total_events}")
-        print(f"New events found: {new_events}")
-        print("--- 🟢 Event Scraper Complete 🟢---")
+    owns_catalog = catalog is None
+    catalog = catalog or RawCatalog()
+    try:
+        # the client's shared connection pool, reused across runs
+        http_client = stats_client.http_client(transport)
+        async with WriteBehindWriter() as writer:
+            tasks = []
+            years = years_to_scrape
+
+            for year in years:
+                task = asyncio.create_task(
+                    process_year(
+                        stats_client,
+                        http_client,
+                        year,
+                        output_dir=output_dir,
+                        catalog=catalog,
+                        writer=writer,
+                    )
+                )
+                tasks.append(task)
+
+            print(f"🚀 Launching {len(tasks)} tasks...")
+
+            results = await tqdm.gather(*tasks, desc="Scraping Events", unit="year")
+            # make sure every file is on disk before reporting
+            await writer.flush()
+            writes = writer.stats()
+            checked, unchanged = catalog.fetch_summary(since=start_time)
+
+            total_events = sum([result[0] for result in results if result is not None])
+            new_events = sum([result[1] for result in results if result is not None])
+
+            elapsed = time.time() - start_time
+            minutes = int(elapsed // 60)
+            seconds = int(elapsed % 60)
+
+            print(f"\n🎉 Completed {len(results)} tasks in {minutes}m {seconds}s.")
+            print(f"Total events found: {total_events}")
+            print(f"New events found: {new_events}")
+            print(f"Files written: {writes.written} (failed: {writes.failed})")
+            print(f"Unchanged (no-op) fetches: {unchanged} of {checked}")
+            for line in stats_client.summary():
+                print(line)
+            print("--- 🟢 Event Scraper Complete 🟢---")
+    finally:
+        if owns_catalog:
+            catalog.close()
+        if owns_client:
+            # the client was created here, close its connections too
+            await stats_client.aclose()
+            if cache is not None:
+                cache.close()
 
 
 if __name__ == "__main__":
-    years_to_scrape = get_years_to_scrape(output_dir=RAW_EVENTS_DIR)
+    with RawCatalog() as catalog:
+        years_to_scrape = get_years_to_scrape(
+            output_dir=RAW_EVENTS_DIR, catalog=catalog
+        )
     asyncio.run(run_event_scraper(years_to_scrape))
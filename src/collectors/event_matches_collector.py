@@ -1,30 +1,36 @@
+import argparse
 import asyncio
 import httpx
-import json
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Tuple, NamedTuple
+from typing import Any, Callable, Dict, List, Tuple, NamedTuple, Optional
 from tqdm.asyncio import tqdm
 import time
 from typing import Union
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
-
 from src.config import (
     RAW_EVENTS_DIR,
     RAW_EVENT_MATCHES_DIR,
+    EVENT_MATCHES_WORKERS,
 )
 from src.utils.api_client import TTStatsClient
 from src.utils.routes import WTTRoutes
-from src.utils.io_handler import save_raw_json, json_exists
-from src.utils.helper_logic import (
-    get_event_date_status,
-    is_senior_event,
+from src.utils.io_handler import save_raw_json, json_exists, count_raw_rows
+from src.utils.raw_storage import resolve_raw_path
+from src.utils.event_index import EventRecord, dedupe_events, get_event_index
+from src.utils.helper_logic import get_date_statuses
+from src.utils.raw_catalog import RawCatalog
+from src.utils.response_cache import open_response_cache
+from src.utils.retry_policy import RetryPolicy
+from src.utils.change_detection import (
+    conditional_headers,
+    fetch_source,
+    is_unchanged,
 )
+from src.utils.scheduler import RunBudget, count_by_priority, event_priority
+from src.utils.task_journal import TaskJournal
+from src.utils.task_queue import run_worker_pool
+from src.utils.write_behind import WriteBehindWriter, save_outcome
 
 # Get the current year and date
 # Use an offset of 1 day for safe current date to account for potential timezone differences
@@ -34,12 +40,50 @@ current_date = datetime.now()
 current_date_offset = current_date + timedelta(days=1)
 ongoing_cut_off_date = current_date + timedelta(days=1)
 
+# Name of this scraper's runs in the task journal
+JOURNAL_SCRAPER = "event_matches"
+
 
 class EventTaskAnalysis(NamedTuple):
-    queue: List[Tuple[int, int]]  # The list of (event_id, year) to scrape
+    queue: List[Tuple[int, int]]  # The (event_id, year) to scrape, most urgent first
     total_found: int  # Total raw events in files
     total_senior: int  # Total after Senior filter
     total_skipped: int
+    total_duplicates: (
+        int  # Events listed in more than one year file, collapsed to one task
+    )
+    by_priority: Dict[str, int]  # Queued events per priority name
+
+
+def should_scrape_event(
+    event: EventRecord,
+    event_date_status: Optional[str],
+    event_matches_dir: Path,
+    catalog: Optional[RawCatalog] = None,
+) -> bool:
+    """
+    Decides whether the matches of a senior event need to be (re-)scraped.
+    Ongoing events always are, completed events only if their file is missing or invalid.
+
+    Args:
+        event (EventRecord): The event, its year picks the event matches sub-directory.
+        event_date_status (Optional[str]): "future", "ongoing" or "completed".
+        event_matches_dir (Path): The directory containing the year sub-directories.
+        catalog (Optional[RawCatalog]): If given, "exists and valid" is answered from the catalog.
+
+    Returns:
+        bool: True if the event matches should be fetched.
+    """
+    # if event is ongoing, re-scrape if data is missing
+    if event_date_status == "ongoing":
+        return True
+
+    # if event is completed, re-scrape if data is missing
+    return event_date_status == "completed" and not json_exists(
+        event_matches_dir / str(event.year),
+        f"event_matches_{event.event_id}.json",
+        catalog,
+    )
 
 
 def get_event_tasks(
@@ -47,67 +91,67 @@ def get_event_tasks(
     event_matches_dir: Path,
     current_year: int,
     ongoing_cut_off_date: datetime,
+    catalog: Optional[RawCatalog] = None,
 ) -> EventTaskAnalysis:
     """
     Analyse the event tasks and return the total number of events to scrape.
+
+    Event matches files are stored in year sub-directories of event_matches_dir.
+    Events come from the shared EventIndex, so unchanged events files are not re-parsed.
+    If a raw catalog is given, "exists and valid" is answered from the catalog
+    instead of parsing every existing event_matches file.
+
+    The queue is in priority order (see event_priority): ongoing events first,
+    then recently completed ones, then historical gaps, the latest events
+    first within each, so a run cut short by its budget did the most useful work.
     """
     events_to_scrape = []
-    total_events = 0
+    priorities: Dict[Tuple[int, int], int] = {}
+    end_dates: Dict[Tuple[int, int], float] = {}
+    reference_date = ongoing_cut_off_date - timedelta(days=1)
     total_senior = 0
 
-    event_files = sorted(events_dir.glob("events_*.json"))
-    for event_file in event_files:
-        try:
-            year = int(event_file.stem.split("_")[1])
-        except (IndexError, ValueError):
-            continue
+    index = get_event_index(events_dir)
+    total_events = sum(index.row_count(year) for year in index.years())
+    # an event spanning a year boundary is listed in both year files, queue it once
+    events_list, total_duplicates = dedupe_events(index.events())
+    # one reference date for the whole run, the cut off is a day after it
+    statuses = get_date_statuses(
+        [event.start for event in events_list],
+        [event.end for event in events_list],
+        current_date=reference_date,
+    )
 
-        with open(event_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    for event, event_date_status in zip(events_list, statuses):
+        year = event.year
+        event_id = event.event_id
 
-        if not isinstance(data, list):
+        if not event_id or not event.name or not event_date_status:
             continue
 
-        events_list = data[0].get("rows", [])
-
-        total_events += len(events_list)
-
-        for event in events_list:
-            event_id = event.get("EventId")
-            event_name = event.get("EventName")
+        if not event.is_senior:
+            continue
 
-            event_date_status = get_event_date_status(event)
+        total_senior += 1
 
-            data_exists = json_exists(
-                event_matches_dir, f"event_matches_{event_id}.json"
+        if should_scrape_event(event, event_date_status, event_matches_dir, catalog):
+            task = (event_id, year)
+            events_to_scrape.append(task)
+            priorities[task] = event_priority(
+                event_date_status, event.end, reference_date
             )
+            end_dates[task] = event.end.timestamp() if event.end else 0.0
 
-            if not event_id or not event_name or not event_date_status:
-                continue
-
-            if not is_senior_event(event_name):
-                continue
-
-            total_senior += 1
-
-            should_scrape = False
-
-            # if event is ongoing, re-scrape if data is missing
-            if event_date_status == "ongoing":
-                should_scrape = True
-
-            # if event is completed, re-scrape if data is missing
-            elif event_date_status == "completed" and not data_exists:
-                should_scrape = True
-
-            if should_scrape:
-                events_to_scrape.append((event_id, year))
+    # stable sort: equal priorities and end dates keep the file order
+    events_to_scrape.sort(key=lambda task: (priorities[task], -end_dates[task]))
 
     return EventTaskAnalysis(
         queue=events_to_scrape,
         total_found=total_events,
         total_senior=total_senior,
-        total_skipped=total_events - total_senior,
+        total_skipped=total_events - total_duplicates - total_senior,
+        total_duplicates=total_duplicates,
+        by_priority=count_by_priority(events_to_scrape, priorities),
     )
 
 
@@ -118,7 +162,7 @@ def get_event_matches_to_scrape(
     ongoing_cut_off_date: datetime,
 ) -> List[Tuple[int, int]]:
     """
-    1. Get all events from the events directory
+    1. Get all events from the events directory (each EventId once, see dedupe_events)
     2. Get all event matches directories from the event matches directory
     3. Compare the two lists to determine which events need to be re-scraped or scraped
      - based on the current year and ongoing cut off date and if the data is already present
@@ -131,82 +175,58 @@ def get_event_matches_to_scrape(
         List[Tuple[int, int]]: A list of event IDs and match IDs that need to be re-scraped.
     """
     events_to_scrape = []
-    event_files = sorted(events_dir.glob("events_*.json"))
 
-    # Iterate over the event files
+    # Iterate over the events index - each events_<year>.json is parsed at most once
     # [CHECK] if name structure changes, this can BREAK !!!
 
     # 1) Get all events from the events directory
-    for event_file in event_files:
-        try:
-            year = int(event_file.stem.split("_")[1])
-        except (IndexError, ValueError):
+    index = get_event_index(events_dir)
+    events_list, _ = dedupe_events(index.events())
+    for event in events_list:
+        year = event.year
+        event_id = event.event_id
+        end_date = event.end
+        #
+        if not event_id or not event.name or not end_date:
             continue
 
-        # open and read the file for id, and EndDate
-        with open(event_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # unpack the data from the api response structure
-        if isinstance(data, list) and len(data) > 0:
-            events_list = data[0].get("rows", [])
-
-        for event in events_list:
-            event_id = event.get("EventId")
-            event_name = event.get("EventName")
-            end_date = event.get("EndDateTime")
-            #
-            if not event_id or not event_name or not end_date:
-                continue
-
-            if not is_senior_event(event_name):
-                continue
+        if not event.is_senior:
+            continue
 
-            target_dir = event_matches_dir / str(year)
-            target_file = target_dir / f"event_matches_{event_id}.json"
+        target_dir = event_matches_dir / str(year)
+        target_file = target_dir / f"event_matches_{event_id}.json"
 
-            # CASE 1) File does not exist, should scrape!
+        # CASE 1) File does not exist, should scrape!
+        should_scrape = False
+        if year > current_year:
             should_scrape = False
-            if year > current_year:
-                should_scrape = False
+        else:
+            if resolve_raw_path(target_dir, target_file.name) is None:
+                should_scrape = True
+
+            # CASE 2)
             else:
-                if not target_file.exists():
+                if end_date >= ongoing_cut_off_date:
                     should_scrape = True
 
-                # CASE 2)
-                else:
-                    end_date_safe = datetime.strptime(end_date, "%Y-%m-%dT%H:%M:%S")
-                    if end_date_safe >= ongoing_cut_off_date:
-                        should_scrape = True
-
-                if should_scrape:
-                    events_to_scrape.append((event_id, year))
+            if should_scrape:
+                events_to_scrape.append((event_id, year))
 
     return events_to_scrape
 
 
-@retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((httpx.RequestError, httpx.TimeoutException)),
-    reraise=True,
-)
-async def fetch_with_retry(
-    http_client: httpx.AsyncClient, route: WTTRoutes
-) -> httpx.Response:
-    response = await http_client.get(
-        route["url"], params=route["params"], headers=route["headers"], timeout=30.0
-    )
-    return response
-
-
 async def process_event_matches(
     client: TTStatsClient,
     http_client: httpx.AsyncClient,
     event_id: Union[int, str],
     year: int,
-    semaphore: asyncio.Semaphore,
+    semaphore: Optional[asyncio.Semaphore] = None,
     output_dir: Path = RAW_EVENT_MATCHES_DIR,
+    catalog: Optional[RawCatalog] = None,
+    writer: Optional[WriteBehindWriter] = None,
+    completed: bool = False,
+    on_payload: Optional[Callable[[Any], None]] = None,
+    on_outcome: Optional[Callable[[Optional[str]], None]] = None,
 ) -> Tuple[int, int]:
     ### scrapes one year using sempahore and progress bar
 
@@ -219,7 +239,20 @@ async def process_event_matches(
         client (TTStatsClient): The client to use for making requests.
         http_client (httpx.AsyncClient): The underlying HTTP client.
         year (int): The year to scrape.
-        semaphore (asyncio.Semaphore): The sempahore to use for limiting concurrent requests.
+        semaphore (Optional[asyncio.Semaphore]): Optional extra bound on concurrent requests,
+            the client's adaptive rate limiter always applies.
+        output_dir (Path): The directory containing the year sub-directories.
+        catalog (Optional[RawCatalog]): Raw catalog used for the previous count and updated on write.
+            With a catalog, the request is conditional and an unchanged response is
+            neither decoded nor rewritten.
+        writer (Optional[WriteBehindWriter]): If given, the file is written in the background
+            instead of blocking the event loop.
+        completed (bool): Whether the event is over, its response is then cached without expiry.
+        on_payload (Optional[Callable[[Any], None]]): Called with the decoded payload of a
+            new or changed response, e.g. to hand its matches to the next pipeline stage.
+        on_outcome (Optional[Callable[[Optional[str]], None]]): Called once the outcome is
+            final - None when the response was unchanged or its file is on disk, else the
+            error class name, e.g. to record the task in the TaskJournal.
 
     Returns:
         Tupl[int, int]: A tuple containing the total number of matches found and the number of new matches added.
@@ -230,26 +263,60 @@ async def process_event_matches(
     target_dir.mkdir(parents=True, exist_ok=True)
     filename = f"event_matches_{event_id}.json"
 
-    async with semaphore:
-        route = WTTRoutes.get_event_matches_route(str(event_id))
+    async with semaphore if semaphore is not None else nullcontext():
+        route = WTTRoutes.get_event_matches_route(str(event_id), completed=completed)
 
         try:
             old_count = 0
-            if json_exists(target_dir, filename):
-                with open(target_dir / filename, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    old_count = len(data)
+            entry = None
+            if catalog is not None:
+                # SQLite, or a full read of the file on a miss - off the event loop
+                entry = await asyncio.to_thread(catalog.lookup, target_dir / filename)
+                if entry is not None and entry.is_valid:
+                    old_count = entry.row_count
+            else:
+                # sidecar metadata or a row boundary scan, never a full load
+                old_count = await asyncio.to_thread(
+                    count_raw_rows, target_dir, filename
+                )
+
+            response = await client.fetch_route_async(
+                http_client, route, extra_headers=conditional_headers(entry)
+            )
+
+            # same payload as the stored copy - skip decoding and the write
+            if is_unchanged(response, entry):
+                await asyncio.to_thread(catalog.mark_checked, target_dir / filename)
+                if on_outcome is not None:
+                    on_outcome(None)
+                return old_count, 0
 
-            response = await fetch_with_retry(http_client, route)
             response.raise_for_status()
             data = response.json()
+            source = fetch_source(response)
+            if on_payload is not None:
+                on_payload(data)
 
             # placeholder for the count and added count
             count = len(data)
             added = count - old_count
 
             # save the data to a file
-            save_raw_json(data, target_dir, filename)
+            if writer is not None:
+                saved = await writer.submit(
+                    data, target_dir, filename, catalog=catalog, source=source
+                )
+                if on_outcome is not None:
+                    # final once the background write is done
+                    saved.add_done_callback(
+                        lambda future: on_outcome(save_outcome(future))
+                    )
+            else:
+                ok = save_raw_json(
+                    data, target_dir, filename, catalog=catalog, source=source
+                )
+                if on_outcome is not None:
+                    on_outcome(None if ok else "SaveError")
 
             # update the count and added count
             ## add code here later ##
@@ -260,14 +327,67 @@ async def process_event_matches(
             tqdm.write(
                 f"❌ Error scraping Event {event_id}: {type(e).__name__} - {str(e)}"
             )
+            if on_outcome is not None:
+                on_outcome(type(e).__name__)
             return 0, 0
 
 
-async def run_event_matches_scraper() -> None:
+async def run_event_matches_scraper(
+    num_workers: int = EVENT_MATCHES_WORKERS,
+    events_dir: Path = RAW_EVENTS_DIR,
+    output_dir: Path = RAW_EVENT_MATCHES_DIR,
+    catalog: Optional[RawCatalog] = None,
+    stats_client: Optional[TTStatsClient] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    journal: Optional[TaskJournal] = None,
+    resume: bool = False,
+    retry_failed: bool = False,
+    retry_errors: Optional[List[str]] = None,
+    max_seconds: Optional[float] = None,
+    max_tasks: Optional[int] = None,
+    max_requests: Optional[int] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+) -> None:
     """
     Runs the event matches scraper which scrapes all available event matches data from the WTT API.
+
+    A fixed pool of workers pulls (event_id, year) tasks from a bounded queue,
+    so memory use stays flat however large the backfill is. Results are added
+    to the summary counters as each event completes.
+
+    Every run is recorded in the task journal: its plan, each task going in
+    flight, and each outcome with its error class. With resume, the last run
+    continues with its tasks that never completed, without re-planning or
+    re-validating any file - if it was interrupted, else a new run is
+    planned. With retry_failed, the failed tasks of the last run are run
+    again as a new run, e.g. with fewer workers or another retry policy.
+
+    Tasks run most urgent first (see get_event_tasks). With max_seconds,
+    max_tasks or max_requests no new task is started once the budget is
+    spent; the run then stops cleanly, reports what is still queued and stays
+    unfinished in the journal so resume picks up the rest.
+
     Args:
-        None
+        num_workers (int): Number of concurrent workers.
+        events_dir (Path): The directory containing the events files.
+        output_dir (Path): The directory containing the year sub-directories of event matches.
+        catalog (Optional[RawCatalog]): Raw catalog to use, defaults to the project catalog.
+        stats_client (Optional[TTStatsClient]): Client to use, defaults to a new client
+            with the project response cache (TT_RESPONSE_CACHE).
+        transport (Optional[httpx.AsyncBaseTransport]): Transport for the HTTP client,
+            e.g. to run against a local fake server instead of the WTT API.
+        journal (Optional[TaskJournal]): Task journal to use, defaults to the project journal.
+        resume (bool): Continue the last interrupted run instead of planning a new one.
+        retry_failed (bool): Only run the failed tasks of the last run.
+        retry_errors (Optional[List[str]]): With retry_failed, only retry failures of
+            these error classes, e.g. ["ReadTimeout"].
+        max_seconds (Optional[float]): Start no new task after this many seconds of the run.
+        max_tasks (Optional[int]): Start at most this many (event_id, year) tasks. Retries
+            and revalidations within a task are not counted.
+        max_requests (Optional[int]): Start no new task once this many HTTP requests were
+            sent in this run, retries and revalidations included.
+        retry_policy (Optional[RetryPolicy]): Retry policy of the client created when
+            no stats_client is given, defaults to the RetryPolicy default.
     Returns:
         None
     """
@@ -276,62 +396,260 @@ async def run_event_matches_scraper() -> None:
     print("--- 🟢 Commencing Event Match Scraper 🟢 ---")
 
     # Initialize
-    stats_client = TTStatsClient()
+    owns_client = stats_client is None
+    cache = None
+    if owns_client:
+        cache = open_response_cache()
+        stats_client = TTStatsClient(cache=cache, retry_policy=retry_policy)
     start_time = time.time()
-    semaphore = asyncio.Semaphore(50)
+    budget = RunBudget(
+        max_seconds=max_seconds,
+        max_tasks=max_tasks,
+        max_requests=max_requests,
+        requests_sent=lambda: stats_client.requests_sent,
+    )
 
     print("Obtaining Tasks ...")
 
-    event_tasks = get_event_tasks(
-        events_dir=RAW_EVENTS_DIR,
-        event_matches_dir=RAW_EVENT_MATCHES_DIR,
-        current_year=current_year,
-        ongoing_cut_off_date=ongoing_cut_off_date,
-    )
-
-    # 1. Get the list of work to do
-    print("\n--- 📋 Pre-Scrape Summary ---")
-    print(f"Total Events Found:       {event_tasks.total_found}")
-    print(f"Total Senior Events:      {event_tasks.total_senior}")
-    print(f"Filtered (Youth/Vet):     {event_tasks.total_skipped}")
-    print(f"Events Pending Scrape:    {len(event_tasks.queue)}")
-    print("----------------------------\n")
-
-    if not event_tasks.queue:
-        print("No tasks to run.")
-        return
-    async with httpx.AsyncClient(timeout=30.0) as http_client:
-        tasks = []
-
-        # 2. Create Tasks
-        # Loop through the DATA (event_id, year), not the empty task list
-        for event_id, year in event_tasks.queue:
-            task = process_event_matches(
-                stats_client, http_client, event_id, year, semaphore
+    owns_catalog = catalog is None
+    catalog = catalog or RawCatalog()
+    owns_journal = journal is None
+    journal = journal or TaskJournal()
+
+    try:
+        # 1. Get the list of work to do
+        run_id = None
+        queue: List[Tuple[int, int]] = []
+        if resume:
+            run = journal.latest_run(JOURNAL_SCRAPER, unfinished=True)
+            if run is not None:
+                run_id = run.run_id
+                queue = journal.pending(run_id)
+                done = journal.summary(run_id)
+                print(f"\n--- ⏯️ Resuming run {run_id} ---")
+                print(f"Already Completed:        {done.done + done.failed}")
+                print(f"Events Pending Scrape:    {len(queue)}")
+                print("----------------------------\n")
+            else:
+                print("No interrupted run to resume, planning a new run.")
+        elif retry_failed:
+            run = journal.latest_run(JOURNAL_SCRAPER)
+            queue = journal.failed(run.run_id, retry_errors) if run is not None else []
+            run_id = journal.start_run(JOURNAL_SCRAPER, queue)
+            print(f"\n--- 🔁 Retrying failures of run {run.run_id if run else '-'} ---")
+            print(f"Error Classes:            {', '.join(retry_errors or ['all'])}")
+            print(f"Events Pending Scrape:    {len(queue)}")
+            print("----------------------------\n")
+
+        if run_id is None:
+            event_tasks = get_event_tasks(
+                events_dir=events_dir,
+                event_matches_dir=output_dir,
+                current_year=current_year,
+                ongoing_cut_off_date=ongoing_cut_off_date,
+                catalog=catalog,
+            )
+            queue = event_tasks.queue
+            # the whole plan is journaled before the first request
+            run_id = journal.start_run(JOURNAL_SCRAPER, queue)
+
+            print("\n--- 📋 Pre-Scrape Summary ---")
+            print(f"Total Events Found:       {event_tasks.total_found}")
+            print(f"Total Senior Events:      {event_tasks.total_senior}")
+            print(f"Filtered (Youth/Vet):     {event_tasks.total_skipped}")
+            print(f"Duplicates Collapsed:     {event_tasks.total_duplicates}")
+            print(f"Events Pending Scrape:    {len(queue)}")
+            by_priority = ", ".join(
+                f"{k}: {v}" for k, v in event_tasks.by_priority.items()
             )
-            tasks.append(task)
+            print(f"By Priority:              {by_priority or 'none'}")
+            print("----------------------------\n")
 
-        if not tasks:
+        if not queue:
             print("No tasks to run.")
+            journal.finish_run(run_id)
             return
 
-        # 3. Run Tasks
-        # Only await ONCE. wrapping in tqdm automatically awaits.
-        results = await tqdm.gather(*tasks, desc="Scraping Matches", unit="event")
-
-        # 4. Summary
-        total_matches = sum(r[0] for r in results)
-        new_matches = sum(r[1] for r in results)
-
-        elapsed = time.time() - start_time
-        minutes = int(elapsed // 60)
-        seconds = int(elapsed % 60)
-
-        print(f"\n🎉 Completed {len(results)} events in {minutes}m {seconds}s.")
-        print(f"Total matches found: {total_matches}")
-        print(f"New matches added: {new_matches}")
-        print("--- 🟢 Match Scraper Complete 🟢 ---")
+        # results of completed events no longer change, their responses are cached for good
+        indexed_events = get_event_index(events_dir).events()
+        statuses = get_date_statuses(
+            [event.start for event in indexed_events],
+            [event.end for event in indexed_events],
+        )
+        completed_ids = {
+            event.event_id
+            for event, status in zip(indexed_events, statuses)
+            if status == "completed"
+        }
+        priorities = {
+            (event.event_id, event.year): event_priority(status, event.end)
+            for event, status in zip(indexed_events, statuses)
+        }
+
+        # the client's shared connection pool, reused across runs
+        http_client = stats_client.http_client(transport)
+        async with WriteBehindWriter() as writer:
+            summary = {"events": 0, "matches": 0, "new_matches": 0}
+            progress = tqdm(total=len(queue), desc="Scraping Matches", unit="event")
+
+            # 2. Worker handler - one (event_id, year) task
+            async def handle_task(task: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+                event_id, year = task
+                if not budget.admit(task):
+                    return None  # left planned for --resume
+
+                # done / failed only once the file is on disk, a crash before
+                # leaves the task in flight and --resume runs it again
+                def record_outcome(error: Optional[str]) -> None:
+                    if error is None:
+                        journal.mark_done(run_id, task)
+                    else:
+                        journal.mark_failed(run_id, task, error)
+
+                journal.mark_in_flight(run_id, task)
+                return await process_event_matches(
+                    stats_client,
+                    http_client,
+                    event_id,
+                    year,
+                    output_dir=output_dir,
+                    catalog=catalog,
+                    writer=writer,
+                    completed=event_id in completed_ids,
+                    on_outcome=record_outcome,
+                )
+
+            # 3. Stream results into the summary as they complete
+            def record_result(
+                task: Tuple[int, int], result: Optional[Tuple[int, int]]
+            ) -> None:
+                if result is None:
+                    return
+                summary["events"] += 1
+                summary["matches"] += result[0]
+                summary["new_matches"] += result[1]
+                progress.update(1)
+
+            await run_worker_pool(
+                budget.take(queue),
+                handle_task,
+                num_workers=num_workers,
+                on_result=record_result,
+                # hand out one task at a time so none waits in the queue past the budget
+                queue_size=1 if budget.limited else None,
+            )
+            progress.close()
+            # make sure every file is on disk before reporting
+            await writer.flush()
+            writes = writer.stats()
+            checked, unchanged = catalog.fetch_summary(since=start_time)
+            # a run stopped by its budget stays open for --resume
+            if not budget.remaining:
+                journal.finish_run(run_id)
+            outcomes = journal.summary(run_id)
+
+            # 4. Summary
+            elapsed = time.time() - start_time
+            minutes = int(elapsed // 60)
+            seconds = int(elapsed % 60)
+
+            print(
+                f"\n🎉 Completed {summary['events']} events in {minutes}m {seconds}s."
+            )
+            print(f"Total matches found: {summary['matches']}")
+            print(f"New matches added: {summary['new_matches']}")
+            print(f"Files written: {writes.written} (failed: {writes.failed})")
+            print(f"Unchanged (no-op) fetches: {unchanged} of {checked}")
+            errors = ", ".join(f"{k}: {v}" for k, v in outcomes.errors.items())
+            print(
+                f"Journal run {run_id}: {outcomes.done} done, {outcomes.failed} failed"
+                f" ({errors or 'none'})"
+            )
+            if outcomes.failed:
+                print("Re-run only the failures with --retry-failed")
+            if budget.remaining:
+                left = ", ".join(
+                    f"{k}: {v}"
+                    for k, v in count_by_priority(budget.remaining, priorities).items()
+                )
+                print(
+                    f"⏱️ Budget {budget.exhausted_by()} spent, {len(budget.remaining)} "
+                    f"events still queued ({left}) - continue with --resume"
+                )
+            for line in stats_client.summary():
+                print(line)
+            print("--- 🟢 Match Scraper Complete 🟢 ---")
+    finally:
+        # also on errors and budget stops
+        if owns_journal:
+            journal.close()
+        if owns_catalog:
+            catalog.close()
+        if owns_client:
+            # the client was created here, close its connections too
+            await stats_client.aclose()
+            if cache is not None:
+                cache.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(run_event_matches_scraper())
+    parser = argparse.ArgumentParser(
+        description="Scrape the matches of every senior event from the WTT API."
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last interrupted run where it stopped",
+    )
+    mode.add_argument(
+        "--retry-failed",
+        nargs="*",
+        metavar="ERROR",
+        default=None,
+        help="Only retry the failed tasks of the last run, optionally only these "
+        "error classes (e.g. ReadTimeout HTTPStatusError)",
+    )
+    parser.add_argument("--workers", type=int, default=EVENT_MATCHES_WORKERS)
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="Start no new task after this many seconds (e.g. a cron time slot)",
+    )
+    parser.add_argument(
+        "--max-tasks",
+        type=int,
+        default=None,
+        help="Start at most this many (event_id, year) tasks, retries not counted",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=None,
+        help="Start no new task once this many HTTP requests were sent, retries "
+        "and revalidations included",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=None,
+        help="Attempts per request (defaults to the RetryPolicy default)",
+    )
+    args = parser.parse_args()
+
+    retry_policy = None
+    if args.max_attempts is not None:
+        retry_policy = RetryPolicy(max_attempts=args.max_attempts)
+    asyncio.run(
+        run_event_matches_scraper(
+            num_workers=args.workers,
+            retry_policy=retry_policy,
+            resume=args.resume,
+            retry_failed=args.retry_failed is not None,
+            retry_errors=args.retry_failed or None,
+            max_seconds=args.max_seconds,
+            max_tasks=args.max_tasks,
+            max_requests=args.max_requests,
+        )
+    )
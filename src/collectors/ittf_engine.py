@@ -0,0 +1,105 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from src.config import ITTF_FETCH_WORKERS, ITTF_PARSE_WORKERS
+from src.utils.api_client import TTStatsClient
+
+
+class ITTFRequest(NamedTuple):
+    key: Hashable  # Identifies the request in the results, e.g. (year, tournament_id)
+    url: str
+    params: Optional[Dict[str, Any]] = None
+
+
+class ITTFResult(NamedTuple):
+    request: ITTFRequest
+    value: Any  # What the parse callable returned, None on error
+    error: Optional[BaseException]  # The fetch or parse error, None on success
+
+
+# parse(request, html) -> value, runs on the parse threads
+ParseFn = Callable[[ITTFRequest, str], Any]
+
+
+def run_ittf_engine(
+    requests: Iterable[ITTFRequest],
+    parse: ParseFn,
+    stats_client: Optional[TTStatsClient] = None,
+    fetch_workers: int = ITTF_FETCH_WORKERS,
+    parse_workers: int = ITTF_PARSE_WORKERS,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[ITTFResult]:
+    """
+    Fetches pages of the older ITTF website on a thread pool and parses them on another.
+
+    Every fetch thread reuses its own keep-alive client (see
+    TTStatsClient.get_ittf_threaded), so a backfill of thousands of pages pays
+    one connection setup per thread instead of one per page. The HTML of a
+    fetched page is handed to the parse threads, keeping the request threads
+    on the network. Requests are read lazily and at most max_in_flight are
+    fetched or parsed at once, so a long request generator is never
+    materialised.
+
+    Args:
+        requests (Iterable[ITTFRequest]): The pages to fetch.
+        parse (ParseFn): Turns a fetched page into a result value.
+        stats_client (Optional[TTStatsClient]): Client to fetch with, defaults to a new
+            client that is closed when the engine stops. A given client is left open.
+        fetch_workers (int): Concurrent requests.
+        parse_workers (int): Threads parsing fetched pages.
+        max_in_flight (Optional[int]): Requests fetched or parsed at once,
+            defaults to twice the fetch workers.
+
+    Yields:
+        ITTFResult: One result per request, in completion order. A failed fetch
+            or parse is yielded with its error instead of stopping the engine.
+    """
+    owns_client = stats_client is None
+    stats_client = stats_client or TTStatsClient()
+    max_in_flight = max_in_flight or 2 * fetch_workers
+    pending_requests = iter(requests)
+    # future -> (stage, request), stage is "fetch" or "parse"
+    in_flight: Dict[Future, Tuple[str, ITTFRequest]] = {}
+
+    fetch_pool = ThreadPoolExecutor(fetch_workers, thread_name_prefix="ittf-fetch")
+    parse_pool = ThreadPoolExecutor(parse_workers, thread_name_prefix="ittf-parse")
+    try:
+        while True:
+            # top up the fetches until the in-flight limit is reached
+            while len(in_flight) < max_in_flight:
+                request = next(pending_requests, None)
+                if request is None:
+                    break
+                future = fetch_pool.submit(
+                    stats_client.get_ittf_threaded, request.url, request.params
+                )
+                in_flight[future] = ("fetch", request)
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, request = in_flight.pop(future)
+                error = future.exception()
+                if error is not None:
+                    yield ITTFResult(request, None, error)
+                elif stage == "fetch":
+                    parsed = parse_pool.submit(parse, request, future.result())
+                    in_flight[parsed] = ("parse", request)
+                else:
+                    yield ITTFResult(request, future.result(), None)
+    finally:
+        fetch_pool.shutdown(cancel_futures=True)
+        parse_pool.shutdown(cancel_futures=True)
+        if owns_client:
+            # the fetch threads are gone, so are the connections they kept alive
+            stats_client.close()
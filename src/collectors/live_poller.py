@@ -0,0 +1,484 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import httpx
+import msgspec
+from tqdm.asyncio import tqdm
+
+from src.config import (
+    LIVE_CONSOLIDATE_INTERVAL,
+    LIVE_DELTAS_DIR,
+    LIVE_POLL_BACKOFF,
+    LIVE_POLL_MAX_INTERVAL,
+    LIVE_POLL_MIN_INTERVAL,
+    RAW_EVENTS_DIR,
+    RAW_EVENT_MATCHES_DIR,
+)
+from src.utils.api_client import TTStatsClient
+from src.utils.change_detection import fetch_source
+from src.utils.event_index import EventRecord, dedupe_events, get_event_index
+from src.utils.helper_logic import get_date_statuses
+from src.utils.io_handler import load_raw_bytes
+from src.utils.raw_catalog import FetchSource, RawCatalog
+from src.utils.raw_storage import RAW_DECODE_ERRORS
+from src.utils.response_cache import NO_CACHE
+from src.utils.routes import WTTRoutes
+from src.utils.write_behind import WriteBehindWriter
+from src.utils.wtt_models import split_match_rows
+
+# Canonical form of a match row for hashing: the stored file (indented) and a
+# response (compact) of the same match must hash the same
+_row_decoder = msgspec.json.Decoder()
+
+
+class MatchDelta(NamedTuple):
+    event_id: Union[int, str]
+    year: int
+    document_code: str  # The match key, see split_match_rows
+    change: str  # "new" or "changed"
+    match: Any  # The decoded match row
+    polled_at: float  # Unix timestamp of the poll that saw the change
+
+
+class LiveSummary(NamedTuple):
+    events: int  # Events polled
+    polls: int  # Requests sent
+    unchanged: int  # Polls without new or changed matches (304, same body, removals)
+    errors: int  # Polls that failed
+    new_matches: int
+    changed_matches: int
+    files_written: int  # Full event matches files rewritten (consolidations)
+    elapsed_s: float
+
+
+class LiveEvent:
+    """
+    Polling state of one event: the digest of every match seen so far and the
+    poll interval, which adapts to how often the matches change.
+    """
+
+    def __init__(
+        self,
+        event: EventRecord,
+        digests: Dict[str, str],
+        source: Optional[FetchSource] = None,
+        interval: float = LIVE_POLL_MIN_INTERVAL,
+    ):
+        self.event = event
+        self.digests = digests
+        self.source_hash = source.source_hash if source is not None else None
+        self.etag = source.etag if source is not None else None
+        self.interval = interval
+        self.polls = 0
+        # newest payload not written to the event matches file yet
+        self.unsaved: Optional[Tuple[bytes, FetchSource]] = None
+        self.last_saved = float("-inf")
+
+
+def row_digest(row: bytes) -> str:
+    """
+    Returns the hash of a match row, independent of whitespace and key order.
+    """
+    canonical = msgspec.json.encode(_row_decoder.decode(row), order="sorted")
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def diff_match_rows(
+    previous: Dict[str, str], rows: List[Tuple[str, bytes]]
+) -> Tuple[Dict[str, str], List[Tuple[str, str, bytes]]]:
+    """
+    Compares the rows of a fresh payload with the digests of the previous version.
+
+    Args:
+        previous (Dict[str, str]): Match key -> digest of the previous version.
+        rows (List[Tuple[str, bytes]]): The fresh rows, see split_match_rows.
+
+    Returns:
+        Tuple[Dict[str, str], List[Tuple[str, str, bytes]]]: The digests of the
+            fresh payload, and (key, "new" / "changed", row) per new or changed
+            match. Matches missing from the fresh payload are not reported.
+    """
+    digests: Dict[str, str] = {}
+    changes = []
+    for key, row in rows:
+        digest = digests[key] = row_digest(row)
+        old = previous.get(key)
+        if old is None:
+            changes.append((key, "new", row))
+        elif old != digest:
+            changes.append((key, "changed", row))
+    return digests, changes
+
+
+def next_poll_interval(
+    interval: float,
+    changed: bool,
+    min_interval: float = LIVE_POLL_MIN_INTERVAL,
+    max_interval: float = LIVE_POLL_MAX_INTERVAL,
+    backoff: float = LIVE_POLL_BACKOFF,
+) -> float:
+    """
+    Returns the wait before the next poll of an event: the minimum right after
+    a change, growing by `backoff` per idle poll up to the maximum.
+    """
+    if changed:
+        return min_interval
+    return min(max_interval, max(min_interval, interval * backoff))
+
+
+def get_live_events(
+    events_dir: Path = RAW_EVENTS_DIR, current_date: Optional[datetime] = None
+) -> List[EventRecord]:
+    """
+    Returns the ongoing senior events of the events index, each EventId once.
+    """
+    events, _ = dedupe_events(get_event_index(events_dir).events())
+    statuses = get_date_statuses(
+        [event.start for event in events],
+        [event.end for event in events],
+        current_date=current_date,
+    )
+    return [
+        event
+        for event, status in zip(events, statuses)
+        if status == "ongoing" and event.event_id and event.name and event.is_senior
+    ]
+
+
+def _load_live_event(
+    event: EventRecord,
+    event_matches_dir: Path,
+    catalog: Optional[RawCatalog],
+    min_interval: float,
+) -> LiveEvent:
+    # the stored copy is the baseline, so only matches changed since are reported
+    target_dir = event_matches_dir / str(event.year)
+    filename = f"event_matches_{event.event_id}.json"
+    digests: Dict[str, str] = {}
+    try:
+        for key, row in split_match_rows(load_raw_bytes(target_dir, filename)):
+            digests[key] = row_digest(row)
+    except RAW_DECODE_ERRORS:
+        digests = {}
+    source = None
+    entry = catalog.lookup(target_dir / filename) if catalog is not None else None
+    if digests and entry is not None and entry.is_valid and entry.source_hash:
+        source = FetchSource(entry.source_hash, entry.etag, entry.last_modified)
+    return LiveEvent(event, digests, source, interval=min_interval)
+
+
+def _append_deltas(deltas_dir: Path, deltas: List[MatchDelta]) -> None:
+    # one JSON line per new / changed match, appended in one write
+    first = deltas[0]
+    folder = deltas_dir / str(first.year)
+    folder.mkdir(parents=True, exist_ok=True)
+    lines = "".join(json.dumps(delta._asdict()) + "\n" for delta in deltas)
+    with open(folder / f"event_matches_{first.event_id}.jsonl", "a") as f:
+        f.write(lines)
+
+
+def print_delta(delta: MatchDelta) -> None:
+    icon = "🆕" if delta.change == "new" else "🔄"
+    tqdm.write(f"{icon} Event {delta.event_id}: {delta.document_code} {delta.change}")
+
+
+async def poll_event(
+    client: TTStatsClient,
+    http_client: httpx.AsyncClient,
+    live: LiveEvent,
+    deltas_dir: Path = LIVE_DELTAS_DIR,
+    on_delta: Optional[Callable[[MatchDelta], None]] = print_delta,
+) -> List[MatchDelta]:
+    """
+    Polls one event once and reports the matches that changed since the last poll.
+
+    The request is conditional on the last ETag, and a body identical to the
+    last one is dropped after hashing it, without splitting it into matches.
+    Otherwise the payload is split into rows by match key and each row is
+    compared by the digest of its canonical form; new or changed matches are
+    appended to the event's delta log and passed to on_delta. Any new body,
+    including one that only drops matches, is kept in live.unsaved for the
+    next consolidation of the event matches file.
+
+    Args:
+        client (TTStatsClient): The client to use for making requests.
+        http_client (httpx.AsyncClient): The underlying HTTP client.
+        live (LiveEvent): The polling state of the event, updated in place.
+        deltas_dir (Path): The directory of the delta logs.
+        on_delta (Optional[Callable[[MatchDelta], None]]): Called per new or changed match.
+
+    Returns:
+        List[MatchDelta]: The new or changed matches, empty if nothing changed.
+
+    Raises:
+        httpx.HTTPError: If the request fails or returns an error status.
+    """
+    event = live.event
+    route = WTTRoutes.get_event_matches_route(str(event.event_id))
+    # always the network, a cached response would hide the changes
+    route["cache_ttl"] = NO_CACHE
+    headers = {"If-None-Match": live.etag} if live.etag else None
+
+    live.polls += 1
+    response = await client.fetch_route_async(http_client, route, extra_headers=headers)
+    if response.status_code == 304:
+        return []
+    response.raise_for_status()
+
+    source = fetch_source(response)
+    if source.source_hash == live.source_hash:
+        return []
+
+    digests, changes = diff_match_rows(live.digests, split_match_rows(response.content))
+    polled_at = time.time()
+    deltas = [
+        MatchDelta(
+            event_id=event.event_id,
+            year=event.year,
+            document_code=key,
+            change=change,
+            match=json.loads(row),
+            polled_at=polled_at,
+        )
+        for key, change, row in changes
+    ]
+    if deltas:
+        await asyncio.to_thread(_append_deltas, deltas_dir, deltas)
+    # only once the deltas are logged, a failed append is reported again next poll
+    live.digests, live.source_hash, live.etag = digests, source.source_hash, source.etag
+    live.unsaved = (response.content, source)
+    if on_delta is not None:
+        for delta in deltas:
+            on_delta(delta)
+    return deltas
+
+
+async def _consolidate(
+    live: LiveEvent,
+    writer: WriteBehindWriter,
+    event_matches_dir: Path,
+    catalog: Optional[RawCatalog],
+    min_age: float,
+) -> bool:
+    # rewrite the full event matches file, at most once per min_age seconds
+    if live.unsaved is None or time.monotonic() - live.last_saved < min_age:
+        return False
+    content, source = live.unsaved
+    await writer.submit(
+        json.loads(content),
+        event_matches_dir / str(live.event.year),
+        f"event_matches_{live.event.event_id}.json",
+        catalog=catalog,
+        source=source,
+    )
+    live.unsaved = None
+    live.last_saved = time.monotonic()
+    return True
+
+
+async def run_live_poller(
+    events: Optional[List[EventRecord]] = None,
+    events_dir: Path = RAW_EVENTS_DIR,
+    event_matches_dir: Path = RAW_EVENT_MATCHES_DIR,
+    deltas_dir: Path = LIVE_DELTAS_DIR,
+    catalog: Optional[RawCatalog] = None,
+    stats_client: Optional[TTStatsClient] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    min_interval: float = LIVE_POLL_MIN_INTERVAL,
+    max_interval: float = LIVE_POLL_MAX_INTERVAL,
+    backoff: float = LIVE_POLL_BACKOFF,
+    consolidate_interval: float = LIVE_CONSOLIDATE_INTERVAL,
+    max_seconds: Optional[float] = None,
+    max_polls: Optional[int] = None,
+    on_delta: Optional[Callable[[MatchDelta], None]] = print_delta,
+) -> LiveSummary:
+    """
+    Polls ongoing events and reports their new or changed matches as they happen.
+
+    Every event is polled on its own adaptive interval over one warm client:
+    right after a change it is polled again after min_interval, every idle
+    poll multiplies the wait by backoff up to max_interval. Responses are
+    diffed per match against the previous version (the stored file on the
+    first poll), only new or changed matches are appended to the delta log
+    and passed to on_delta. The full event matches file is rewritten at most
+    once per consolidate_interval and once more when polling stops, so
+    downstream readers stay current without a rewrite per poll.
+
+    Polling an event stops a day after its end date, after max_polls polls,
+    or when max_seconds have passed.
+
+    Args:
+        events (Optional[List[EventRecord]]): The events to poll, defaults to the
+            ongoing senior events (see get_live_events).
+        events_dir (Path): The directory containing the events files.
+        event_matches_dir (Path): The directory with the event matches year sub-directories.
+        deltas_dir (Path): The directory of the delta logs.
+        catalog (Optional[RawCatalog]): Raw catalog to use, defaults to the project catalog.
+        stats_client (Optional[TTStatsClient]): Client to use, defaults to a new client
+            without response cache.
+        transport (Optional[httpx.AsyncBaseTransport]): Transport for the HTTP client,
+            e.g. to run against a local fake server instead of the WTT API.
+        min_interval (float): Seconds between polls of an event whose matches just changed.
+        max_interval (float): Longest wait between two polls of an idle event.
+        backoff (float): Factor the wait grows by after a poll without changes.
+        consolidate_interval (float): Rewrite an event's full file at most this often.
+        max_seconds (Optional[float]): Stop polling after this many seconds.
+        max_polls (Optional[int]): Stop polling an event after this many polls.
+        on_delta (Optional[Callable[[MatchDelta], None]]): Called per new or changed match.
+
+    Returns:
+        LiveSummary: Polls sent and the matches and files they produced.
+    """
+    print("--- 🔴 Commencing Live Poller 🔴 ---")
+
+    owns_client = stats_client is None
+    stats_client = stats_client or TTStatsClient()
+    owns_catalog = catalog is None
+    catalog = catalog or RawCatalog()
+    try:
+        start = time.perf_counter()
+        deadline = start + max_seconds if max_seconds is not None else None
+
+        events = events if events is not None else get_live_events(events_dir)
+        print(f"Events to poll: {len(events)}")
+        live_events = [
+            _load_live_event(event, event_matches_dir, catalog, min_interval)
+            for event in events
+        ]
+        summary = {
+            "unchanged": 0,
+            "errors": 0,
+            "new": 0,
+            "changed": 0,
+            "written": 0,
+        }
+
+        # the client's shared connection pool, kept warm between polls
+        http_client = stats_client.http_client(transport)
+        async with WriteBehindWriter() as writer:
+
+            def done(live: LiveEvent) -> bool:
+                end = live.event.end
+                return (
+                    (max_polls is not None and live.polls >= max_polls)
+                    or (deadline is not None and time.perf_counter() >= deadline)
+                    or (end is not None and datetime.now() > end + timedelta(days=1))
+                )
+
+            async def poll_loop(live: LiveEvent) -> None:
+                while not done(live):
+                    try:
+                        deltas = await poll_event(
+                            stats_client,
+                            http_client,
+                            live,
+                            deltas_dir=deltas_dir,
+                            on_delta=on_delta,
+                        )
+                    except Exception as e:
+                        tqdm.write(
+                            f"❌ Error polling Event {live.event.event_id}: "
+                            f"{type(e).__name__} - {str(e)}"
+                        )
+                        summary["errors"] += 1
+                        deltas = []
+                    else:
+                        if not deltas:
+                            summary["unchanged"] += 1
+                    for delta in deltas:
+                        summary[delta.change] += 1
+
+                    live.interval = next_poll_interval(
+                        live.interval, bool(deltas), min_interval, max_interval, backoff
+                    )
+                    if await _consolidate(
+                        live, writer, event_matches_dir, catalog, consolidate_interval
+                    ):
+                        summary["written"] += 1
+                    if done(live):
+                        break
+                    wait = live.interval
+                    if deadline is not None:
+                        wait = min(wait, max(0.0, deadline - time.perf_counter()))
+                    await asyncio.sleep(wait)
+
+                # polling stopped - the file gets the latest payload
+                if await _consolidate(live, writer, event_matches_dir, catalog, 0.0):
+                    summary["written"] += 1
+
+            async with asyncio.TaskGroup() as task_group:
+                for live in live_events:
+                    task_group.create_task(poll_loop(live))
+
+            await writer.flush()
+
+        result = LiveSummary(
+            events=len(live_events),
+            polls=sum(live.polls for live in live_events),
+            unchanged=summary["unchanged"],
+            errors=summary["errors"],
+            new_matches=summary["new"],
+            changed_matches=summary["changed"],
+            files_written=summary["written"],
+            elapsed_s=time.perf_counter() - start,
+        )
+
+        minutes = int(result.elapsed_s // 60)
+        seconds = int(result.elapsed_s % 60)
+        print(f"\n🎉 Polled {result.events} events in {minutes}m {seconds}s.")
+        print(f"Polls:               {result.polls} ({result.unchanged} unchanged)")
+        print(f"Failed polls:        {result.errors}")
+        print(f"New matches:         {result.new_matches}")
+        print(f"Changed matches:     {result.changed_matches}")
+        print(f"Files rewritten:     {result.files_written}")
+        for line in stats_client.summary():
+            print(line)
+        print("--- 🔴 Live Poller Stopped 🔴 ---")
+        return result
+    finally:
+        if owns_catalog:
+            catalog.close()
+        if owns_client:
+            await stats_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Poll ongoing events and report new or changed matches."
+    )
+    parser.add_argument(
+        "--event-id",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Poll these events instead of every ongoing senior event",
+    )
+    parser.add_argument("--min-interval", type=float, default=LIVE_POLL_MIN_INTERVAL)
+    parser.add_argument("--max-interval", type=float, default=LIVE_POLL_MAX_INTERVAL)
+    parser.add_argument(
+        "--max-seconds", type=float, default=None, help="Stop after this many seconds"
+    )
+    args = parser.parse_args()
+
+    selected = None
+    if args.event_id:
+        wanted = set(args.event_id)
+        selected, _ = dedupe_events(
+            event
+            for event in get_event_index(RAW_EVENTS_DIR).events()
+            if event.event_id in wanted
+        )
+    asyncio.run(
+        run_live_poller(
+            events=selected,
+            min_interval=args.min_interval,
+            max_interval=args.max_interval,
+            max_seconds=args.max_seconds,
+        )
+    )
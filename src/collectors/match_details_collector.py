@@ -0,0 +1,129 @@
+import asyncio
+import httpx
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Union
+from tqdm.asyncio import tqdm
+from src.config import RAW_MATCHES_DIR
+from src.utils.api_client import TTStatsClient
+from src.utils.routes import WTTRoutes
+from src.utils.io_handler import save_raw_json, json_exists
+from src.utils.raw_catalog import RawCatalog
+from src.utils.change_detection import (
+    conditional_headers,
+    fetch_source,
+    is_unchanged,
+)
+from src.utils.wtt_models import MatchRecord
+from src.utils.write_behind import WriteBehindWriter
+
+
+class MatchDetailTask(NamedTuple):
+    event_id: Union[int, str]
+    year: int  # Year sub-directory, the same as the event matches file
+    document_code: str  # documentCode of the match in the event matches payload
+    finished: bool  # The match already has a final score, its card no longer changes
+
+
+def match_details_filename(event_id: Union[int, str], document_code: str) -> str:
+    """
+    Returns the raw filename of a match card, e.g. "match_details_2860_TTEMSINGLES-R32.json".
+    """
+    return f"match_details_{event_id}_{document_code}.json"
+
+
+def get_match_detail_tasks(
+    records: List[MatchRecord], event_id: Union[int, str], year: int
+) -> List[MatchDetailTask]:
+    """
+    Returns one match details task per distinct document code of an event matches payload.
+
+    Args:
+        records (List[MatchRecord]): The decoded event matches payload.
+        event_id (Union[int, str]): The event the payload belongs to.
+        year (int): The year sub-directory of the event.
+
+    Returns:
+        List[MatchDetailTask]: The tasks, in payload order.
+    """
+    tasks = []
+    seen = set()
+    for record in records:
+        card = record.card
+        document_code = card.documentCode or record.documentCode
+        if not document_code or document_code in seen:
+            continue
+        seen.add(document_code)
+        finished = bool(card.resultOverallScores or card.overallScores)
+        tasks.append(MatchDetailTask(event_id, year, document_code, finished))
+    return tasks
+
+
+async def process_match_details(
+    client: TTStatsClient,
+    http_client: httpx.AsyncClient,
+    task: MatchDetailTask,
+    output_dir: Path = RAW_MATCHES_DIR,
+    catalog: Optional[RawCatalog] = None,
+    writer: Optional[WriteBehindWriter] = None,
+    completed: bool = False,
+) -> bool:
+    """
+    Scrapes the match card of one match and saves it inside a year sub-directory
+    of RAW_MATCHES_DIR. A finished match whose card is already stored is skipped.
+
+    Args:
+        client (TTStatsClient): The client to use for making requests.
+        http_client (httpx.AsyncClient): The underlying HTTP client.
+        task (MatchDetailTask): The match to scrape.
+        output_dir (Path): The directory containing the year sub-directories.
+        catalog (Optional[RawCatalog]): Raw catalog used for the existence check and updated
+            on write. With a catalog, the request is conditional and an unchanged
+            response is neither decoded nor rewritten.
+        writer (Optional[WriteBehindWriter]): If given, the file is written in the background
+            instead of blocking the event loop.
+        completed (bool): Whether the event is over, its response is then cached without expiry.
+
+    Returns:
+        bool: True if a new or changed match card was saved.
+    """
+    target_dir = output_dir / str(task.year)
+    filename = match_details_filename(task.event_id, task.document_code)
+
+    if task.finished and json_exists(target_dir, filename, catalog):
+        return False
+
+    route = WTTRoutes.get_match_details_route(
+        task.event_id, task.document_code, completed=completed
+    )
+    try:
+        entry = None
+        if catalog is not None:
+            # SQLite, or a full read of the file on a miss - off the event loop
+            entry = await asyncio.to_thread(catalog.lookup, target_dir / filename)
+        response = await client.fetch_route_async(
+            http_client, route, extra_headers=conditional_headers(entry)
+        )
+
+        # same payload as the stored copy - skip decoding and the write
+        if is_unchanged(response, entry):
+            await asyncio.to_thread(catalog.mark_checked, target_dir / filename)
+            return False
+
+        response.raise_for_status()
+        data = response.json()
+        source = fetch_source(response)
+
+        if writer is not None:
+            await writer.submit(
+                data, target_dir, filename, catalog=catalog, source=source
+            )
+        else:
+            save_raw_json(data, target_dir, filename, catalog=catalog, source=source)
+        return True
+
+    except Exception as e:
+        tqdm.write(
+            f"❌ Error scraping Match {task.event_id}/{task.document_code}: "
+            f"{type(e).__name__} - {str(e)}"
+        )
+        return False
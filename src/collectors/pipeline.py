@@ -0,0 +1,311 @@
+import asyncio
+import httpx
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+from src.config import (
+    PIPELINE_EVENT_MATCHES_WORKERS,
+    PIPELINE_EVENT_WORKERS,
+    PIPELINE_MATCH_DETAILS_WORKERS,
+    RAW_EVENTS_DIR,
+    RAW_EVENT_MATCHES_DIR,
+    RAW_MATCHES_DIR,
+)
+from src.collectors.event_collector import get_years_to_scrape, process_year
+from src.collectors.event_matches_collector import (
+    process_event_matches,
+    should_scrape_event,
+)
+from src.collectors.match_details_collector import (
+    MatchDetailTask,
+    get_match_detail_tasks,
+    process_match_details,
+)
+from src.utils.api_client import TTStatsClient
+from src.utils.event_index import (
+    EventRecord,
+    build_event_records,
+    build_event_records_from_rows,
+    dedupe_events,
+)
+from src.utils.helper_logic import get_date_statuses
+from src.utils.io_handler import load_raw_bytes
+from src.utils.raw_catalog import RawCatalog
+from src.utils.raw_storage import RAW_DECODE_ERRORS
+from src.utils.response_cache import open_response_cache
+from src.utils.task_queue import Emit, Stage, run_stages
+from src.utils.write_behind import WriteBehindWriter
+from src.utils.wtt_models import (
+    MatchRecord,
+    decode_event_rows,
+    decode_match_records,
+    to_match_records,
+)
+
+
+class PipelineSummary(NamedTuple):
+    years: int  # Year calendars fetched
+    events_queued: int  # Senior events handed to the event matches stage
+    matches: int  # Match rows in the fetched event matches payloads
+    details_queued: int  # Matches handed to the match details stage
+    details_saved: int  # New or changed match cards written
+    first_details_s: Optional[float]  # Seconds until the first match card was saved
+    elapsed_s: float
+
+
+def _year_events(events_dir: Path, year: int, payloads: List[Any]) -> List[EventRecord]:
+    # the fresh payload, else the stored copy (unchanged response or failed fetch)
+    if payloads:
+        return build_event_records(payloads[0], year)
+    try:
+        rows = decode_event_rows(load_raw_bytes(events_dir, f"events_{year}.json"))
+    except RAW_DECODE_ERRORS:
+        return []
+    return build_event_records_from_rows(rows, year)
+
+
+def _event_match_records(
+    event_matches_dir: Path, event_id: Union[int, str], year: int, payloads: List[Any]
+) -> List[MatchRecord]:
+    # the fresh payload, else the stored copy (unchanged response or failed fetch)
+    if payloads:
+        return to_match_records(payloads[0])
+    try:
+        return decode_match_records(
+            load_raw_bytes(
+                event_matches_dir / str(year), f"event_matches_{event_id}.json"
+            )
+        )
+    except RAW_DECODE_ERRORS:
+        return []
+
+
+def _canonical_copy(
+    copies: Dict[int, Tuple[EventRecord, str]], years: Set[int], loaded: Set[int]
+) -> Optional[Tuple[EventRecord, str]]:
+    # an event spanning a year boundary is listed in two year files, the copy
+    # dedupe_events picks from the loaded years wins - None while a year still
+    # to load could list a better one (its start year or an earlier year)
+    (best,), _ = dedupe_events(event for event, _ in copies.values())
+    start_year = best.start.year if best.start is not None else None
+    if best.year != start_year and any(
+        year == start_year or year < best.year for year in years - loaded
+    ):
+        return None
+    return copies[best.year]
+
+
+async def run_pipeline(
+    years_to_scrape: List[int],
+    events_dir: Path = RAW_EVENTS_DIR,
+    event_matches_dir: Path = RAW_EVENT_MATCHES_DIR,
+    match_details_dir: Path = RAW_MATCHES_DIR,
+    catalog: Optional[RawCatalog] = None,
+    stats_client: Optional[TTStatsClient] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    event_workers: int = PIPELINE_EVENT_WORKERS,
+    event_matches_workers: int = PIPELINE_EVENT_MATCHES_WORKERS,
+    match_details_workers: int = PIPELINE_MATCH_DETAILS_WORKERS,
+    current_date: Optional[datetime] = None,
+) -> PipelineSummary:
+    """
+    Runs events -> event matches -> match details collection as one streaming pipeline.
+
+    The three stages are connected by bounded queues and each has its own
+    worker pool. As soon as a year's calendar arrives its senior events are
+    classified and the ones to (re-)scrape are queued for the event matches
+    stage, and every event matches payload immediately queues its matches for
+    the match details stage. An event listed in more than one year file is
+    queued once, under the copy dedupe_events picks, as soon as every year
+    that could hold that copy has arrived. A new event is collected down to
+    its match cards in one run instead of one run of each scraper. All
+    stages share the client's rate limiter, response cache and write-behind
+    writer.
+
+    Args:
+        years_to_scrape (List[int]): The years whose calendars are fetched.
+        events_dir (Path): The directory to save the events files in.
+        event_matches_dir (Path): The directory with the event matches year sub-directories.
+        match_details_dir (Path): The directory with the match details year sub-directories.
+        catalog (Optional[RawCatalog]): Raw catalog to use, defaults to the project catalog.
+        stats_client (Optional[TTStatsClient]): Client to use, defaults to a new client
+            with the project response cache (TT_RESPONSE_CACHE).
+        transport (Optional[httpx.AsyncBaseTransport]): Transport for the HTTP client,
+            e.g. to run against a local fake server instead of the WTT API.
+        event_workers (int): Concurrent year calendar fetches.
+        event_matches_workers (int): Concurrent event matches fetches.
+        match_details_workers (int): Concurrent match card fetches.
+        current_date (Optional[datetime]): The date events are classified against, defaults to now.
+
+    Returns:
+        PipelineSummary: What each stage fetched and queued.
+    """
+    owns_client = stats_client is None
+    cache = None
+    if owns_client:
+        cache = open_response_cache()
+        stats_client = TTStatsClient(cache=cache)
+    start_time = time.time()
+    start = time.perf_counter()
+    current_date = current_date or datetime.now()
+
+    print("--- 🟢 Commencing Collection Pipeline 🟢 ---")
+
+    owns_catalog = catalog is None
+    catalog = catalog or RawCatalog()
+    years = set(years_to_scrape)
+    loaded_years: Set[int] = set()
+    # (event, status) per year file listing the event, until its canonical copy is known
+    event_copies: Dict[Union[int, str], Dict[int, Tuple[EventRecord, str]]] = {}
+    settled: Set[Union[int, str]] = set()
+    summary = {
+        "matches": 0,
+        "details_queued": 0,
+        "details_saved": 0,
+        "first_details_s": None,
+    }
+
+    try:
+        # the client's shared connection pool, reused across runs
+        http_client = stats_client.http_client(transport)
+        async with WriteBehindWriter() as writer:
+
+            # 1. Year calendar -> senior events to (re-)scrape
+            async def handle_year(year: int, emit: Emit) -> None:
+                payloads: List[Any] = []
+                await process_year(
+                    stats_client,
+                    http_client,
+                    year,
+                    output_dir=events_dir,
+                    catalog=catalog,
+                    writer=writer,
+                    on_payload=payloads.append,
+                )
+                events = _year_events(events_dir, year, payloads)
+                statuses = get_date_statuses(
+                    [event.start for event in events],
+                    [event.end for event in events],
+                    current_date=current_date,
+                )
+                loaded_years.add(year)
+                for event, status in zip(events, statuses):
+                    if not event.event_id or not event.name or not status:
+                        continue
+                    if not event.is_senior or event.event_id in settled:
+                        continue
+                    event_copies.setdefault(event.event_id, {})[year] = (event, status)
+
+                # also settles events deferred by years loaded earlier
+                for event_id in list(event_copies):
+                    if event_id not in event_copies:
+                        continue  # settled by another year meanwhile
+                    canonical = _canonical_copy(
+                        event_copies[event_id], years, loaded_years
+                    )
+                    if canonical is None:
+                        continue
+                    settled.add(event_id)
+                    del event_copies[event_id]
+                    event, status = canonical
+                    if should_scrape_event(event, status, event_matches_dir, catalog):
+                        await emit((event.event_id, event.year, status == "completed"))
+
+            # 2. Event matches -> one match details task per match
+            async def handle_event(task: Tuple[Any, int, bool], emit: Emit) -> None:
+                event_id, year, completed = task
+                payloads: List[Any] = []
+                await process_event_matches(
+                    stats_client,
+                    http_client,
+                    event_id,
+                    year,
+                    output_dir=event_matches_dir,
+                    catalog=catalog,
+                    writer=writer,
+                    completed=completed,
+                    on_payload=payloads.append,
+                )
+                records = _event_match_records(
+                    event_matches_dir, event_id, year, payloads
+                )
+                summary["matches"] += len(records)
+                for detail_task in get_match_detail_tasks(records, event_id, year):
+                    summary["details_queued"] += 1
+                    await emit((detail_task, completed))
+
+            # 3. Match details -> match card files
+            async def handle_match(
+                task: Tuple[MatchDetailTask, bool], emit: Emit
+            ) -> None:
+                detail_task, completed = task
+                saved = await process_match_details(
+                    stats_client,
+                    http_client,
+                    detail_task,
+                    output_dir=match_details_dir,
+                    catalog=catalog,
+                    writer=writer,
+                    completed=completed,
+                )
+                if saved:
+                    summary["details_saved"] += 1
+                    if summary["first_details_s"] is None:
+                        summary["first_details_s"] = time.perf_counter() - start
+
+            processed = await run_stages(
+                years_to_scrape,
+                [
+                    Stage("events", handle_year, event_workers),
+                    Stage("event_matches", handle_event, event_matches_workers),
+                    Stage("match_details", handle_match, match_details_workers),
+                ],
+            )
+            # make sure every file is on disk before reporting
+            await writer.flush()
+            writes = writer.stats()
+            checked, unchanged = catalog.fetch_summary(since=start_time)
+
+            result = PipelineSummary(
+                years=processed[0],
+                events_queued=processed[1],
+                matches=summary["matches"],
+                details_queued=summary["details_queued"],
+                details_saved=summary["details_saved"],
+                first_details_s=summary["first_details_s"],
+                elapsed_s=time.perf_counter() - start,
+            )
+
+            minutes = int(result.elapsed_s // 60)
+            seconds = int(result.elapsed_s % 60)
+            print(f"\n🎉 Completed the pipeline in {minutes}m {seconds}s.")
+            print(f"Years fetched:          {result.years}")
+            print(f"Events queued:          {result.events_queued}")
+            print(f"Matches found:          {result.matches}")
+            print(f"Match cards queued:     {result.details_queued}")
+            print(f"Match cards saved:      {result.details_saved}")
+            if result.first_details_s is not None:
+                print(f"First match card after: {result.first_details_s:.1f}s")
+            print(f"Files written: {writes.written} (failed: {writes.failed})")
+            print(f"Unchanged (no-op) fetches: {unchanged} of {checked}")
+            for line in stats_client.summary():
+                print(line)
+            print("--- 🟢 Collection Pipeline Complete 🟢 ---")
+        return result
+    finally:
+        if owns_catalog:
+            catalog.close()
+        if owns_client:
+            # the client was created here, close its connections too
+            await stats_client.aclose()
+            if cache is not None:
+                cache.close()
+
+
+if __name__ == "__main__":
+    with RawCatalog() as catalog:
+        years_to_scrape = get_years_to_scrape(
+            output_dir=RAW_EVENTS_DIR, catalog=catalog
+        )
+    asyncio.run(run_pipeline(years_to_scrape))
@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import httpx
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Union
+from tqdm.asyncio import tqdm
+from src.config import (
+    PLAYER_DETAILS_MAX_AGE,
+    PLAYER_DETAILS_WORKERS,
+    PLAYER_INDEX_BATCH,
+    RAW_EVENT_MATCHES_DIR,
+    RAW_PLAYERS_DIR,
+)
+from src.utils.api_client import TTStatsClient
+from src.utils.routes import WTTRoutes
+from src.utils.io_handler import save_raw_json
+from src.utils.player_index import PlayerIndex
+from src.utils.raw_catalog import RawCatalog
+from src.utils.response_cache import open_response_cache
+from src.utils.change_detection import (
+    conditional_headers,
+    fetch_source,
+    is_unchanged,
+)
+from src.utils.scheduler import RunBudget
+from src.utils.task_queue import run_worker_pool
+from src.utils.write_behind import WriteBehindWriter, save_outcome
+
+
+async def process_player(
+    client: TTStatsClient,
+    http_client: httpx.AsyncClient,
+    player_id: Union[int, str],
+    output_dir: Path = RAW_PLAYERS_DIR,
+    catalog: Optional[RawCatalog] = None,
+    writer: Optional[WriteBehindWriter] = None,
+    on_outcome: Optional[Callable[[Optional[str]], None]] = None,
+) -> Optional[bool]:
+    """
+    Scrapes the details of one player and saves them as player_<id>.json.
+
+    Args:
+        client (TTStatsClient): The client to use for making requests.
+        http_client (httpx.AsyncClient): The underlying HTTP client.
+        player_id (Union[int, str]): The player to scrape.
+        output_dir (Path): The directory to save the player files in.
+        catalog (Optional[RawCatalog]): Raw catalog updated on write. With a catalog,
+            the request is conditional and an unchanged response is neither decoded
+            nor rewritten.
+        writer (Optional[WriteBehindWriter]): If given, the file is written in the background
+            instead of blocking the event loop.
+        on_outcome (Optional[Callable[[Optional[str]], None]]): Called once the outcome is
+            final - None when the response was unchanged or its file is on disk, else the
+            error class name, e.g. to record the player as fetched in the PlayerIndex.
+
+    Returns:
+        Optional[bool]: True if new or changed details were saved (or queued for saving), False if they were
+            unchanged, None if the fetch failed.
+    """
+    filename = f"player_{player_id}.json"
+    route = WTTRoutes.get_player_details_route(player_id)
+
+    try:
+        entry = None
+        if catalog is not None:
+            # SQLite, or a full read of the file on a miss - off the event loop
+            entry = await asyncio.to_thread(catalog.lookup, output_dir / filename)
+        response = await client.fetch_route_async(
+            http_client, route, extra_headers=conditional_headers(entry)
+        )
+
+        # same payload as the stored copy - skip decoding and the write
+        if is_unchanged(response, entry):
+            await asyncio.to_thread(catalog.mark_checked, output_dir / filename)
+            if on_outcome is not None:
+                on_outcome(None)
+            return False
+
+        response.raise_for_status()
+        data = response.json()
+        source = fetch_source(response)
+
+        if writer is not None:
+            saved = await writer.submit(
+                data, output_dir, filename, catalog=catalog, source=source
+            )
+            if on_outcome is not None:
+                # final once the background write is done
+                saved.add_done_callback(lambda future: on_outcome(save_outcome(future)))
+        else:
+            ok = save_raw_json(
+                data, output_dir, filename, catalog=catalog, source=source
+            )
+            if on_outcome is not None:
+                on_outcome(None if ok else "SaveError")
+        return True
+
+    except Exception as e:
+        tqdm.write(
+            f"❌ Error scraping Player {player_id}: {type(e).__name__} - {str(e)}"
+        )
+        if on_outcome is not None:
+            on_outcome(type(e).__name__)
+        return None
+
+
+async def run_player_scraper(
+    num_workers: int = PLAYER_DETAILS_WORKERS,
+    event_matches_dir: Path = RAW_EVENT_MATCHES_DIR,
+    output_dir: Path = RAW_PLAYERS_DIR,
+    player_index: Optional[PlayerIndex] = None,
+    catalog: Optional[RawCatalog] = None,
+    stats_client: Optional[TTStatsClient] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    max_age: float = PLAYER_DETAILS_MAX_AGE,
+    limit: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+    max_requests: Optional[int] = None,
+) -> None:
+    """
+    Runs the player details scraper over every player of the event matches.
+
+    Player ids are harvested from new or changed event matches files into the
+    persistent player index, which deduplicates them across all matches. Only
+    players never fetched, or fetched longer ago than max_age, are requested,
+    so the number of requests grows with unique players rather than matches.
+    Fetched players are recorded in the index in batches once their file is
+    on disk, an interrupted run or a failed write leaves them due for the
+    next run.
+
+    Args:
+        num_workers (int): Number of concurrent workers, all behind the client's rate limiter.
+        event_matches_dir (Path): The directory with the event matches year sub-directories.
+        output_dir (Path): The directory to save the player files in.
+        player_index (Optional[PlayerIndex]): Player index to use, defaults to the project index.
+        catalog (Optional[RawCatalog]): Raw catalog to use, defaults to the project catalog.
+        stats_client (Optional[TTStatsClient]): Client to use, defaults to a new client
+            with the project response cache (TT_RESPONSE_CACHE).
+        transport (Optional[httpx.AsyncBaseTransport]): Transport for the HTTP client,
+            e.g. to run against a local fake server instead of the WTT API.
+        max_age (float): Seconds a player's details stay fresh.
+        limit (Optional[int]): Fetch at most this many players in this run.
+        max_seconds (Optional[float]): Start no new fetch after this many seconds, the
+            players left stay due for the next run.
+        max_requests (Optional[int]): Start no new fetch once this many HTTP requests
+            were sent in this run, retries and revalidations included.
+
+    Returns:
+        None
+    """
+    print("--- 🟢 Commencing Player Scraper 🟢 ---")
+
+    owns_client = stats_client is None
+    cache = None
+    if owns_client:
+        cache = open_response_cache()
+        stats_client = TTStatsClient(cache=cache)
+    start_time = time.time()
+    budget = RunBudget(
+        max_seconds=max_seconds,
+        max_requests=max_requests,
+        requests_sent=lambda: stats_client.requests_sent,
+    )
+
+    owns_index = player_index is None
+    player_index = player_index or PlayerIndex()
+    owns_catalog = catalog is None
+    catalog = catalog or RawCatalog()
+
+    try:
+        # 1. Collect the players of new / changed event matches files
+        harvest = player_index.harvest(event_matches_dir)
+        due = player_index.due(max_age, limit=limit)
+        stats = player_index.stats(max_age)
+
+        print("\n--- 📋 Pre-Scrape Summary ---")
+        print(f"Event Matches Files:      {harvest.files} ({harvest.parsed} read)")
+        print(f"Unique Players:           {stats.players} ({harvest.new_players} new)")
+        print(f"Fetched Before:           {stats.fetched}")
+        print(f"Players Pending Scrape:   {len(due)}")
+        print("----------------------------\n")
+
+        if due:
+            # the client's shared connection pool, reused across runs
+            http_client = stats_client.http_client(transport)
+            async with WriteBehindWriter() as writer:
+                summary = {"saved": 0, "unchanged": 0, "failed": 0}
+                fetched: List[str] = []
+                skipped: Set[str] = set()  # handed out, but the budget ran out first
+                progress = tqdm(total=len(due), desc="Scraping Players", unit="player")
+
+                # 2. Worker handler - one player
+                async def handle_player(player_id: str) -> Optional[bool]:
+                    if not budget.admit(player_id):
+                        skipped.add(player_id)
+                        return None  # still due for the next run
+
+                    # fetched only once the file is on disk, a failed write
+                    # leaves the player due
+                    def record_outcome(error: Optional[str]) -> None:
+                        if error is None:
+                            fetched.append(player_id)
+                            if len(fetched) >= PLAYER_INDEX_BATCH:
+                                player_index.mark_fetched(fetched)
+                                fetched.clear()
+
+                    return await process_player(
+                        stats_client,
+                        http_client,
+                        player_id,
+                        output_dir=output_dir,
+                        catalog=catalog,
+                        writer=writer,
+                        on_outcome=record_outcome,
+                    )
+
+                # 3. Stream results into the summary as they complete
+                def record_result(player_id: str, result: Optional[bool]) -> None:
+                    if player_id in skipped:
+                        return
+                    if result is None:
+                        summary["failed"] += 1
+                    else:
+                        summary["saved" if result else "unchanged"] += 1
+                    progress.update(1)
+
+                await run_worker_pool(
+                    budget.take(due),
+                    handle_player,
+                    num_workers=num_workers,
+                    on_result=record_result,
+                    queue_size=1 if budget.limited else None,
+                )
+                progress.close()
+                # make sure every file is on disk before recording the last batch
+                await writer.flush()
+                player_index.mark_fetched(fetched)
+                writes = writer.stats()
+
+                elapsed = time.time() - start_time
+                minutes = int(elapsed // 60)
+                seconds = int(elapsed % 60)
+
+                print(
+                    f"\n🎉 Completed {budget.dispatched} players in {minutes}m {seconds}s."
+                )
+                print(f"Saved (new/changed): {summary['saved']}")
+                print(f"Unchanged:           {summary['unchanged']}")
+                print(f"Failed:              {summary['failed']}")
+                print(f"Files written: {writes.written} (failed: {writes.failed})")
+                if budget.remaining:
+                    print(
+                        f"⏱️ Budget {budget.exhausted_by()} spent, "
+                        f"{len(budget.remaining)} players still due for the next run"
+                    )
+                for line in stats_client.summary():
+                    print(line)
+        else:
+            print("No players to fetch.")
+        print("--- 🟢 Player Scraper Complete 🟢 ---")
+    finally:
+        if owns_index:
+            player_index.close()
+        if owns_catalog:
+            catalog.close()
+        if owns_client:
+            # the client was created here, close its connections too
+            await stats_client.aclose()
+            if cache is not None:
+                cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fetch the details of every player in the event matches."
+    )
+    parser.add_argument("--workers", type=int, default=PLAYER_DETAILS_WORKERS)
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="Start no new task after this many seconds (e.g. a cron time slot)",
+    )
+    parser.add_argument(
+        "--max-tasks",
+        type=int,
+        default=None,
+        help="Fetch at most this many players (one task each), retries not counted",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=None,
+        help="Start no new task once this many HTTP requests were sent, retries "
+        "and revalidations included",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_player_scraper(
+            num_workers=args.workers,
+            limit=args.max_tasks,
+            max_seconds=args.max_seconds,
+            max_requests=args.max_requests,
+        )
+    )
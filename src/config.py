@@ -1,5 +1,6 @@
 # src/config.py
 from pathlib import Path
+import os
 import re
 
 # Setup directory structure
@@ -20,6 +21,57 @@ RAW_MATCHES_DIR = RAW_DIR / "match_details"
 RAW_PLAYERS_DIR = RAW_DIR / "player_details"
 RAW_EVENT_MATCHES_DIR = RAW_DIR / "event_matches"
 
+# SQLite index of every raw file (path, size, mtime, hash, row count, validity)
+RAW_CATALOG_PATH = DATA_DIR / "raw_catalog.sqlite"
+
+# Raw payload storage format: "json" (indent=4, readable), "json.gz" or "json.zst"
+# (compact + compressed). Readers detect the format, so this can be changed at any
+# time - run `python -m src.utils.migrate_raw_storage` to convert the existing tree.
+RAW_STORAGE_FORMAT = "json"
+
+# Pickle snapshot of the parsed events files, kept inside the events directory
+# (see src/utils/event_index.py) - safe to delete, it is rebuilt on the next run
+EVENT_INDEX_FILENAME = ".event_index.pickle"
+
+# Pickle snapshot of per-file event matches aggregates, kept inside the event
+# matches directory (see src/utils/match_index.py) - safe to delete
+MATCH_INDEX_FILENAME = ".match_index.pickle"
+# Processes used to scan new / changed raw files for the report
+REPORT_WORKERS = os.cpu_count() or 1
+
+# Seen-set of the players in the event matches, with their last fetch time
+# (see src/utils/player_index.py)
+PLAYER_INDEX_PATH = DATA_DIR / "player_index.sqlite"
+
+# Write-ahead journal of the event matches scraper tasks, for --resume and
+# --retry-failed runs (see src/utils/task_journal.py)
+TASK_JOURNAL_PATH = DATA_DIR / "task_journal.sqlite"
+
+# Append-only logs of the new / changed matches seen by the live poller,
+# one <year>/event_matches_<id>.jsonl per event
+LIVE_DELTAS_DIR = DATA_DIR / "live_deltas"
+
+# On-disk HTTP response cache (see src/utils/response_cache.py)
+RESPONSE_CACHE_PATH = DATA_DIR / "response_cache.sqlite"
+# "off": no cache, "record": serve fresh cached responses and store new ones,
+# "replay": serve recorded responses only, a miss is an error (offline, deterministic runs)
+RESPONSE_CACHE_MODE = os.environ.get("TT_RESPONSE_CACHE", "off")
+# Least recently used responses are evicted above this size
+RESPONSE_CACHE_MAX_BYTES = 2 * 1024**3
+# TTLs in seconds - completed events / past years never expire
+RESPONSE_CACHE_TTL_CURRENT_YEAR = 60 * 60  # events calendar of this year and later
+RESPONSE_CACHE_TTL_LIVE_EVENT = 10 * 60  # matches of events that are not completed
+
+# Typed Parquet tables built from the raw event matches (see src/transforms/event_matches_transform.py)
+INTERMEDIATE_EVENT_MATCHES_DIR = INTERMEDIATE_DIR / "event_matches"
+# Raw file state of the last intermediate build, kept inside the output directory
+INTERMEDIATE_MANIFEST_FILENAME = ".build_manifest.pickle"
+
+# Year-partitioned master match table (see src/transforms/master_matches.py)
+MASTER_MATCHES_DIR = MASTER_DIR / "matches"
+# Per-partition statistics (rows, event ids, player ids, date range) for pruning
+MASTER_STATS_FILENAME = "_partitions.json"
+
 # Ensure ALL directories exist when config is imported
 for directory in [
     RAW_EVENTS_DIR,
@@ -50,3 +102,57 @@ EXCLUDED_EVENT_TERMS = {
 AGE_LIMIT_PATTERN = r"\bu\d{2}\b"
 # Regex to remove u21 / u19 that is not case sensitive
 AGE_LIMIT_REGEX = re.compile(AGE_LIMIT_PATTERN, re.IGNORECASE)
+
+# Single pattern for both checks: any excluded term (substring) or an age limit.
+# Used by is_senior_event and, with the same syntax, by Polars in classify_events.
+EXCLUDED_EVENT_PATTERN = "|".join(
+    [re.escape(term) for term in sorted(EXCLUDED_EVENT_TERMS)] + [AGE_LIMIT_PATTERN]
+)
+EXCLUDED_EVENT_REGEX = re.compile(EXCLUDED_EVENT_PATTERN, re.IGNORECASE)
+
+
+## Scraper settings
+# Number of async workers pulling (event_id, year) tasks in the event matches scraper
+EVENT_MATCHES_WORKERS = 50
+# Workers per stage of the events -> event matches -> match details pipeline
+# (see src/collectors/pipeline.py), every stage shares the client's rate limiter
+PIPELINE_EVENT_WORKERS = 4
+PIPELINE_EVENT_MATCHES_WORKERS = EVENT_MATCHES_WORKERS
+PIPELINE_MATCH_DETAILS_WORKERS = 50
+# Completed events that ended within this many days are scraped before older
+# backfill gaps (see src/utils/scheduler.py), ongoing events always come first
+RECENT_EVENT_DAYS = 30
+# Live polling of ongoing events (see src/collectors/live_poller.py): seconds
+# between polls of one event, shortened to the minimum when its matches change
+# and multiplied by the backoff after every poll without changes
+LIVE_POLL_MIN_INTERVAL = 15.0
+LIVE_POLL_MAX_INTERVAL = 300.0
+LIVE_POLL_BACKOFF = 2.0
+# A polled event's full event matches file is rewritten at most this often,
+# the new / changed matches in between are appended to its delta log
+LIVE_CONSOLIDATE_INTERVAL = 10 * 60
+# Player details collector: concurrent fetches, and how long fetched details stay fresh
+PLAYER_DETAILS_WORKERS = 20
+PLAYER_DETAILS_MAX_AGE = 30 * 24 * 60 * 60
+# Fetched players are recorded in the player index in batches of this size
+PLAYER_INDEX_BATCH = 100
+
+## HTTP connection settings
+# Shared async WTT client owned by TTStatsClient (see TTStatsClient.http_client).
+# HTTP/2 multiplexes the concurrent requests over few connections when the
+# optional h2 package is installed (pip install ".[http2]"), else HTTP/1.1.
+HTTP2_ENABLED = True
+HTTP_TIMEOUT = 30.0
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+# Seconds an idle pooled connection is kept open for reuse
+HTTP_KEEPALIVE_EXPIRY = 30.0
+# Threaded ITTF engine (see src/collectors/ittf_engine.py): request threads,
+# each with its own keep-alive client, and the threads parsing the HTML
+ITTF_FETCH_WORKERS = 8
+ITTF_PARSE_WORKERS = 2
+ITTF_MAX_CONNECTIONS_PER_THREAD = 2
+# Per-host circuit breaker of the WTT API hosts (see src/utils/circuit_breaker.py):
+# consecutive failures before a host fails fast, and seconds before it is probed again
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30.0
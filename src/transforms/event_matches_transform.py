@@ -0,0 +1,442 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import polars as pl
+
+from src.config import (
+    INTERMEDIATE_EVENT_MATCHES_DIR,
+    INTERMEDIATE_MANIFEST_FILENAME,
+    RAW_EVENT_MATCHES_DIR,
+)
+from src.utils.io_handler import load_raw_bytes
+from src.utils.raw_storage import RAW_DECODE_ERRORS, iter_raw_files, resolve_raw_path
+from src.utils.wtt_models import MatchRecord, decode_match_records
+
+# Bump when the table schemas / manifest layout change - everything is rebuilt
+MANIFEST_VERSION = 1
+
+# One Parquet file per table and year: <output_dir>/<table>/<year>.parquet
+# Every row keeps the raw file it came from ("2024/event_matches_123.json"),
+# so the rows of a changed file can be replaced without re-parsing the year.
+TABLE_SCHEMAS: Dict[str, Dict[str, pl.DataType]] = {
+    "matches": {
+        "source_file": pl.String,
+        "year": pl.Int32,
+        "event_id": pl.Int64,
+        "document_code": pl.String,
+        "sub_event": pl.String,
+        "match_datetime": pl.String,
+        "result_status": pl.String,
+        "home_competitor_id": pl.String,
+        "away_competitor_id": pl.String,
+        "home_games": pl.Int16,
+        "away_games": pl.Int16,
+        "winner": pl.String,  # "H", "A" or null
+    },
+    # a side of a match: one player, a doubles pair or a national team
+    "competitors": {
+        "source_file": pl.String,
+        "year": pl.Int32,
+        "document_code": pl.String,
+        "side": pl.String,
+        "competitor_id": pl.String,
+        "competitor_name": pl.String,
+        "competitor_org": pl.String,
+        "player_count": pl.Int16,
+    },
+    "players": {
+        "source_file": pl.String,
+        "year": pl.Int32,
+        "document_code": pl.String,
+        "side": pl.String,
+        "player_id": pl.String,
+        "player_name": pl.String,
+        "player_org": pl.String,
+    },
+    "games": {
+        "source_file": pl.String,
+        "year": pl.Int32,
+        "document_code": pl.String,
+        "game_no": pl.Int16,
+        "home_points": pl.Int16,
+        "away_points": pl.Int16,
+    },
+}
+
+
+class RawFileEntry(NamedTuple):
+    stored_name: str  # Name of the stored file, e.g. "event_matches_123.json.zst"
+    size: int
+    mtime_ns: int
+    content_hash: str  # sha256 of the stored bytes
+
+
+class BuildSummary(NamedTuple):
+    files: int  # Raw files in the tree
+    parsed: int  # New or changed files parsed
+    unchanged: int  # Files skipped by size / mtime or hash
+    removed: int  # Files gone since the last build
+    failed: int  # Files that could not be decoded
+    years_rewritten: List[int]
+    elapsed_s: float
+
+
+def _first(*values: Any) -> Any:
+    for value in values:
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _score_pair(value: Any) -> Tuple[Optional[int], Optional[int]]:
+    # "3-1" -> (3, 1)
+    if not isinstance(value, str) or "-" not in value:
+        return None, None
+    home, _, away = value.partition("-")
+    return _int(home.strip()), _int(away.strip())
+
+
+def _match_datetime(value: Any) -> Optional[str]:
+    # either a plain string or an object of local / UTC start times
+    if isinstance(value, dict):
+        value = _first(
+            value.get("startDateUTC"),
+            value.get("startDateLocal"),
+            value.get("matchDateTime"),
+        )
+    return _text(value)
+
+
+def flatten_event_matches(
+    records: List[MatchRecord], year: int, source_file: str
+) -> Dict[str, List[Dict]]:
+    """
+    Flattens the match records of an event_matches_<id>.json payload into rows
+    of the intermediate tables.
+
+    Rows are either the match itself or wrap it in a "match_card". Scores are
+    "3-1" style strings, game scores a comma separated string or list of
+    "11-7" pairs (unplayed "0-0" games are dropped). Competitors come from
+    "competitiors" (sic, as sent by WTT) or "competitors"; a competitor
+    without a players list is a singles player.
+
+    Args:
+        records (List[MatchRecord]): The payload, decoded with decode_match_records.
+        year (int): The year sub-directory of the file.
+        source_file (str): The file, relative to the event matches directory.
+
+    Returns:
+        Dict[str, List[Dict]]: Rows per table name of TABLE_SCHEMAS.
+    """
+    tables: Dict[str, List[Dict]] = {table: [] for table in TABLE_SCHEMAS}
+
+    for record in records:
+        card = record.card
+        document_code = _text(_first(card.documentCode, record.documentCode))
+        if document_code is None:
+            continue
+        base = {
+            "source_file": source_file,
+            "year": year,
+            "document_code": document_code,
+        }
+
+        sides: Dict[str, Optional[str]] = {"H": None, "A": None}
+        competitors = card.competitiors or card.competitors or []
+        for position, competitor in enumerate(competitors):
+            side = competitor.competitorType or ("H", "A")[position % 2]
+            competitor_id = _text(competitor.competitorId)
+            if sides.get(side) is None:
+                sides[side] = competitor_id
+            players = [
+                (_text(p.playerId), p.playerName, _first(p.playerOrgCode, p.playerOrg))
+                for p in competitor.players or []
+            ]
+            if not players:
+                players = [
+                    (competitor_id, competitor.competitorName, competitor.competitorOrg)
+                ]
+            tables["competitors"].append(
+                {
+                    **base,
+                    "side": side,
+                    "competitor_id": competitor_id,
+                    "competitor_name": competitor.competitorName,
+                    "competitor_org": competitor.competitorOrg,
+                    "player_count": len(players),
+                }
+            )
+            for player_id, player_name, player_org in players:
+                tables["players"].append(
+                    {
+                        **base,
+                        "side": side,
+                        "player_id": player_id,
+                        "player_name": player_name,
+                        "player_org": player_org,
+                    }
+                )
+
+        game_scores = _first(card.gameScores, card.resultGameScores) or []
+        if isinstance(game_scores, str):
+            game_scores = game_scores.split(",")
+        game_no = 0
+        for game in game_scores:
+            home_points, away_points = _score_pair(game)
+            if home_points is None or away_points is None:
+                continue
+            if home_points == 0 and away_points == 0:
+                continue
+            game_no += 1
+            tables["games"].append(
+                {
+                    **base,
+                    "game_no": game_no,
+                    "home_points": home_points,
+                    "away_points": away_points,
+                }
+            )
+
+        home_games, away_games = _score_pair(
+            _first(card.overallScores, card.resultOverallScores)
+        )
+        winner = None
+        if (
+            home_games is not None
+            and away_games is not None
+            and home_games != away_games
+        ):
+            winner = "H" if home_games > away_games else "A"
+        tables["matches"].append(
+            {
+                **base,
+                "event_id": _int(_first(card.eventId, record.eventId)),
+                "sub_event": _first(card.subEventName, card.subEventDescription),
+                "match_datetime": _match_datetime(card.matchDateTime),
+                "result_status": card.resultStatus,
+                "home_competitor_id": sides.get("H"),
+                "away_competitor_id": sides.get("A"),
+                "home_games": home_games,
+                "away_games": away_games,
+                "winner": winner,
+            }
+        )
+    return tables
+
+
+def table_path(output_dir: Path, table: str, year: int) -> Path:
+    return output_dir / table / f"{year}.parquet"
+
+
+def scan_table(
+    table: str, output_dir: Path = INTERMEDIATE_EVENT_MATCHES_DIR
+) -> pl.LazyFrame:
+    """
+    Returns a lazy frame over every year of an intermediate table.
+    """
+    files = sorted((output_dir / table).glob("*.parquet"))
+    if not files:
+        return pl.LazyFrame(schema=TABLE_SCHEMAS[table])
+    return pl.scan_parquet(files)
+
+
+def _write_parquet(frame: pl.DataFrame, path: Path) -> None:
+    # written next to the target and swapped in, readers never see a partial file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        frame.write_parquet(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _load_manifest(path: Path) -> Dict[str, RawFileEntry]:
+    try:
+        with open(path, "rb") as f:
+            manifest = pickle.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest["files"]
+    except Exception:
+        # missing, truncated or from an older layout - rebuild everything
+        return {}
+
+
+def _save_manifest(path: Path, files: Dict[str, RawFileEntry]) -> None:
+    payload = pickle.dumps(
+        {"version": MANIFEST_VERSION, "files": files}, protocol=pickle.HIGHEST_PROTOCOL
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _year_of(source_file: str) -> int:
+    return int(source_file.split("/", 1)[0])
+
+
+def build_event_matches_intermediate(
+    raw_dir: Path = RAW_EVENT_MATCHES_DIR,
+    output_dir: Path = INTERMEDIATE_EVENT_MATCHES_DIR,
+) -> BuildSummary:
+    """
+    Brings the intermediate event matches tables up to date with the raw files.
+
+    Raw files whose size and mtime match the last build are not read; touched
+    files that hash the same are not parsed. Only years with a new, changed or
+    removed file are rewritten, and in those years only the changed files are
+    parsed - the rows of the other files are carried over from the existing
+    Parquet file.
+
+    Args:
+        raw_dir (Path): The event matches directory with year sub-directories.
+        output_dir (Path): Where the <table>/<year>.parquet files are written.
+
+    Returns:
+        BuildSummary: What was parsed, skipped and rewritten.
+    """
+    start = time.perf_counter()
+    manifest_path = output_dir / INTERMEDIATE_MANIFEST_FILENAME
+    previous = _load_manifest(manifest_path)
+    current: Dict[str, RawFileEntry] = {}
+    dirty: Dict[int, Set[str]] = defaultdict(set)
+    unchanged = 0
+
+    year_dirs = []
+    if raw_dir.exists():
+        year_dirs = sorted(
+            path for path in raw_dir.iterdir() if path.is_dir() and path.name.isdigit()
+        )
+    for year_dir in year_dirs:
+        year = int(year_dir.name)
+        # a deleted output file means the whole year has to be rebuilt
+        missing_output = any(
+            not table_path(output_dir, table, year).exists() for table in TABLE_SCHEMAS
+        )
+        for raw_file in iter_raw_files(year_dir, "event_matches_*.json"):
+            stored_file = resolve_raw_path(year_dir, raw_file.name)
+            if stored_file is None:
+                continue
+            source_file = f"{year}/{raw_file.name}"
+            stat = stored_file.stat()
+            old = previous.get(source_file)
+
+            if (
+                not missing_output
+                and old is not None
+                and old.stored_name == stored_file.name
+                and old.size == stat.st_size
+                and old.mtime_ns == stat.st_mtime_ns
+            ):
+                current[source_file] = old
+                unchanged += 1
+                continue
+
+            content_hash = hashlib.sha256(stored_file.read_bytes()).hexdigest()
+            current[source_file] = RawFileEntry(
+                stored_name=stored_file.name,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                content_hash=content_hash,
+            )
+            if (
+                not missing_output
+                and old is not None
+                and old.content_hash == content_hash
+            ):
+                unchanged += 1
+                continue
+            dirty[year].add(source_file)
+
+    removed = previous.keys() - current.keys()
+    for source_file in removed:
+        dirty[_year_of(source_file)].add(source_file)
+
+    parsed = failed = 0
+    for year, source_files in sorted(dirty.items()):
+        new_rows: Dict[str, List[Dict]] = {table: [] for table in TABLE_SCHEMAS}
+        for source_file in sorted(source_files):
+            if source_file not in current:
+                continue
+            try:
+                records = decode_match_records(
+                    load_raw_bytes(raw_dir / str(year), source_file.split("/", 1)[1])
+                )
+            except RAW_DECODE_ERRORS:
+                failed += 1
+                continue
+            parsed += 1
+            for table, rows in flatten_event_matches(
+                records, year, source_file
+            ).items():
+                new_rows[table].extend(rows)
+
+        has_files = any(_year_of(f) == year for f in current)
+        for table, schema in TABLE_SCHEMAS.items():
+            path = table_path(output_dir, table, year)
+            if not has_files:
+                path.unlink(missing_ok=True)
+                continue
+            frame = pl.DataFrame(new_rows[table], schema=schema)
+            if path.exists():
+                kept = pl.read_parquet(path).filter(
+                    ~pl.col("source_file").is_in(list(source_files))
+                )
+                frame = pl.concat([kept, frame], how="vertical")
+            # grouped by raw file, payload order within a file
+            _write_parquet(frame.sort("source_file", maintain_order=True), path)
+
+    if dirty or current.keys() != previous.keys():
+        _save_manifest(manifest_path, current)
+
+    return BuildSummary(
+        files=len(current),
+        parsed=parsed,
+        unchanged=unchanged,
+        removed=len(removed),
+        failed=failed,
+        years_rewritten=sorted(dirty),
+        elapsed_s=time.perf_counter() - start,
+    )
+
+
+if __name__ == "__main__":
+    summary = build_event_matches_intermediate()
+    print("--- 🟢 Event Matches Intermediate Build 🟢 ---")
+    print(f"Raw files:            {summary.files}")
+    print(f"Parsed (new/changed): {summary.parsed}")
+    print(f"Unchanged (skipped):  {summary.unchanged}")
+    print(f"Removed:              {summary.removed}")
+    print(f"Failed to decode:     {summary.failed}")
+    print(f"Years rewritten:      {summary.years_rewritten or 'none'}")
+    print(f"Completed in {summary.elapsed_s:.1f}s")
@@ -0,0 +1,372 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set
+
+import polars as pl
+
+from src.config import (
+    INTERMEDIATE_EVENT_MATCHES_DIR,
+    MASTER_MATCHES_DIR,
+    MASTER_STATS_FILENAME,
+)
+from src.transforms.event_matches_transform import TABLE_SCHEMAS, table_path
+
+# Bump when MASTER_SCHEMA changes - every partition is rewritten
+MASTER_VERSION = 1
+
+MASTER_SCHEMA: Dict[str, pl.DataType] = {
+    "match_key": pl.String,  # "<event_id>:<document_code>", stable across rebuilds
+    "year": pl.Int32,
+    "event_id": pl.Int64,
+    "document_code": pl.String,
+    "sub_event": pl.String,
+    "match_datetime": pl.String,
+    "result_status": pl.String,
+    "home_competitor_id": pl.String,
+    "home_competitor_name": pl.String,
+    "home_competitor_org": pl.String,
+    "away_competitor_id": pl.String,
+    "away_competitor_name": pl.String,
+    "away_competitor_org": pl.String,
+    "home_player_ids": pl.List(pl.String),
+    "away_player_ids": pl.List(pl.String),
+    "home_games": pl.Int16,
+    "away_games": pl.Int16,
+    "winner": pl.String,
+    "game_scores": pl.String,  # "11-7,9-11,11-5", home points first
+    "games_played": pl.Int16,
+    "source_file": pl.String,
+}
+
+
+class PartitionStats(NamedTuple):
+    year: int
+    file: str  # Relative to the master directory, e.g. "year=2024/part-0.parquet"
+    rows: int
+    event_ids: List[int]  # Sorted
+    player_ids: List[str]  # Sorted
+    min_match_datetime: Optional[str]
+    max_match_datetime: Optional[str]
+    fingerprint: str  # Inputs the partition was built from
+    built_at: str
+
+
+class MasterBuildSummary(NamedTuple):
+    partitions: int  # Partitions in the dataset after the build
+    rewritten: List[int]  # Years whose partition was (re)written
+    removed: List[int]  # Years whose partition was deleted
+    rows: int  # Rows in the dataset
+    duplicates: int  # Matches dropped because another year already holds them
+    elapsed_s: float
+
+
+def match_key_expr() -> pl.Expr:
+    return pl.concat_str(
+        [pl.col("event_id").cast(pl.String).fill_null(""), pl.col("document_code")],
+        separator=":",
+    ).alias("match_key")
+
+
+def partition_path(master_dir: Path, year: int) -> Path:
+    return master_dir / f"year={year}" / "part-0.parquet"
+
+
+def load_partition_stats(
+    master_dir: Path = MASTER_MATCHES_DIR,
+) -> Dict[int, PartitionStats]:
+    """
+    Returns the statistics of every partition, keyed by year (empty if never built).
+    """
+    try:
+        report = json.loads((master_dir / MASTER_STATS_FILENAME).read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if report.get("version") != MASTER_VERSION:
+        return {}
+    return {
+        int(year): PartitionStats(**stats)
+        for year, stats in report["partitions"].items()
+    }
+
+
+def _write_atomic(path: Path, write) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        write(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _save_partition_stats(master_dir: Path, stats: Dict[int, PartitionStats]) -> None:
+    report = {
+        "version": MASTER_VERSION,
+        "partitions": {
+            str(year): entry._asdict() for year, entry in sorted(stats.items())
+        },
+    }
+    _write_atomic(
+        master_dir / MASTER_STATS_FILENAME,
+        lambda tmp: Path(tmp).write_text(json.dumps(report, indent=4), "utf-8"),
+    )
+
+
+def _read_year(intermediate_dir: Path, table: str, year: int) -> pl.DataFrame:
+    path = table_path(intermediate_dir, table, year)
+    if not path.exists():
+        return pl.DataFrame(schema=TABLE_SCHEMAS[table])
+    return pl.read_parquet(path)
+
+
+def build_master_partition(
+    intermediate_dir: Path, year: int, exclude: Set[str]
+) -> pl.DataFrame:
+    """
+    Joins the intermediate tables of one year into master match rows.
+
+    Args:
+        intermediate_dir (Path): Directory of the intermediate <table>/<year>.parquet files.
+        year (int): The year to build.
+        exclude (Set[str]): Match keys held by an earlier year's partition.
+
+    Returns:
+        pl.DataFrame: One row per match key, in MASTER_SCHEMA column order.
+    """
+    join_on = ["source_file", "document_code"]
+    matches = _read_year(intermediate_dir, "matches", year).with_columns(
+        match_key_expr()
+    )
+    competitors = _read_year(intermediate_dir, "competitors", year)
+    players = _read_year(intermediate_dir, "players", year)
+    games = _read_year(intermediate_dir, "games", year)
+
+    for side, prefix in (("H", "home"), ("A", "away")):
+        side_competitors = (
+            competitors.filter(pl.col("side") == side)
+            .unique(subset=join_on, keep="first", maintain_order=True)
+            .select(
+                *join_on,
+                pl.col("competitor_name").alias(f"{prefix}_competitor_name"),
+                pl.col("competitor_org").alias(f"{prefix}_competitor_org"),
+            )
+        )
+        side_players = (
+            players.filter(pl.col("side") == side)
+            .group_by(join_on, maintain_order=True)
+            .agg(pl.col("player_id").drop_nulls().alias(f"{prefix}_player_ids"))
+        )
+        matches = matches.join(side_competitors, on=join_on, how="left").join(
+            side_players, on=join_on, how="left"
+        )
+
+    game_summary = (
+        games.sort("game_no")
+        .group_by(join_on, maintain_order=True)
+        .agg(
+            pl.format("{}-{}", "home_points", "away_points")
+            .str.join(",")
+            .alias("game_scores"),
+            pl.len().cast(pl.Int16).alias("games_played"),
+        )
+    )
+    matches = matches.join(game_summary, on=join_on, how="left")
+
+    return (
+        matches.filter(~pl.col("match_key").is_in(list(exclude)))
+        .unique(subset="match_key", keep="first", maintain_order=True)
+        .with_columns(
+            pl.col("home_player_ids").fill_null(pl.lit([], dtype=pl.List(pl.String))),
+            pl.col("away_player_ids").fill_null(pl.lit([], dtype=pl.List(pl.String))),
+            pl.col("games_played").fill_null(0),
+        )
+        .select([pl.col(name).cast(dtype) for name, dtype in MASTER_SCHEMA.items()])
+    )
+
+
+def _input_fingerprint(intermediate_dir: Path, year: int, exclude: Set[str]) -> str:
+    # the intermediate files are replaced atomically, so size + mtime identify them
+    digest = hashlib.sha256(f"v{MASTER_VERSION}".encode())
+    for table in TABLE_SCHEMAS:
+        path = table_path(intermediate_dir, table, year)
+        stat = path.stat() if path.exists() else None
+        digest.update(
+            f"{table}:{stat.st_size}:{stat.st_mtime_ns};".encode()
+            if stat
+            else f"{table}:-;".encode()
+        )
+    for key in sorted(exclude):
+        digest.update(key.encode())
+    return digest.hexdigest()
+
+
+def build_master_matches(
+    intermediate_dir: Path = INTERMEDIATE_EVENT_MATCHES_DIR,
+    master_dir: Path = MASTER_MATCHES_DIR,
+) -> MasterBuildSummary:
+    """
+    Upserts the year-partitioned master match table from the intermediate tables.
+
+    Each match gets a stable key (event id + document code). A match found in
+    several years (an event listed in two year files) is kept in the earliest
+    year's partition only. A partition is rewritten only when its intermediate
+    inputs or its set of excluded duplicates changed, so re-scraping an
+    ongoing event rewrites just that year. Partition statistics (rows, event
+    ids, player ids, date range) are written next to the partitions for pruning.
+
+    Args:
+        intermediate_dir (Path): Directory of the intermediate tables.
+        master_dir (Path): Directory of the year=<year>/part-0.parquet partitions.
+
+    Returns:
+        MasterBuildSummary: What was rewritten and removed.
+    """
+    start = time.perf_counter()
+    previous = load_partition_stats(master_dir)
+
+    years = sorted(
+        int(path.stem)
+        for path in (intermediate_dir / "matches").glob("*.parquet")
+        if path.stem.isdigit()
+    )
+
+    # the earliest year holding a match key owns it
+    keys = (
+        pl.scan_parquet([table_path(intermediate_dir, "matches", y) for y in years])
+        .select("year", match_key_expr())
+        .unique()
+        .with_columns(pl.col("year").min().over("match_key").alias("owner"))
+        .filter(pl.col("year") != pl.col("owner"))
+        .collect()
+        if years
+        else pl.DataFrame(schema={"year": pl.Int32, "match_key": pl.String})
+    )
+    excluded: Dict[int, Set[str]] = {}
+    for year, group in keys.group_by("year"):
+        excluded[year[0]] = set(group["match_key"].to_list())
+
+    stats: Dict[int, PartitionStats] = {}
+    rewritten = []
+    for year in years:
+        exclude = excluded.get(year, set())
+        fingerprint = _input_fingerprint(intermediate_dir, year, exclude)
+        old = previous.get(year)
+        path = partition_path(master_dir, year)
+        if old is not None and old.fingerprint == fingerprint and path.exists():
+            stats[year] = old
+            continue
+
+        frame = build_master_partition(intermediate_dir, year, exclude)
+        _write_atomic(path, frame.write_parquet)
+        players = pl.concat(
+            [frame["home_player_ids"].explode(), frame["away_player_ids"].explode()]
+        ).drop_nulls()
+        stats[year] = PartitionStats(
+            year=year,
+            file=path.relative_to(master_dir).as_posix(),
+            rows=frame.height,
+            event_ids=sorted(frame["event_id"].drop_nulls().unique().to_list()),
+            player_ids=sorted(players.unique().to_list()),
+            min_match_datetime=frame["match_datetime"].min(),
+            max_match_datetime=frame["match_datetime"].max(),
+            fingerprint=fingerprint,
+            built_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        rewritten.append(year)
+
+    removed = sorted(previous.keys() - stats.keys())
+    for year in removed:
+        path = partition_path(master_dir, year)
+        path.unlink(missing_ok=True)
+        if path.parent.exists() and not any(path.parent.iterdir()):
+            path.parent.rmdir()
+
+    if rewritten or removed or not (master_dir / MASTER_STATS_FILENAME).exists():
+        _save_partition_stats(master_dir, stats)
+
+    return MasterBuildSummary(
+        partitions=len(stats),
+        rewritten=rewritten,
+        removed=removed,
+        rows=sum(entry.rows for entry in stats.values()),
+        duplicates=keys.height,
+        elapsed_s=time.perf_counter() - start,
+    )
+
+
+def prune_partitions(
+    stats: Dict[int, PartitionStats],
+    year: Optional[int] = None,
+    event_id: Optional[int] = None,
+    player_id: Optional[str] = None,
+) -> List[int]:
+    """
+    Returns the years whose partition can hold rows matching the filters,
+    decided from the partition statistics alone.
+    """
+    years = []
+    for entry in stats.values():
+        if year is not None and entry.year != year:
+            continue
+        if event_id is not None and event_id not in entry.event_ids:
+            continue
+        if player_id is not None and str(player_id) not in entry.player_ids:
+            continue
+        years.append(entry.year)
+    return sorted(years)
+
+
+def scan_master_matches(
+    master_dir: Path = MASTER_MATCHES_DIR,
+    year: Optional[int] = None,
+    event_id: Optional[int] = None,
+    player_id: Optional[str] = None,
+) -> pl.LazyFrame:
+    """
+    Returns a lazy frame over the master match table, reading only the
+    partitions that can match the filters and applying them as row filters.
+
+    Args:
+        master_dir (Path): Directory of the partitions and their statistics.
+        year (Optional[int]): Only matches of this year.
+        event_id (Optional[int]): Only matches of this event.
+        player_id (Optional[str]): Only matches this player played in.
+
+    Returns:
+        pl.LazyFrame: The matching rows, in MASTER_SCHEMA.
+    """
+    stats = load_partition_stats(master_dir)
+    years = prune_partitions(stats, year, event_id, player_id)
+    if not years:
+        return pl.LazyFrame(schema=MASTER_SCHEMA)
+
+    frame = pl.scan_parquet([master_dir / stats[y].file for y in years])
+    if event_id is not None:
+        frame = frame.filter(pl.col("event_id") == event_id)
+    if player_id is not None:
+        player = str(player_id)
+        frame = frame.filter(
+            pl.col("home_player_ids").list.contains(player)
+            | pl.col("away_player_ids").list.contains(player)
+        )
+    return frame
+
+
+if __name__ == "__main__":
+    summary = build_master_matches()
+    print("--- 🟢 Master Match Table Build 🟢 ---")
+    print(f"Partitions:           {summary.partitions}")
+    print(f"Rewritten:            {summary.rewritten or 'none'}")
+    print(f"Removed:              {summary.removed or 'none'}")
+    print(f"Rows:                 {summary.rows}")
+    print(f"Duplicates dropped:   {summary.duplicates}")
+    print(f"Completed in {summary.elapsed_s:.1f}s")
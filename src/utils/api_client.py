@@ -1,57 +1,438 @@
 import httpx
 import asyncio
-import time 
+import json
+import threading
+import time
 import random
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+try:
+    import h2  # noqa: F401 - HTTP/2 support for httpx (pip install "httpx[http2]")
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from src.config import (
+    HTTP2_ENABLED,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT,
+    ITTF_MAX_CONNECTIONS_PER_THREAD,
+)
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.rate_limiter import AdaptiveRateLimiter
+from src.utils.response_cache import NO_CACHE, ResponseCache
+from src.utils.retry_policy import RetryPolicy
 
 
 class TTStatsClient:
-    def __init__(self, max_pause_duration:float = 0.01):
+    def __init__(
+        self,
+        max_pause_duration: float = 0.01,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        ittf_transport: Optional[httpx.BaseTransport] = None,
+    ):
         """
         Initialize the client
+
+        Args:
+            max_pause_duration (float): Max random pause for the threaded ITTF requests.
+            limiter (Optional[AdaptiveRateLimiter]): Limiter shared by all async WTT requests
+                of every host. Defaults to one adaptive limiter per host, each tuning itself
+                during the run, so a slow host does not hold back the others.
+            retry_policy (Optional[RetryPolicy]): Retry policy (and per-run retry budget)
+                shared by all async WTT requests.
+            cache (Optional[ResponseCache]): On-disk response cache for the async WTT requests.
+                None (default) sends every request to the network.
+            ittf_transport (Optional[httpx.BaseTransport]): Transport for the threaded ITTF
+                clients, e.g. a mock in tests. Defaults to a pooled keep-alive connection.
         """
         self.max_pause_duration = max_pause_duration
+        self.limiter = limiter
+        # per-host isolation: the events calendar and the live events API are
+        # separate hosts, each gets its own limiter and circuit breaker
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.cache = cache
+        # identical route fetches that are already running, shared instead of re-sent
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+        # requests sent to the network, every retry and revalidation included
+        self.requests_sent = 0
         self.base_headers = {
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
+            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
         }
-    
+        # one pooled keep-alive client per ITTF worker thread (httpx.Client is not thread safe)
+        self.ittf_transport = ittf_transport
+        self._ittf_local = threading.local()
+        self._ittf_clients: List[httpx.Client] = []
+        self._ittf_lock = threading.Lock()
+        # shared async WTT clients, one per injected transport (None = the network)
+        self._async_clients: Dict[tuple, httpx.AsyncClient] = {}
+
     def _get_random_sleep(self):
-        return random.uniform(0, self.max_pause_duration)      
-        
+        return random.uniform(0, self.max_pause_duration)
+
     # SYNC / threaded section for older ITTF website
+    def _ittf_client(self) -> httpx.Client:
+        # created on first use in each thread, reused for every later request of that thread
+        client = getattr(self._ittf_local, "client", None)
+        if client is None:
+            client = httpx.Client(
+                headers=self.base_headers,
+                timeout=HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=ITTF_MAX_CONNECTIONS_PER_THREAD,
+                    max_keepalive_connections=ITTF_MAX_CONNECTIONS_PER_THREAD,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+                transport=self.ittf_transport,
+            )
+            self._ittf_local.client = client
+            with self._ittf_lock:
+                self._ittf_clients.append(client)
+        return client
+
     def get_ittf_threaded(self, url: str, params: Optional[Dict] = None) -> str:
         ## blocking get request used for older ITTF website threaded calls
-        
+        ## the thread's pooled client keeps its connection alive between calls
+
         # before call
         time.sleep(self._get_random_sleep())
-        with httpx.Client(headers=self.base_headers) as client:
-                response = client.get(url, params=params)
-                response.raise_for_status()
-                return response.text
+        response = self._ittf_client().get(url, params=params)
+        response.raise_for_status()
+        return response.text
+
+    def close(self) -> None:
+        """
+        Closes the pooled ITTF clients of every thread.
+        """
+        with self._ittf_lock:
+            clients, self._ittf_clients = self._ittf_clients, []
+        for client in clients:
+            client.close()
+        self._ittf_local = threading.local()
+
+    ## Shared async client for the WTT API
+
+    def http_client(
+        self, transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> httpx.AsyncClient:
+        """
+        Returns the shared AsyncClient of this TTStatsClient, created on first use.
+        Must be called from a running event loop.
+
+        Every collector using this TTStatsClient reuses the same connection pool
+        (HTTP/2 when the h2 package is installed, explicit pool limits and
+        keep-alive), instead of each run opening its own connections.
+        Close it with aclose() when the client is no longer needed.
+
+        Args:
+            transport (Optional[httpx.AsyncBaseTransport]): Transport to send through,
+                e.g. a local fake server; each transport gets its own shared client.
+
+        Returns:
+            httpx.AsyncClient: The shared client.
+        """
+        # connections belong to the event loop they were opened on, a new
+        # loop (another asyncio.run) gets a new client
+        key = (id(transport), id(asyncio.get_running_loop()))
+        client = self._async_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT,
+                http2=HTTP2_ENABLED and HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+                transport=transport,
+            )
+            self._async_clients[key] = client
+        return client
+
+    async def aclose(self) -> None:
+        """
+        Closes the shared async clients and the pooled ITTF clients.
+        """
+        loop_id = id(asyncio.get_running_loop())
+        clients = [
+            client for key, client in self._async_clients.items() if key[1] == loop_id
+        ]
+        # clients of finished loops cannot be closed from here, they are dropped
+        self._async_clients = {}
+        for client in clients:
+            await client.aclose()
+        self.close()
 
     ## ASYNC Senction for newer API / Website
 
-    async def post_wtt_async(self, client: httpx.AsyncClient, url: str, json_payload: Dict, headers: Optional[Dict] = None) -> Dict:
-        await asyncio.sleep(self._get_random_sleep())
-        
+    @staticmethod
+    def _host_of(url: str) -> str:
+        # "https://host/api/x" -> "host", a bare host name is returned as-is
+        return httpx.URL(url).host if "://" in url else url
+
+    def limiter_for(self, url: str) -> AdaptiveRateLimiter:
+        """
+        Returns the rate limiter of the host of a URL (or of a bare host name).
+        """
+        host = self._host_of(url)
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = (
+                self.limiter if self.limiter is not None else AdaptiveRateLimiter()
+            )
+            self._limiters[host] = limiter
+        return limiter
+
+    def breaker_for(self, url: str) -> CircuitBreaker:
+        """
+        Returns the circuit breaker of the host of a URL (or of a bare host name).
+        """
+        host = self._host_of(url)
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker()
+        return breaker
+
+    @staticmethod
+    def _clean_headers(headers: Optional[Dict]) -> Dict:
         # If content-type is in headers, remove it so httpx can add it cleanly via the json= arg
         clean_headers = headers.copy() if headers else {}
-        if 'content-type' in clean_headers:
-            del clean_headers['content-type']
-        
-        response = await client.post(url, json=json_payload, headers=clean_headers)
+        if "content-type" in clean_headers:
+            del clean_headers["content-type"]
+        return clean_headers
+
+    async def send_async(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_payload: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        Sends one request through the adaptive rate limiter of its host and feeds
+        the outcome (status code, latency, timeouts) back into it and into the
+        host's circuit breaker.
+        The response is returned as-is, status handling is left to the caller.
+
+        Raises:
+            CircuitOpenError: If the host's circuit breaker is open, without sending.
+        """
+        request_kwargs: Dict[str, Any] = {
+            "params": params,
+            "headers": self._clean_headers(headers),
+        }
+        if json_payload is not None:
+            request_kwargs["json"] = json_payload
+        if timeout is not None:
+            request_kwargs["timeout"] = timeout
+
+        limiter = self.limiter_for(url)
+        breaker = self.breaker_for(url)
+        async with limiter.slot():
+            # checked once a slot is free, so requests queued behind a failing
+            # host are shed as soon as its breaker opens
+            breaker.allow(self._host_of(url))
+            self.requests_sent += 1
+            start = time.monotonic()
+            try:
+                response = await client.request(method, url, **request_kwargs)
+            except httpx.RequestError:
+                # timeouts and connection errors are treated as congestion
+                limiter.record_failure()
+                breaker.record_failure()
+                raise
+            limiter.record_response(response.status_code, time.monotonic() - start)
+            breaker.record_response(response.status_code)
+        return response
+
+    async def request_async(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_payload: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        cache_ttl: Optional[float] = NO_CACHE,
+    ) -> httpx.Response:
+        """
+        Sends a request with the client's retry policy applied.
+        Every attempt goes through the rate limiter, the final response is returned
+        even if it is still an error status.
+
+        With a response cache, a cached response is returned without touching the
+        network, and a 200 response is stored for cache_ttl seconds (None = forever,
+        0 = not cached). In replay mode every request is served from the cache.
+        """
+        use_cache = self.cache is not None and (
+            cache_ttl != NO_CACHE or self.cache.mode == "replay"
+        )
+        if use_cache:
+            # SQLite, kept off the event loop like the write-behind writes
+            cached = await asyncio.to_thread(
+                self.cache.get, method, url, params, json_payload
+            )
+            if cached is not None:
+                return cached
+
+        async def send() -> httpx.Response:
+            return await self.send_async(
+                client,
+                method,
+                url,
+                params=params,
+                json_payload=json_payload,
+                headers=headers,
+                timeout=timeout,
+            )
+
+        response = await self.retry_policy.run(send)
+        if use_cache:
+            await asyncio.to_thread(
+                self.cache.put,
+                response,
+                method,
+                url,
+                params,
+                json_payload,
+                ttl=cache_ttl,
+            )
+        return response
+
+    async def fetch_route_async(
+        self,
+        client: httpx.AsyncClient,
+        route: Dict,
+        timeout: Optional[float] = 30.0,
+        extra_headers: Optional[Dict] = None,
+    ) -> httpx.Response:
+        """
+        Fetches a route dict built by WTTRoutes (method, url, params / json_payload, headers,
+        cache_ttl). extra_headers are added on top of the route headers, e.g. If-None-Match.
+
+        If an identical request is already in flight, its response is shared
+        instead of sending a second one.
+        """
+        headers = dict(route.get("headers") or {})
+        headers.update(extra_headers or {})
+        key = self._request_key(route, headers)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self.request_async(
+                    client,
+                    route["method"],
+                    route["url"],
+                    params=route.get("params"),
+                    json_payload=route.get("json_payload"),
+                    headers=headers,
+                    timeout=timeout,
+                    cache_ttl=route.get("cache_ttl", NO_CACHE),
+                )
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _request_key(route: Dict, headers: Dict) -> str:
+        return json.dumps(
+            [
+                route["method"],
+                route["url"],
+                route.get("params"),
+                route.get("json_payload"),
+                headers,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+    async def post_wtt_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        json_payload: Dict,
+        headers: Optional[Dict] = None,
+        cache_ttl: Optional[float] = NO_CACHE,
+    ) -> Dict:
+        response = await self.request_async(
+            client,
+            "POST",
+            url,
+            json_payload=json_payload,
+            headers=headers,
+            cache_ttl=cache_ttl,
+        )
         response.raise_for_status()
         return response.json()
 
-    async def get_wtt_async(self, client: httpx.AsyncClient, url: str, json_payload: Dict,params: Optional[Dict] = None, headers: Optional[Dict] = None) -> Dict:
-        # Non-blocking sleep, initialized http.x client passed in.
-        # before the call to the API - do a random sleep
-        # If content-type is in headers, remove it so httpx can add it cleanly via the json= arg
-        clean_headers = headers.copy() if headers else {}
-        if 'content-type' in clean_headers:
-            del clean_headers['content-type']
-        await asyncio.sleep(self._get_random_sleep())      
-        response = await client.get(url, headers=headers)
+    async def get_wtt_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        json_payload: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        cache_ttl: Optional[float] = NO_CACHE,
+    ) -> Dict:
+        # Non-blocking, initialized http.x client passed in.
+        # pacing is handled by the shared rate limiter instead of a random sleep
+        response = await self.request_async(
+            client, "GET", url, params=params, headers=headers, cache_ttl=cache_ttl
+        )
         response.raise_for_status()
         return response.json()
 
+    def summary(self) -> List[str]:
+        """
+        Returns human readable lines describing the client state after a run.
+        """
+        retries = self.retry_policy.stats()
+        reasons = ", ".join(f"{k}: {v}" for k, v in sorted(retries.by_reason.items()))
+        lines = []
+        for host in sorted(self._limiters):
+            state = self._limiters[host].state()
+            lines += [
+                f"Host {host}:",
+                f"  Rate limiter settled at:  {state.rate:.1f} req/s, {state.concurrency} concurrent",
+                f"  Requests / throttled:     {state.requests} / {state.throttled} ({state.decreases} backoffs)",
+                f"  Average latency:          {state.avg_latency:.2f}s",
+            ]
+            breaker = self._breakers.get(host)
+            if breaker is not None:
+                snapshot = breaker.snapshot()
+                lines.append(f"  Circuit breaker:          {snapshot.state}")
+                if snapshot.trips:
+                    lines.append(
+                        f"⚠️ Circuit breaker of {host} tripped {snapshot.trips}x, "
+                        f"{snapshot.rejected} requests failed fast"
+                    )
+        lines += [
+            f"Retries:                  {retries.retries} ({reasons or 'none'}), "
+            f"gave up on {retries.gave_up}, budget left {retries.budget_remaining}",
+            f"Coalesced requests:       {self.coalesced}",
+        ]
+        if self.cache is not None:
+            cache = self.cache.stats()
+            lines.append(
+                f"Response cache ({self.cache.mode}):  {cache.hits} hits / {cache.misses} misses, "
+                f"{cache.stored} stored, {cache.evicted} evicted, {cache.size_bytes / 1_000_000:.1f}MB"
+            )
+        return lines
@@ -0,0 +1,61 @@
+import hashlib
+from typing import Dict, Optional
+
+import httpx
+
+from src.utils.raw_catalog import CatalogEntry, FetchSource
+
+
+def conditional_headers(entry: Optional[CatalogEntry]) -> Dict[str, str]:
+    """
+    Builds If-None-Match / If-Modified-Since headers from the stored copy of a file.
+    Servers that support them answer 304 Not Modified when nothing changed.
+
+    Args:
+        entry (Optional[CatalogEntry]): The catalog entry of the stored copy.
+
+    Returns:
+        Dict[str, str]: The conditional request headers (empty if none apply).
+    """
+    headers: Dict[str, str] = {}
+    if entry is None or not entry.is_valid:
+        return headers
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+def fetch_source(response: httpx.Response) -> FetchSource:
+    """
+    Returns the body hash and validators of a response, to store with the file.
+    """
+    return FetchSource(
+        source_hash=hashlib.sha256(response.content).hexdigest(),
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+    )
+
+
+def is_unchanged(response: httpx.Response, entry: Optional[CatalogEntry]) -> bool:
+    """
+    Checks whether a response matches the stored copy, without decoding the body.
+
+    A 304 means the server confirmed nothing changed. A 200 is unchanged
+    when its body hash equals the hash of the response the file was built from.
+
+    Args:
+        response (httpx.Response): The fresh response.
+        entry (Optional[CatalogEntry]): The catalog entry of the stored copy.
+
+    Returns:
+        bool: True if writing the response would be a no-op.
+    """
+    if entry is None or not entry.is_valid:
+        return False
+    if response.status_code == 304:
+        return True
+    if response.status_code != 200 or entry.source_hash is None:
+        return False
+    return hashlib.sha256(response.content).hexdigest() == entry.source_hash
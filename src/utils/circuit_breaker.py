@@ -0,0 +1,113 @@
+import time
+from typing import NamedTuple
+
+from src.config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request to a host whose circuit breaker is open.
+    Not an httpx.RequestError, so the retry policy fails it fast instead of retrying.
+    """
+
+
+class BreakerState(NamedTuple):
+    state: str  # "closed", "open" or "half_open"
+    consecutive_failures: int  # Failures since the last success
+    trips: int  # Times the breaker opened this run
+    rejected: int  # Requests failed fast while the breaker was open
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one host.
+
+    After `failure_threshold` failures in a row (timeouts, connection errors,
+    5xx) the breaker opens and every request fails fast with CircuitOpenError.
+    After `reset_timeout` seconds one probe request is let through (half
+    open): a success closes the breaker, a failure opens it for another
+    `reset_timeout`. 429s are left to the rate limiter, the host is up.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._failures = 0
+        self._opened_at = None  # monotonic time the breaker opened, None while closed
+        self._probe_started = None  # monotonic time of the half open probe
+        self._trips = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self, host: str = "") -> None:
+        """
+        Lets a request through or fails it fast.
+
+        Args:
+            host (str): The host, for the error message.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half open with a probe
+                already in flight.
+        """
+        state = self.state
+        if state == "closed":
+            return
+        now = time.monotonic()
+        # one probe at a time; a probe that never reported back is replaced
+        if state == "half_open" and (
+            self._probe_started is None
+            or now - self._probe_started >= self.reset_timeout
+        ):
+            self._probe_started = now
+            return
+        self._rejected += 1
+        raise CircuitOpenError(f"circuit breaker open for {host or 'host'}")
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is None:
+            if self._failures >= self.failure_threshold:
+                self._open()
+        elif self._probe_started is not None:
+            # the half open probe failed, wait another reset_timeout
+            self._open()
+
+    def _open(self) -> None:
+        self._trips += 1
+        self._opened_at = time.monotonic()
+        self._probe_started = None
+
+    def record_response(self, status_code: int) -> None:
+        """
+        Feeds back the status code of a response, 5xx counts as a failure.
+        """
+        if status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def snapshot(self) -> BreakerState:
+        return BreakerState(
+            state=self.state,
+            consecutive_failures=self._failures,
+            trips=self._trips,
+            rejected=self._rejected,
+        )
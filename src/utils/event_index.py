@@ -0,0 +1,358 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import msgspec
+import polars as pl
+
+from src.config import EVENT_INDEX_FILENAME, RAW_EVENTS_DIR
+from src.utils.helper_logic import (
+    EventStatus,
+    classify_events,
+    date_status_expr,
+    get_date_status,
+)
+from src.utils.raw_storage import (
+    RAW_DECODE_ERRORS,
+    decode_raw_bytes,
+    iter_raw_files,
+    resolve_raw_path,
+)
+from src.utils.wtt_models import EventRow, EventsPage, decode_event_rows
+
+# Bump when EventRecord / the snapshot layout changes - old snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+
+
+class EventRecord(NamedTuple):
+    event_id: Optional[int]  # EventId, None if missing in the payload
+    name: Optional[str]  # EventName
+    year: int  # Year of the events_<year>.json file
+    start: Optional[datetime]  # Parsed StartDateTime
+    end: Optional[datetime]  # Parsed EndDateTime
+    is_senior: bool  # is_senior_event(name)
+
+    def status(self, current_date: Optional[datetime] = None) -> Optional[EventStatus]:
+        """
+        Returns "future", "ongoing" or "completed", computed at call time.
+        """
+        return get_date_status(self.start, self.end, current_date)
+
+
+class YearEntry(NamedTuple):
+    stored_name: str  # Name of the stored file, e.g. "events_2024.json.zst"
+    size: int
+    mtime_ns: int
+    content_hash: str  # sha256 of the stored bytes
+    events: List[EventRecord]  # Every row of the file, in payload order
+
+
+def build_event_records(data, year: int) -> List[EventRecord]:
+    """
+    Converts an events payload into compact event records.
+    A payload that is not the usual [{"rows": [...]}] structure gives no records.
+
+    Args:
+        data (Any): The decoded events_<year>.json payload.
+        year (int): The year of the file.
+
+    Returns:
+        List[EventRecord]: One record per row.
+    """
+    if not isinstance(data, list) or not data or not isinstance(data[0], dict):
+        return []
+    try:
+        page = msgspec.convert(data[0], EventsPage, strict=False)
+    except msgspec.ValidationError:
+        return []
+    return build_event_records_from_rows(page.rows, year)
+
+
+def build_event_records_from_rows(rows: List[EventRow], year: int) -> List[EventRecord]:
+    """
+    Converts decoded event rows into compact event records.
+    Dates and senior flags come from one classify_events pass over the rows.
+
+    Args:
+        rows (List[EventRow]): The rows of an events_<year>.json payload.
+        year (int): The year of the file.
+
+    Returns:
+        List[EventRecord]: One record per row.
+    """
+    classified = classify_events(rows)
+    return [
+        EventRecord(
+            event_id=row.EventId,
+            name=row.EventName,
+            year=year,
+            start=start,
+            end=end,
+            is_senior=is_senior,
+        )
+        for row, start, end, is_senior in zip(
+            rows,
+            classified["start"].to_list(),
+            classified["end"].to_list(),
+            classified["is_senior"].to_list(),
+        )
+    ]
+
+
+def dedupe_events(
+    events: Iterable[EventRecord],
+) -> Tuple[List[EventRecord], int]:
+    """
+    Collapses events that appear in more than one year file into one record.
+
+    The year route matches on StartDateTime OR FromStartDate, so an event that
+    spans a year boundary is listed in both years. The canonical record is the
+    one from the file of its start year, or the earliest year file if the start
+    year has no copy. Records without an EventId are kept as they are.
+
+    Args:
+        events (Iterable[EventRecord]): Event records, e.g. EventIndex.events().
+
+    Returns:
+        Tuple[List[EventRecord], int]: The canonical records in their original order,
+            and the number of duplicate records that were dropped.
+    """
+    events = list(events)
+    canonical: Dict[int, EventRecord] = {}
+    for event in events:
+        if not event.event_id:
+            continue
+        current = canonical.get(event.event_id)
+        if current is None or _canonical_rank(event) < _canonical_rank(current):
+            canonical[event.event_id] = event
+
+    unique = [
+        event
+        for event in events
+        if not event.event_id or canonical[event.event_id] is event
+    ]
+    return unique, len(events) - len(unique)
+
+
+def _canonical_rank(event: EventRecord) -> Tuple[bool, int]:
+    # the start year copy first, then the earliest year
+    in_start_year = event.start is not None and event.start.year == event.year
+    return (not in_start_year, event.year)
+
+
+class EventIndex:
+    """
+    In-memory index of every events_<year>.json file in an events directory.
+
+    Each year file is parsed once into EventRecords. The index is persisted as a
+    pickle snapshot next to the files, keyed by each file's size / mtime and
+    content hash, so later runs only re-parse files that actually changed.
+    Use get_event_index() to share one instance per directory within a process.
+    """
+
+    def __init__(
+        self, events_dir: Path = RAW_EVENTS_DIR, snapshot_path: Optional[Path] = None
+    ):
+        self.events_dir = Path(events_dir)
+        self.snapshot_path = (
+            Path(snapshot_path)
+            if snapshot_path is not None
+            else self.events_dir / EVENT_INDEX_FILENAME
+        )
+        self._years: Dict[int, YearEntry] = {}
+        self._loaded = False
+        self.parsed = 0  # Year files parsed (not served from the snapshot)
+
+    def _load_snapshot(self) -> Dict[int, YearEntry]:
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                return {}
+            return snapshot["years"]
+        except Exception:
+            # missing, truncated or from an older layout - rebuild from the files
+            return {}
+
+    def _save_snapshot(self) -> None:
+        payload = pickle.dumps(
+            {"version": SNAPSHOT_VERSION, "years": self._years},
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.snapshot_path.parent,
+                prefix=f".{self.snapshot_path.name}.",
+                suffix=".tmp",
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_name, self.snapshot_path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            # the snapshot is only a cache, the index still works without it
+            print(f"⚠️ Could not save event index snapshot: {e}")
+
+    def refresh(self) -> "EventIndex":
+        """
+        Brings the index up to date with the events directory.
+
+        Files whose size and mtime match the previous entry are not read at all.
+        Files that were touched but hash the same keep their records, only
+        changed or new files are parsed. Removed files are dropped.
+
+        Returns:
+            EventIndex: self, for chaining.
+        """
+        previous = self._years if self._loaded else self._load_snapshot()
+        years: Dict[int, YearEntry] = {}
+        dirty = not self._loaded and not previous
+
+        for event_file in iter_raw_files(self.events_dir, "events_*.json"):
+            try:
+                year = int(event_file.stem.split("_")[1])
+            except (IndexError, ValueError):
+                continue
+
+            stored_file = resolve_raw_path(self.events_dir, event_file.name)
+            if stored_file is None:
+                continue
+            stat = stored_file.stat()
+            old = previous.get(year)
+
+            if (
+                old is not None
+                and old.stored_name == stored_file.name
+                and old.size == stat.st_size
+                and old.mtime_ns == stat.st_mtime_ns
+            ):
+                years[year] = old
+                continue
+
+            content = stored_file.read_bytes()
+            content_hash = hashlib.sha256(content).hexdigest()
+            if old is not None and old.content_hash == content_hash:
+                events = old.events
+            else:
+                # decoded straight from the bytes already read for the hash
+                try:
+                    rows = decode_event_rows(decode_raw_bytes(content))
+                except RAW_DECODE_ERRORS:
+                    rows = []
+                events = build_event_records_from_rows(rows, year)
+                self.parsed += 1
+
+            years[year] = YearEntry(
+                stored_name=stored_file.name,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                content_hash=content_hash,
+                events=events,
+            )
+            dirty = True
+
+        if years.keys() != previous.keys():
+            dirty = True
+
+        self._years = years
+        self._loaded = True
+        if dirty:
+            self._save_snapshot()
+        return self
+
+    def years(self) -> List[int]:
+        """
+        Returns the years that have an events file, sorted.
+        """
+        return sorted(self._years)
+
+    def events(self, year: Optional[int] = None) -> List[EventRecord]:
+        """
+        Returns the event records of one year, or of every year if year is None.
+        """
+        if year is not None:
+            entry = self._years.get(year)
+            return list(entry.events) if entry is not None else []
+        return [event for y in self.years() for event in self._years[y].events]
+
+    def frame(
+        self,
+        year: Optional[int] = None,
+        current_date: Optional[datetime] = None,
+        dedupe: bool = False,
+    ) -> pl.DataFrame:
+        """
+        Returns the event records as a DataFrame with a status column, computed
+        in one vectorized pass against a single reference date.
+
+        Args:
+            year (Optional[int]): Only this year's events, all years if None.
+            current_date (Optional[datetime]): The date to compare against, defaults to now.
+            dedupe (bool): Keep one row per EventId, its canonical year (see dedupe_events).
+
+        Returns:
+            pl.DataFrame: event_id, name, year, start, end, is_senior and status columns.
+        """
+        events = self.events(year)
+        if dedupe:
+            events, _ = dedupe_events(events)
+        frame = pl.DataFrame(
+            {
+                "event_id": [event.event_id for event in events],
+                "name": [event.name for event in events],
+                "year": [event.year for event in events],
+                "start": [event.start for event in events],
+                "end": [event.end for event in events],
+                "is_senior": [event.is_senior for event in events],
+            },
+            schema={
+                "event_id": pl.Int64,
+                "name": pl.String,
+                "year": pl.Int32,
+                "start": pl.Datetime("us"),
+                "end": pl.Datetime("us"),
+                "is_senior": pl.Boolean,
+            },
+            strict=False,
+        )
+        return frame.with_columns(
+            date_status_expr(
+                pl.col("start"), pl.col("end"), current_date or datetime.now()
+            ).alias("status")
+        )
+
+    def row_count(self, year: int) -> int:
+        """
+        Returns the number of rows in the events file of a year (0 if missing).
+        """
+        entry = self._years.get(year)
+        return len(entry.events) if entry is not None else 0
+
+
+_indexes: Dict[Path, EventIndex] = {}
+
+
+def get_event_index(events_dir: Path = RAW_EVENTS_DIR) -> EventIndex:
+    """
+    Returns the shared EventIndex for an events directory, refreshed against the files.
+    The first call in a process loads the snapshot, later calls only stat the files.
+
+    Args:
+        events_dir (Path): The directory containing the events_<year>.json files.
+
+    Returns:
+        EventIndex: The up to date index.
+    """
+    key = Path(events_dir).resolve()
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = EventIndex(events_dir)
+    return index.refresh()
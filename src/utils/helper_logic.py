@@ -1,9 +1,10 @@
 from pathlib import Path
-import json
 from datetime import datetime, timedelta
-from typing import Literal, Optional
-import re
-from src.config import EXCLUDED_EVENT_TERMS, AGE_LIMIT_REGEX
+from typing import Dict, List, Literal, Optional, Sequence, Union
+import polars as pl
+from src.config import EXCLUDED_EVENT_PATTERN, EXCLUDED_EVENT_REGEX
+from src.utils.io_handler import count_raw_rows
+from src.utils.wtt_models import EventRow
 
 
 def get_event_count_from_file(folder: Path, filename: str) -> int:
@@ -20,24 +21,58 @@ def get_event_count_from_file(folder: Path, filename: str) -> int:
     Returns:
         int: The number of events found in the file.
     """
-    filepath = folder / filename
-    if not filepath.exists():
-        return 0
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            # WTT api response structure is nested: list[0] -> 'rows' list
-            if isinstance(data, list) and len(data) > 0:
-                # Get the number of events from the 'rows' list
-                return len(data[0].get("rows", []))
-    except Exception:
-        # If an exception occurs, return 0
-        return 0
-    return 0
+    # WTT api response structure is nested: list[0] -> 'rows' list
+    return count_raw_rows(folder, filename)
 
 
 EventStatus = Literal["future", "ongoing", "completed"]
 
+# Date format of StartDateTime / EndDateTime in the WTT events payload
+EVENT_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def parse_event_date(date_str: Optional[str]) -> Optional[datetime]:
+    """
+    Parses a StartDateTime / EndDateTime value, returns None if missing or malformed.
+    """
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(date_str, EVENT_DATE_FORMAT)
+    except (ValueError, TypeError):
+        return None
+
+
+def get_date_status(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    current_date: Optional[datetime] = None,
+) -> Optional[EventStatus]:
+    """
+    Returns the date status of an event from its parsed start and end dates.
+
+    Args:
+        start_date (Optional[datetime]): The event start date.
+        end_date (Optional[datetime]): The event end date.
+        current_date (Optional[datetime]): The date to compare against, defaults to now.
+
+    Returns:
+        Optional[EventStatus]: "future", "ongoing" or "completed", None if a date is missing.
+    """
+    if start_date is None or end_date is None:
+        return None
+
+    current_date = current_date or datetime.now()
+    ongoing_cut_off_date = current_date + timedelta(days=1)
+
+    # keep in sync with date_status_expr
+    if start_date > ongoing_cut_off_date:
+        return "future"
+    elif end_date < current_date:
+        return "completed"
+    else:
+        return "ongoing"
+
 
 def get_event_date_status(event_json: dict) -> Optional[EventStatus]:
     """
@@ -53,39 +88,20 @@ def get_event_date_status(event_json: dict) -> Optional[EventStatus]:
     Returns:
         str: A string representing the status of the event.
     """
-
-    current_date = datetime.now()
-    ongoing_cut_off_date = current_date + timedelta(days=1)
-
-    try:
-        start_date_str = event_json.get("StartDateTime")
-        end_date_str = event_json.get("EndDateTime")
-
-        if start_date_str and end_date_str:
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%dT%H:%M:%S")
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%dT%H:%M:%S")
-            current_date = datetime.now()
-
-            if start_date > ongoing_cut_off_date:
-                return "future"
-            elif end_date < current_date:
-                return "completed"
-            else:
-                return "ongoing"
-        else:
-            return None
-    except (ValueError, TypeError):
-        return None
+    return get_date_status(
+        parse_event_date(event_json.get("StartDateTime")),
+        parse_event_date(event_json.get("EndDateTime")),
+    )
 
 
 def is_senior_event(event_name: str) -> bool:
     """
     Checks if an event name is a senior event.
 
-    The function takes an event name, converts it to lowercase, and checks
-    if any of the excluded event terms are present. If not, it checks if the
-    event name matches the age limit regex. If it does not match, the
-    function returns True, indicating that the event is a senior event.
+    The function checks the event name against one compiled pattern of the
+    excluded event terms and the age limit regex (case insensitive). If it
+    does not match, the function returns True, indicating that the event is
+    a senior event.
 
     Args:
         event_name (str): The name of the event to check.
@@ -96,10 +112,100 @@ def is_senior_event(event_name: str) -> bool:
     if not event_name:
         return False
 
-    name_lower = event_name.lower()
-    if any(term in name_lower for term in EXCLUDED_EVENT_TERMS):
-        return False
-    # regex match for age limit gives True that is not a senior event
-    # return not the bool to get the opposite result
-    return not bool(re.search(AGE_LIMIT_REGEX, name_lower))
-    # Total filtered out (Youth/Junior)
+    # a match (excluded term or age limit) means it is not a senior event
+    return EXCLUDED_EVENT_REGEX.search(event_name) is None
+
+
+def date_status_expr(start: pl.Expr, end: pl.Expr, current_date: datetime) -> pl.Expr:
+    """
+    Polars expression of get_date_status over start / end datetime columns.
+    """
+    ongoing_cut_off_date = current_date + timedelta(days=1)
+    return (
+        pl.when(start.is_null() | end.is_null())
+        .then(pl.lit(None, dtype=pl.String))
+        .when(start > ongoing_cut_off_date)
+        .then(pl.lit("future"))
+        .when(end < current_date)
+        .then(pl.lit("completed"))
+        .otherwise(pl.lit("ongoing"))
+    )
+
+
+def get_date_statuses(
+    start_dates: Sequence[Optional[datetime]],
+    end_dates: Sequence[Optional[datetime]],
+    current_date: Optional[datetime] = None,
+) -> List[Optional[EventStatus]]:
+    """
+    Vectorized get_date_status over many events, against one reference date.
+
+    Args:
+        start_dates (Sequence[Optional[datetime]]): The event start dates.
+        end_dates (Sequence[Optional[datetime]]): The event end dates, same length.
+        current_date (Optional[datetime]): The date to compare against, defaults to now.
+
+    Returns:
+        List[Optional[EventStatus]]: One status per event, None if a date is missing.
+    """
+    current_date = current_date or datetime.now()
+    frame = pl.DataFrame(
+        {"start": list(start_dates), "end": list(end_dates)},
+        schema={"start": pl.Datetime("us"), "end": pl.Datetime("us")},
+    )
+    return (
+        frame.select(date_status_expr(pl.col("start"), pl.col("end"), current_date))
+        .to_series()
+        .to_list()
+    )
+
+
+def classify_events(
+    rows: Sequence[Union[Dict, EventRow]], current_date: Optional[datetime] = None
+) -> pl.DataFrame:
+    """
+    Classifies a whole calendar of WTT event rows in one vectorized pass.
+
+    Dates are parsed with EVENT_DATE_FORMAT, the senior flag uses the same
+    exclusion pattern as is_senior_event and every status is computed against
+    one reference date, so results agree with the row by row functions.
+
+    Args:
+        rows (Sequence[Union[Dict, EventRow]]): Event rows, e.g. the "rows" of an
+            events_<year>.json payload, as dicts or decoded EventRow structs.
+        current_date (Optional[datetime]): The date to compare against, defaults to now.
+
+    Returns:
+        pl.DataFrame: One row per event with name, start, end, is_senior and status.
+    """
+    current_date = current_date or datetime.now()
+    names, starts, ends = [], [], []
+    for row in rows:
+        if isinstance(row, dict):
+            names.append(row.get("EventName"))
+            starts.append(row.get("StartDateTime"))
+            ends.append(row.get("EndDateTime"))
+        else:
+            names.append(row.EventName)
+            starts.append(row.StartDateTime)
+            ends.append(row.EndDateTime)
+
+    frame = pl.DataFrame(
+        {"name": names, "start": starts, "end": ends},
+        schema={"name": pl.String, "start": pl.String, "end": pl.String},
+        strict=False,
+    ).with_columns(
+        pl.col("start").str.strptime(
+            pl.Datetime("us"), EVENT_DATE_FORMAT, strict=False
+        ),
+        pl.col("end").str.strptime(pl.Datetime("us"), EVENT_DATE_FORMAT, strict=False),
+        (
+            (pl.col("name").str.len_chars() > 0)
+            & ~pl.col("name").str.contains(f"(?i){EXCLUDED_EVENT_PATTERN}")
+        )
+        .fill_null(False)
+        .alias("is_senior"),
+    )
+    return frame.with_columns(
+        date_status_expr(pl.col("start"), pl.col("end"), current_date).alias("status")
+    )
@@ -1,26 +1,161 @@
+import hashlib
 import json
+import os
+import tempfile
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple, Optional
 
+from src.config import RAW_STORAGE_FORMAT
+from src.utils.raw_catalog import FetchSource, RawCatalog, count_rows
+from src.utils.raw_storage import (
+    RAW_DECODE_ERRORS,
+    RAW_FORMAT_SUFFIXES,
+    decode_raw_bytes,
+    encode_raw_json,
+    resolve_raw_path,
+    stored_path,
+)
+from src.utils.wtt_models import count_payload_rows
 
-def save_raw_json(data: Any, folder: Path, filename: str) -> bool:
+# Bump when the sidecar layout changes - older sidecars are ignored
+RAW_META_VERSION = 1
+
+
+class RawFileMeta(NamedTuple):
+    stored_name: str  # Name of the stored file the metadata describes
+    size: int
+    mtime_ns: int
+    content_hash: str  # sha256 of the stored bytes
+    row_count: int  # count_rows of the payload
+    fetched_at: float  # When the payload was saved
+    source_hash: Optional[str]  # sha256 of the HTTP response body, if known
+
+
+def raw_meta_path(folder: Path, filename: str) -> Path:
+    """
+    Returns the sidecar metadata path of a raw file, e.g. ".event_matches_1.meta".
+    Hidden and without ".json", so raw file globs never pick it up.
+    """
+    return folder / f".{Path(filename).stem}.meta"
+
+
+def _write_raw_meta(folder: Path, filename: str, meta: RawFileMeta) -> None:
+    meta_path = raw_meta_path(folder, filename)
+    payload = json.dumps({"version": RAW_META_VERSION, **meta._asdict()})
+    fd, tmp_name = tempfile.mkstemp(
+        dir=folder, prefix=f"{meta_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_name, meta_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_raw_meta(folder: Path, filename: str) -> Optional[RawFileMeta]:
+    """
+    Returns the sidecar metadata of a raw file, if it still describes the stored file.
+
+    The metadata is only trusted while the stored file has the same name, size
+    and mtime as when it was written; anything else (file edited, migrated by
+    another tool, sidecar missing or corrupt) returns None.
+
+    Args:
+        folder (Path): The folder of the raw file.
+        filename (str): The logical filename, e.g. "event_matches_1.json".
+
+    Returns:
+        Optional[RawFileMeta]: The metadata, or None if missing or stale.
+    """
+    try:
+        raw = json.loads(raw_meta_path(folder, filename).read_text(encoding="utf-8"))
+        if raw.pop("version", None) != RAW_META_VERSION:
+            return None
+        meta = RawFileMeta(**raw)
+        stat = (folder / meta.stored_name).stat()
+    except (OSError, ValueError, TypeError):
+        return None
+    if stat.st_size != meta.size or stat.st_mtime_ns != meta.mtime_ns:
+        return None
+    return meta
+
+
+def save_raw_json(
+    data: Any,
+    folder: Path,
+    filename: str,
+    catalog: Optional[RawCatalog] = None,
+    storage_format: Optional[str] = None,
+    source: Optional[FetchSource] = None,
+) -> bool:
     """
     Saves the given data as a raw JSON file in the given folder with the given filename.
+    The file is written to a temporary file and renamed into place, so a crash never
+    leaves a half-written JSON file behind. A sidecar with the row count, hash
+    and save time is written next to it (see read_raw_meta).
+
+    With a compressed storage format the file is written compact and gets the
+    format suffix (e.g. "events_2024.json.zst"), copies of the same file in
+    other formats are removed. Readers use the logical ".json" filename.
 
     Args:
         data (Any): The data to be saved as a raw JSON file.
         folder (Path): The folder in which to save the file.
-        filename (str): The filename to use for the saved file.
+        filename (str): The logical filename to use for the saved file.
+        catalog (Optional[RawCatalog]): If given, the file is recorded in the raw catalog.
+        storage_format (Optional[str]): "json", "json.gz" or "json.zst",
+            defaults to RAW_STORAGE_FORMAT from src/config.py.
+        source (Optional[FetchSource]): The HTTP response the data came from,
+            recorded in the catalog for skip-unchanged / conditional fetches.
 
     Returns:
         bool: True if the file was saved successfully, False otherwise.
     """
+    storage_format = storage_format or RAW_STORAGE_FORMAT
     try:
         folder.mkdir(parents=True, exist_ok=True)
 
-        filepath = folder / filename
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        filepath = stored_path(folder, filename, storage_format)
+        content = encode_raw_json(data, storage_format)
+
+        fd, tmp_name = tempfile.mkstemp(
+            dir=folder, prefix=f".{filename}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_name, filepath)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        # only keep one stored copy per logical file
+        for other_format in RAW_FORMAT_SUFFIXES:
+            if other_format != storage_format:
+                stored_path(folder, filename, other_format).unlink(missing_ok=True)
+
+        stat = filepath.stat()
+        _write_raw_meta(
+            folder,
+            filename,
+            RawFileMeta(
+                stored_name=filepath.name,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                content_hash=hashlib.sha256(content).hexdigest(),
+                row_count=count_rows(data),
+                fetched_at=time.time(),
+                source_hash=source.source_hash if source is not None else None,
+            ),
+        )
+
+        if catalog is not None:
+            catalog.record(
+                folder / filename, content, data, stored_file=filepath, source=source
+            )
 
         return True
 
@@ -29,29 +164,76 @@ def save_raw_json(data: Any, folder: Path, filename: str) -> bool:
         return False
 
 
-def json_exists(folder: Path, filename: str) -> bool:
+def json_exists(
+    folder: Path, filename: str, catalog: Optional[RawCatalog] = None
+) -> bool:
     """
     Check if a file exists in a folder and is not empty and is a valid JSON file.
 
     Args:
         folder (Path): The folder to check in.
         filename (str): The filename to check for.
+        catalog (Optional[RawCatalog]): If given, answer from the raw catalog
+            instead of parsing the file.
 
     Returns:
         bool: True if the file exists and is not empty, False otherwise.
     """
-    filepath = folder / filename
+    if catalog is not None:
+        return catalog.is_valid_json(folder, filename)
+    # written from a decoded payload and unchanged since - valid without parsing
+    if read_raw_meta(folder, filename) is not None:
+        return True
+
+    filepath = resolve_raw_path(folder, filename)
     # Check if the file exists and is not empty
-    if not filepath.exists() or filepath.stat().st_size == 0:
+    if filepath is None or filepath.stat().st_size == 0:
         return False
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            json.load(f)
+        json.loads(decode_raw_bytes(filepath.read_bytes()))
         return True
-    except (json.JSONDecodeError, IOError):
+    except RAW_DECODE_ERRORS:
         return False
 
 
+def load_raw_bytes(folder: Path, filename: str) -> bytes:
+    """
+    Returns the JSON bytes of a raw file saved by save_raw_json in any storage format,
+    e.g. to decode them straight into the typed models of src/utils/wtt_models.py.
+
+    Args:
+        folder (Path): The folder to read the file from.
+        filename (str): The logical filename, e.g. "events_2024.json".
+
+    Returns:
+        bytes: The (decompressed) JSON bytes.
+
+    Raises:
+        FileNotFoundError: If no stored copy of the file exists.
+    """
+    filepath = resolve_raw_path(folder, filename)
+    if filepath is None:
+        raise FileNotFoundError(folder / filename)
+    return decode_raw_bytes(filepath.read_bytes())
+
+
+def load_raw_json(folder: Path, filename: str) -> Any:
+    """
+    Loads a raw JSON file saved by save_raw_json in any storage format.
+
+    Args:
+        folder (Path): The folder to read the file from.
+        filename (str): The logical filename, e.g. "events_2024.json".
+
+    Returns:
+        Any: The decoded payload.
+
+    Raises:
+        FileNotFoundError: If no stored copy of the file exists.
+    """
+    return json.loads(load_raw_bytes(folder, filename))
+
+
 def get_event_count_from_file(folder: Path, filename: str) -> int:
     """
     Reads a raw JSON EVENTS file and returns the number of events (rows) found.
@@ -66,17 +248,29 @@ def get_event_count_from_file(folder: Path, filename: str) -> int:
     Returns:
         int: The number of events found in the file.
     """
-    filepath = folder / filename
-    if not filepath.exists():
-        return 0
+    # WTT api response structure is nested: list[0] -> 'rows' list
+    return count_raw_rows(folder, filename)
+
+
+def count_raw_rows(folder: Path, filename: str) -> int:
+    """
+    Returns the number of rows of a raw file (see raw_catalog.count_rows).
+
+    The count comes from the sidecar metadata when it is current, otherwise
+    the stored bytes are scanned for row boundaries without decoding the rows.
+    A missing, corrupt or unexpected file counts as 0.
+
+    Args:
+        folder (Path): The folder of the raw file.
+        filename (str): The logical filename, e.g. "event_matches_1.json".
+
+    Returns:
+        int: The number of rows.
+    """
+    meta = read_raw_meta(folder, filename)
+    if meta is not None:
+        return meta.row_count
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            # WTT api response structure is nested: list[0] -> 'rows' list
-            if isinstance(data, list) and len(data) > 0:
-                # Get the number of events from the 'rows' list
-                return len(data[0].get("rows", []))
-    except Exception:
-        # If an exception occurs, return 0
+        return count_payload_rows(load_raw_bytes(folder, filename))
+    except RAW_DECODE_ERRORS:
         return 0
-    return 0
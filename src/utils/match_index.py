@@ -0,0 +1,261 @@
+import hashlib
+import multiprocessing
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import polars as pl
+
+from src.config import MATCH_INDEX_FILENAME, RAW_EVENT_MATCHES_DIR, REPORT_WORKERS
+from src.utils.io_handler import read_raw_meta
+from src.utils.raw_storage import (
+    RAW_DECODE_ERRORS,
+    decode_raw_bytes,
+    scan_stored_files,
+)
+from src.utils.wtt_models import count_payload_rows
+
+# Bump when MatchFileEntry / the snapshot layout changes - old snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+
+# Fewer changed files than this are scanned in-process, a pool costs more to start
+POOL_MIN_FILES = 256
+
+
+class MatchFileEntry(NamedTuple):
+    stored_name: str  # Name of the stored file, e.g. "event_matches_123.json.zst"
+    size: int
+    mtime_ns: int
+    content_hash: str  # sha256 of the stored bytes
+    year: int  # Year directory of the file
+    event_id: Optional[int]  # From the filename, None if it is not a number
+    matches: int  # Match rows in the payload
+
+
+def _event_id_of(filename: str) -> Optional[int]:
+    # "2024/event_matches_123.json" -> 123
+    try:
+        return int(Path(filename).stem.rsplit("_", 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def scan_match_file(stored_file: Path) -> Tuple[str, int]:
+    """
+    Hashes a stored event matches file and counts its match rows.
+    Module level so it can run in a worker process.
+
+    Args:
+        stored_file (Path): The stored file, in any storage format.
+
+    Returns:
+        Tuple[str, int]: The sha256 of the stored bytes and the number of rows,
+            0 rows if the file cannot be decoded.
+    """
+    content = stored_file.read_bytes()
+    try:
+        matches = count_payload_rows(decode_raw_bytes(content))
+    except RAW_DECODE_ERRORS:
+        matches = 0
+    return hashlib.sha256(content).hexdigest(), matches
+
+
+class MatchIndex:
+    """
+    Per-file aggregates of every <year>/event_matches_<id>.json file.
+
+    Like EventIndex, the aggregates are persisted as a pickle snapshot next to
+    the files, keyed by each file's size / mtime and content hash. A refresh
+    only stats the tree; new or changed files are answered from their
+    save_raw_json sidecar when it is current, otherwise they are scanned, in
+    a process pool when there are many of them.
+    """
+
+    def __init__(
+        self,
+        event_matches_dir: Path = RAW_EVENT_MATCHES_DIR,
+        snapshot_path: Optional[Path] = None,
+    ):
+        self.event_matches_dir = Path(event_matches_dir)
+        self.snapshot_path = (
+            Path(snapshot_path)
+            if snapshot_path is not None
+            else self.event_matches_dir / MATCH_INDEX_FILENAME
+        )
+        self._files: Dict[str, MatchFileEntry] = {}
+        self._loaded = False
+        self.scanned = 0  # Files read (not served from the snapshot or a sidecar)
+
+    def _load_snapshot(self) -> Dict[str, MatchFileEntry]:
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                return {}
+            return snapshot["files"]
+        except Exception:
+            # missing, truncated or from an older layout - rebuild from the files
+            return {}
+
+    def _save_snapshot(self) -> None:
+        payload = pickle.dumps(
+            {"version": SNAPSHOT_VERSION, "files": self._files},
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.snapshot_path.parent,
+                prefix=f".{self.snapshot_path.name}.",
+                suffix=".tmp",
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_name, self.snapshot_path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            # the snapshot is only a cache, the index still works without it
+            print(f"⚠️ Could not save match index snapshot: {e}")
+
+    def refresh(self, workers: int = REPORT_WORKERS) -> "MatchIndex":
+        """
+        Brings the index up to date with the event matches directory.
+
+        Args:
+            workers (int): Processes used to scan changed files, 1 scans in-process.
+
+        Returns:
+            MatchIndex: self, for chaining.
+        """
+        previous = self._files if self._loaded else self._load_snapshot()
+        files: Dict[str, MatchFileEntry] = {}
+        to_scan: List[Tuple[str, Path, int, os.stat_result]] = []
+
+        year_dirs = []
+        if self.event_matches_dir.exists():
+            year_dirs = sorted(
+                path
+                for path in self.event_matches_dir.iterdir()
+                if path.is_dir() and path.name.isdigit()
+            )
+        for year_dir in year_dirs:
+            year = int(year_dir.name)
+            # one directory read per year instead of a glob / stat per format
+            for name, entry in sorted(
+                scan_stored_files(year_dir, "event_matches_*.json").items()
+            ):
+                source_file = f"{year}/{name}"
+                stat = entry.stat()
+                old = previous.get(source_file)
+
+                if (
+                    old is not None
+                    and old.stored_name == entry.name
+                    and old.size == stat.st_size
+                    and old.mtime_ns == stat.st_mtime_ns
+                ):
+                    files[source_file] = old
+                    continue
+
+                meta = read_raw_meta(year_dir, name)
+                if meta is not None:
+                    files[source_file] = MatchFileEntry(
+                        stored_name=meta.stored_name,
+                        size=meta.size,
+                        mtime_ns=meta.mtime_ns,
+                        content_hash=meta.content_hash,
+                        year=year,
+                        event_id=_event_id_of(source_file),
+                        matches=meta.row_count,
+                    )
+                    continue
+                to_scan.append((source_file, year_dir / entry.name, year, stat))
+
+        paths = [stored_file for _, stored_file, _, _ in to_scan]
+        if workers > 1 and len(paths) >= POOL_MIN_FILES:
+            # spawn, not fork: polars has threads running in this process
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                results = list(
+                    pool.map(
+                        scan_match_file,
+                        paths,
+                        chunksize=max(1, len(paths) // (workers * 4)),
+                    )
+                )
+        else:
+            results = [scan_match_file(path) for path in paths]
+
+        for (source_file, stored_file, year, stat), (content_hash, matches) in zip(
+            to_scan, results
+        ):
+            files[source_file] = MatchFileEntry(
+                stored_name=stored_file.name,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                content_hash=content_hash,
+                year=year,
+                event_id=_event_id_of(source_file),
+                matches=matches,
+            )
+        self.scanned += len(to_scan)
+
+        dirty = files != previous or (not self._loaded and not previous)
+        self._files = files
+        self._loaded = True
+        if dirty:
+            self._save_snapshot()
+        return self
+
+    def frame(self) -> pl.DataFrame:
+        """
+        Returns one row per event matches file.
+
+        Returns:
+            pl.DataFrame: source_file, year, event_id and matches columns.
+        """
+        entries = list(self._files.items())
+        return pl.DataFrame(
+            {
+                "source_file": [source_file for source_file, _ in entries],
+                "year": [entry.year for _, entry in entries],
+                "event_id": [entry.event_id for _, entry in entries],
+                "matches": [entry.matches for _, entry in entries],
+            },
+            schema={
+                "source_file": pl.String,
+                "year": pl.Int32,
+                "event_id": pl.Int64,
+                "matches": pl.Int64,
+            },
+        )
+
+
+_indexes: Dict[Path, MatchIndex] = {}
+
+
+def get_match_index(
+    event_matches_dir: Path = RAW_EVENT_MATCHES_DIR, workers: int = REPORT_WORKERS
+) -> MatchIndex:
+    """
+    Returns the shared MatchIndex for an event matches directory, refreshed against the files.
+
+    Args:
+        event_matches_dir (Path): The directory with <year>/event_matches_<id>.json files.
+        workers (int): Processes used to scan changed files.
+
+    Returns:
+        MatchIndex: The up to date index.
+    """
+    key = Path(event_matches_dir).resolve()
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = MatchIndex(event_matches_dir)
+    return index.refresh(workers)
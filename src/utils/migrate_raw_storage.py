@@ -0,0 +1,100 @@
+import argparse
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from src.config import RAW_DIR, RAW_STORAGE_FORMAT
+from src.utils.io_handler import load_raw_json, save_raw_json
+from src.utils.raw_catalog import RawCatalog
+from src.utils.raw_storage import (
+    RAW_DECODE_ERRORS,
+    RAW_FORMAT_SUFFIXES,
+    logical_name,
+    stored_path,
+)
+
+
+class MigrationResult(NamedTuple):
+    converted: int  # Files rewritten in the target format
+    skipped: int  # Files already in the target format
+    failed: int  # Files that could not be read
+
+
+def migrate_raw_tree(
+    root: Path, storage_format: str, catalog: Optional[RawCatalog] = None
+) -> MigrationResult:
+    """
+    Rewrites every raw JSON file under root in the given storage format.
+
+    Each file is read with the format-detecting reader and saved again with
+    save_raw_json, which writes atomically and removes the old copy, so the
+    migration can be interrupted and re-run safely.
+
+    Args:
+        root (Path): The raw data directory to migrate.
+        storage_format (str): "json", "json.gz" or "json.zst".
+        catalog (Optional[RawCatalog]): If given, migrated files are re-recorded.
+
+    Returns:
+        MigrationResult: Counts of converted, skipped and failed files.
+    """
+    if storage_format not in RAW_FORMAT_SUFFIXES:
+        raise ValueError(f"Unknown raw storage format: {storage_format}")
+
+    converted = skipped = failed = 0
+    target_suffix = RAW_FORMAT_SUFFIXES[storage_format]
+
+    stored_files = sorted(
+        path
+        for path in root.rglob("*.json*")
+        if path.is_file() and not path.name.startswith(".")
+    )
+    for path in stored_files:
+        if not path.exists():
+            continue
+        name = logical_name(path)
+        if not name.endswith(".json"):
+            continue
+        if path.name == f"{name}{target_suffix}":
+            skipped += 1
+            continue
+        # a newer copy in the target format already exists, drop the stale one
+        if stored_path(path.parent, name, storage_format).exists():
+            path.unlink()
+            skipped += 1
+            continue
+
+        try:
+            data = load_raw_json(path.parent, name)
+        except RAW_DECODE_ERRORS as e:
+            print(f"❌ Could not read {path}: {e}")
+            failed += 1
+            continue
+
+        if save_raw_json(data, path.parent, name, catalog, storage_format):
+            converted += 1
+        else:
+            failed += 1
+
+    return MigrationResult(converted=converted, skipped=skipped, failed=failed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert the raw data tree to another storage format."
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(RAW_FORMAT_SUFFIXES),
+        default=RAW_STORAGE_FORMAT,
+        help="Target storage format (defaults to RAW_STORAGE_FORMAT in src/config.py)",
+    )
+    parser.add_argument("--root", type=Path, default=RAW_DIR)
+    args = parser.parse_args()
+
+    with RawCatalog() as catalog:
+        result = migrate_raw_tree(args.root, args.format, catalog)
+
+    print(
+        f"✅ Migrated {args.root} to {args.format}: {result.converted} converted, "
+        f"{result.skipped} already done, {result.failed} failed"
+    )
@@ -0,0 +1,234 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.config import PLAYER_INDEX_PATH
+from src.utils.io_handler import load_raw_bytes
+from src.utils.raw_storage import RAW_DECODE_ERRORS, scan_stored_files
+from src.utils.wtt_models import MatchRecord, decode_match_records
+
+# Bump when the table layout changes - the index is rebuilt (players are re-fetched)
+SCHEMA_VERSION = 1
+
+
+class HarvestSummary(NamedTuple):
+    files: int  # Event matches files in the tree
+    parsed: int  # New or changed files read for player ids
+    new_players: int  # Players not seen before
+
+
+class PlayerIndexStats(NamedTuple):
+    players: int  # Distinct players seen in the event matches
+    fetched: int  # Players whose details were fetched at least once
+    due: int  # Players never fetched or older than the freshness window
+
+
+def extract_players(
+    records: List[MatchRecord],
+) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """
+    Returns the distinct players of an event matches payload.
+
+    Same rule as flatten_event_matches: a competitor with a players list
+    (doubles, teams) contributes its players, a competitor without one is a
+    singles player identified by its competitorId.
+
+    Args:
+        records (List[MatchRecord]): The payload, decoded with decode_match_records.
+
+    Returns:
+        Dict[str, Tuple[Optional[str], Optional[str]]]: Player id -> (name, org).
+    """
+    players: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    for record in records:
+        card = record.card
+        for competitor in card.competitiors or card.competitors or []:
+            if competitor.players:
+                for player in competitor.players:
+                    if player.playerId not in (None, ""):
+                        players[str(player.playerId)] = (
+                            player.playerName,
+                            player.playerOrgCode or player.playerOrg,
+                        )
+            elif competitor.competitorId not in (None, ""):
+                players[str(competitor.competitorId)] = (
+                    competitor.competitorName,
+                    competitor.competitorOrg,
+                )
+    return players
+
+
+class PlayerIndex:
+    """
+    SQLite backed seen-set of every player in the event matches, with the
+    time each player's details were last fetched.
+
+    harvest() only reads event matches files that are new or changed since
+    they were last harvested, so the player list grows with new matches
+    without re-reading the whole tree. due() returns the players to fetch:
+    never fetched, or fetched longer ago than the freshness window.
+    """
+
+    def __init__(self, db_path: Path = PLAYER_INDEX_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS players")
+            self._conn.execute("DROP TABLE IF EXISTS sources")
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS players (
+                player_id TEXT PRIMARY KEY,
+                player_name TEXT,
+                player_org TEXT,
+                first_seen REAL NOT NULL,
+                last_fetched REAL
+            )
+            """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                source_file TEXT PRIMARY KEY,
+                stored_name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS players_last_fetched ON players (last_fetched)"
+        )
+
+    def harvest(self, event_matches_dir: Path) -> HarvestSummary:
+        """
+        Adds the players of new or changed event matches files to the index.
+
+        Args:
+            event_matches_dir (Path): The directory with <year>/event_matches_<id>.json files.
+
+        Returns:
+            HarvestSummary: Files seen, files read and players added.
+        """
+        with self._lock:
+            harvested = {
+                row[0]: tuple(row[1:])
+                for row in self._conn.execute(
+                    "SELECT source_file, stored_name, size, mtime_ns FROM sources"
+                )
+            }
+
+        year_dirs = []
+        if event_matches_dir.exists():
+            year_dirs = sorted(
+                path
+                for path in event_matches_dir.iterdir()
+                if path.is_dir() and path.name.isdigit()
+            )
+
+        files = 0
+        changed: List[Tuple[str, str, int, int]] = []
+        players: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        for year_dir in year_dirs:
+            for name, entry in scan_stored_files(
+                year_dir, "event_matches_*.json"
+            ).items():
+                files += 1
+                source_file = f"{year_dir.name}/{name}"
+                stat = entry.stat()
+                state = (entry.name, stat.st_size, stat.st_mtime_ns)
+                if harvested.get(source_file) == state:
+                    continue
+                try:
+                    records = decode_match_records(load_raw_bytes(year_dir, name))
+                except RAW_DECODE_ERRORS:
+                    continue
+                players.update(extract_players(records))
+                changed.append((source_file, *state))
+
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            # new players only, names / orgs of known players are kept
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO players "
+                "(player_id, player_name, player_org, first_seen) VALUES (?, ?, ?, ?)",
+                [(pid, name, org, now) for pid, (name, org) in players.items()],
+            )
+            new_players = self._conn.total_changes - before
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)", changed
+            )
+            self._conn.execute("COMMIT")
+
+        return HarvestSummary(files=files, parsed=len(changed), new_players=new_players)
+
+    def due(
+        self, max_age: float, now: Optional[float] = None, limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        Returns the players whose details should be fetched, never fetched ones first.
+
+        Args:
+            max_age (float): Freshness window in seconds.
+            now (Optional[float]): Unix timestamp to compare against, defaults to now.
+            limit (Optional[int]): Return at most this many players.
+
+        Returns:
+            List[str]: Player ids, oldest fetch first.
+        """
+        cutoff = (now if now is not None else time.time()) - max_age
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT player_id FROM players "
+                "WHERE last_fetched IS NULL OR last_fetched < ? "
+                "ORDER BY last_fetched IS NOT NULL, last_fetched, player_id "
+                "LIMIT ?",
+                (cutoff, -1 if limit is None else limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def mark_fetched(
+        self, player_ids: Iterable[str], fetched_at: Optional[float] = None
+    ) -> None:
+        """
+        Records that the details of the given players were fetched, in one transaction.
+        """
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "UPDATE players SET last_fetched = ? WHERE player_id = ?",
+                [(fetched_at, player_id) for player_id in player_ids],
+            )
+            self._conn.execute("COMMIT")
+
+    def stats(self, max_age: float, now: Optional[float] = None) -> PlayerIndexStats:
+        """
+        Returns the number of players seen, fetched and due for a fetch.
+        """
+        cutoff = (now if now is not None else time.time()) - max_age
+        with self._lock:
+            players, fetched, due = self._conn.execute(
+                "SELECT COUNT(*), COUNT(last_fetched), "
+                "SUM(last_fetched IS NULL OR last_fetched < ?) FROM players",
+                (cutoff,),
+            ).fetchone()
+        return PlayerIndexStats(players=players, fetched=fetched, due=due or 0)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "PlayerIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
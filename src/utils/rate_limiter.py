@@ -0,0 +1,180 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, NamedTuple, Optional
+
+
+class LimiterState(NamedTuple):
+    rate: float  # Current request rate (requests / second)
+    concurrency: int  # Current max number of in-flight requests
+    in_flight: int  # Requests currently in flight
+    requests: int  # Total requests that completed (any outcome)
+    throttled: int  # 429 / 5xx / timeout outcomes
+    decreases: int  # Number of multiplicative backoffs applied
+    avg_latency: float  # Exponentially weighted mean latency in seconds
+    error_rate: float  # Exponentially weighted error rate (0 - 1)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket rate limiter with an adaptive (AIMD) concurrency window.
+
+    While latency and error rate stay healthy, rate and concurrency grow
+    additively (about `rate_increase` req/s per second of traffic and one extra
+    slot per full window). On a 429, 5xx or timeout both are cut
+    multiplicatively, at most once per `decrease_cooldown` seconds so one burst
+    of failures only backs off once.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 10.0,
+        min_rate: float = 1.0,
+        max_rate: float = 100.0,
+        initial_concurrency: int = 10,
+        min_concurrency: int = 1,
+        max_concurrency: int = 50,
+        target_latency: float = 2.0,
+        max_error_rate: float = 0.05,
+        rate_increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.rate_increase = rate_increase
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+
+        self._rate = float(initial_rate)
+        self._concurrency = float(initial_concurrency)
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+        self._requests = 0
+        self._throttled = 0
+        self._decreases = 0
+        self._avg_latency = 0.0
+        self._error_rate = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def concurrency(self) -> int:
+        return max(self.min_concurrency, int(self._concurrency))
+
+    def _get_condition(self) -> asyncio.Condition:
+        # created lazily so the limiter can be built outside of a running loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _take_token(self) -> None:
+        while True:
+            now = time.monotonic()
+            burst = max(1.0, self._rate)
+            elapsed = now - self._last_refill
+            self._tokens = min(burst, self._tokens + elapsed * self._rate)
+            self._last_refill = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self._tokens) / self._rate)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Waits for a free concurrency slot and a rate token.
+        The outcome of the request should be reported with record_response / record_failure.
+        """
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.concurrency)
+            self._in_flight += 1
+        try:
+            await self._take_token()
+            yield
+        finally:
+            async with condition:
+                self._in_flight -= 1
+                condition.notify_all()
+
+    def _update_averages(self, latency: Optional[float], failed: bool) -> None:
+        self._requests += 1
+        if latency is not None:
+            if self._requests == 1:
+                self._avg_latency = latency
+            else:
+                self._avg_latency = 0.8 * self._avg_latency + 0.2 * latency
+        self._error_rate = 0.9 * self._error_rate + (0.1 if failed else 0.0)
+
+    def _increase(self) -> None:
+        # additive increase - grows by `rate_increase` per `rate` successes (~1s)
+        self._rate = min(self.max_rate, self._rate + self.rate_increase / self._rate)
+        self._concurrency = min(
+            float(self.max_concurrency), self._concurrency + 1.0 / self._concurrency
+        )
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self._decreases += 1
+        self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+        self._concurrency = max(
+            float(self.min_concurrency), self._concurrency * self.decrease_factor
+        )
+        self._tokens = min(self._tokens, 1.0)
+
+    def record_response(self, status_code: int, latency: float) -> None:
+        """
+        Feeds back the outcome of a completed request.
+        429 and 5xx responses count as throttling, everything else as healthy.
+
+        Args:
+            status_code (int): The HTTP status code of the response.
+            latency (float): The request latency in seconds.
+        """
+        throttled = status_code == 429 or status_code >= 500
+        self._update_averages(latency, throttled)
+        if throttled:
+            self._throttled += 1
+            self._decrease()
+        elif (
+            self._avg_latency <= self.target_latency
+            and self._error_rate <= self.max_error_rate
+        ):
+            self._increase()
+
+    def record_failure(self) -> None:
+        """
+        Feeds back a request that never produced a response (timeout / connection error).
+        """
+        self._update_averages(None, True)
+        self._throttled += 1
+        self._decrease()
+
+    def state(self) -> LimiterState:
+        """
+        Returns a snapshot of the limiter, e.g. to report the rate it settled on.
+        """
+        return LimiterState(
+            rate=self._rate,
+            concurrency=self.concurrency,
+            in_flight=self._in_flight,
+            requests=self._requests,
+            throttled=self._throttled,
+            decreases=self._decreases,
+            avg_latency=self._avg_latency,
+            error_rate=self._error_rate,
+        )
@@ -0,0 +1,308 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional, Union
+
+from src.config import RAW_CATALOG_PATH
+from src.utils.raw_storage import (
+    RAW_DECODE_ERRORS,
+    decode_raw_bytes,
+    resolve_raw_path,
+)
+
+# Bump when the table layout changes - the catalog is a cache and is rebuilt
+SCHEMA_VERSION = 3
+
+
+class CatalogEntry(NamedTuple):
+    path: str  # Absolute logical path of the raw file ("....json")
+    stored_path: str  # Absolute path of the file on disk (may have .gz / .zst suffix)
+    size: int  # File size in bytes at the time it was recorded
+    mtime_ns: int  # File modification time (ns) at the time it was recorded
+    content_hash: str  # sha256 of the file contents
+    row_count: int  # Number of rows (events / matches) in the payload
+    is_valid: bool  # True if the file parsed as JSON
+    updated_at: float  # Unix timestamp of the last catalog update
+    source_hash: Optional[str]  # sha256 of the HTTP response body the file came from
+    etag: Optional[str]  # ETag header of that response
+    last_modified: Optional[str]  # Last-Modified header of that response
+    checked_at: float  # Unix timestamp the source was last fetched / validated
+    changed_at: float  # Unix timestamp the file contents last changed
+
+
+class FetchSource(NamedTuple):
+    source_hash: str  # sha256 of the response body
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def count_rows(data: Any) -> int:
+    """
+    Returns the number of rows in a raw WTT payload.
+
+    Events payloads are nested (list[0] -> 'rows' list), event matches payloads
+    are a flat list of matches.
+
+    Args:
+        data (Any): The decoded JSON payload.
+
+    Returns:
+        int: The number of rows found in the payload.
+    """
+    if isinstance(data, list):
+        if len(data) > 0 and isinstance(data[0], dict) and "rows" in data[0]:
+            return len(data[0].get("rows") or [])
+        return len(data)
+    return 0
+
+
+class RawCatalog:
+    """
+    SQLite backed index of every raw file written by the collectors.
+
+    Records path, size, mtime, content hash, row count and validity so that
+    planners can answer "exists and valid" without opening the file.
+    Entries are checked against a cheap stat() call, a file that was changed
+    outside of save_raw_json is re-validated and re-recorded on the next lookup.
+    Entries are keyed by the logical ".json" path whatever the storage format.
+    """
+
+    def __init__(self, db_path: Path = RAW_CATALOG_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # collectors write from a thread pool, so share one connection behind a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS raw_files")
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS raw_files (
+                path TEXT PRIMARY KEY,
+                stored_path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                is_valid INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                source_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                checked_at REAL NOT NULL,
+                changed_at REAL NOT NULL
+            )
+            """)
+
+    @staticmethod
+    def _key(filepath: Union[Path, str]) -> str:
+        return str(Path(filepath).resolve())
+
+    def record(
+        self,
+        filepath: Path,
+        content: bytes,
+        data: Any = None,
+        is_valid: bool = True,
+        stored_file: Optional[Path] = None,
+        source: Optional[FetchSource] = None,
+    ) -> CatalogEntry:
+        """
+        Records a raw file that has just been written.
+        changed_at only moves forward when the content hash differs from the
+        previous entry, so rewriting identical content does not count as a change.
+
+        Args:
+            filepath (Path): The logical path of the written file.
+            content (bytes): The exact bytes written to the file.
+            data (Any): The decoded payload, used to count rows.
+            is_valid (bool): Whether the content is valid JSON.
+            stored_file (Optional[Path]): The file on disk, if it differs from filepath
+                (compressed storage formats).
+            source (Optional[FetchSource]): The HTTP response the file was built from,
+                used for conditional fetches and skip-unchanged checks. Without one
+                (migrations, saves of local data) the stored validators are kept.
+
+        Returns:
+            CatalogEntry: The entry stored in the catalog.
+        """
+        stored_file = Path(stored_file) if stored_file is not None else Path(filepath)
+        stat = stored_file.stat()
+        content_hash = hashlib.sha256(content).hexdigest()
+        now = time.time()
+
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT content_hash, changed_at, checked_at, source_hash, etag, "
+                "last_modified FROM raw_files WHERE path = ?",
+                (self._key(filepath),),
+            ).fetchone()
+            changed_at = now
+            if previous is not None and previous[0] == content_hash:
+                changed_at = previous[1]
+            # only a fetch counts as a check, not a re-validation of the file
+            checked_at = now
+            if source is None or source.source_hash is None:
+                checked_at = previous[2] if previous is not None else 0.0
+            if source is None:
+                # keep the stored validators, the next fetch can still be conditional
+                source = FetchSource(*previous[3:]) if previous is not None else None
+            source = source or FetchSource(source_hash=None)
+
+            entry = CatalogEntry(
+                path=self._key(filepath),
+                stored_path=self._key(stored_file),
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                content_hash=content_hash,
+                row_count=count_rows(data) if is_valid else 0,
+                is_valid=is_valid,
+                updated_at=now,
+                source_hash=source.source_hash,
+                etag=source.etag,
+                last_modified=source.last_modified,
+                checked_at=checked_at,
+                changed_at=changed_at,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO raw_files VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*entry[:6], int(entry.is_valid), *entry[7:]),
+            )
+        return entry
+
+    def mark_checked(self, filepath: Path) -> None:
+        """
+        Records that the source of a file was fetched and found unchanged.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE raw_files SET checked_at = ? WHERE path = ?",
+                (time.time(), self._key(filepath)),
+            )
+
+    def changed_since(self, since: float, folder: Optional[Path] = None) -> List[str]:
+        """
+        Returns the logical paths whose contents changed at or after `since`.
+        Downstream stages use this to skip raw files that a run left untouched.
+
+        Args:
+            since (float): Unix timestamp, e.g. the start of the last build.
+            folder (Optional[Path]): Only return files below this folder.
+
+        Returns:
+            List[str]: Sorted absolute logical paths.
+        """
+        query = "SELECT path FROM raw_files WHERE changed_at >= ?"
+        params: list = [since]
+        if folder is not None:
+            query += " AND path LIKE ?"
+            params.append(f"{self._key(folder)}/%")
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY path", params).fetchall()
+        return [row[0] for row in rows]
+
+    def fetch_summary(self, since: float) -> tuple[int, int]:
+        """
+        Returns (checked, unchanged) counts for files fetched at or after `since`.
+        """
+        with self._lock:
+            checked, unchanged = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(changed_at < ?), 0) "
+                "FROM raw_files WHERE checked_at >= ?",
+                (since, since),
+            ).fetchone()
+        return checked, unchanged
+
+    def get(self, filepath: Path) -> Optional[CatalogEntry]:
+        """
+        Returns the stored entry for a file without touching the file itself.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM raw_files WHERE path = ?", (self._key(filepath),)
+            ).fetchone()
+        if row is None:
+            return None
+        return CatalogEntry(*row[:6], bool(row[6]), *row[7:])
+
+    def remove(self, filepath: Path) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM raw_files WHERE path = ?", (self._key(filepath),)
+            )
+
+    def lookup(self, filepath: Path) -> Optional[CatalogEntry]:
+        """
+        Returns an up to date entry for the file, or None if the file is missing.
+
+        The stored entry is trusted when size and mtime still match the file on
+        disk. Files that are unknown or were modified externally are read and
+        validated once, then recorded so later lookups are O(1) again.
+
+        Args:
+            filepath (Path): The path of the raw file.
+
+        Returns:
+            Optional[CatalogEntry]: The current entry or None if the file does not exist.
+        """
+        filepath = Path(filepath)
+        stored_file = resolve_raw_path(filepath.parent, filepath.name)
+        if stored_file is None:
+            if self.get(filepath) is not None:
+                self.remove(filepath)
+            return None
+        stat = stored_file.stat()
+
+        entry = self.get(filepath)
+        if (
+            entry is not None
+            and entry.stored_path == self._key(stored_file)
+            and entry.size == stat.st_size
+            and entry.mtime_ns == stat.st_mtime_ns
+        ):
+            return entry
+
+        # unknown or stale entry - validate the file once and record it
+        content = stored_file.read_bytes()
+        data, is_valid = None, False
+        if content:
+            try:
+                data, is_valid = json.loads(decode_raw_bytes(content)), True
+            except RAW_DECODE_ERRORS:
+                pass
+        return self.record(
+            filepath, content, data, is_valid=is_valid, stored_file=stored_file
+        )
+
+    def is_valid_json(self, folder: Path, filename: str) -> bool:
+        """
+        Catalog backed equivalent of io_handler.json_exists.
+
+        Args:
+            folder (Path): The folder to check in.
+            filename (str): The filename to check for.
+
+        Returns:
+            bool: True if the file exists, is not empty and is valid JSON.
+        """
+        entry = self.lookup(folder / filename)
+        return entry is not None and entry.is_valid and entry.size > 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "RawCatalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
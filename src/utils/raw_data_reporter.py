@@ -1,15 +1,15 @@
 from datetime import datetime
 from pathlib import Path
-import json
+
+import polars as pl
 
 from src.config import (
+    RAW_EVENT_MATCHES_DIR,
     RAW_EVENTS_DIR,
+    REPORT_WORKERS,
 )
-from src.utils.helper_logic import (
-    get_event_count_from_file,
-    get_event_date_status,
-    is_senior_event,
-)
+from src.utils.event_index import get_event_index
+from src.utils.match_index import get_match_index
 
 
 def get_raw_events_summary(raw_events_dir: Path) -> str:
@@ -25,43 +25,22 @@ def get_raw_events_summary(raw_events_dir: Path) -> str:
 
     events_markdown = "# Raw Events Data Summary\n\n"
 
-    events_files = sorted(raw_events_dir.glob("events_*.json"))
+    index = get_event_index(raw_events_dir)
 
     total_events = 0
-    excluded_events = 0
-    senior_events = 0
-    total_ongoing = 0
-    total_completed = 0
-    total_future = 0
-
-    for event_file in events_files:
-        year = int(event_file.stem.split("_")[1])
-        event_count = get_event_count_from_file(raw_events_dir, event_file.name)
+    for year in index.years():
+        event_count = index.row_count(year)
         total_events += event_count
         events_markdown += f"- {year}: {event_count} events\n"
 
-        with open(event_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if not isinstance(data, list):
-            continue
-
-        events_list = data[0].get("rows", [])
-
-        for event in events_list:
-            event_name = event.get("EventName")
-            if not event_name or not is_senior_event(event_name):
-                excluded_events += 1
-                continue
-            senior_events += 1
-
-            event_status = get_event_date_status(event)
-            if event_status == "future":
-                total_future += 1
-            elif event_status == "ongoing":
-                total_ongoing += 1
-            elif event_status == "completed":
-                total_completed += 1
+    # one vectorized pass, every status against the same reference date
+    senior = index.frame(current_date=datetime.now()).filter(pl.col("is_senior"))
+    senior_events = senior.height
+    excluded_events = total_events - senior_events
+    status_counts = dict(senior.group_by("status").len().iter_rows())
+    total_completed = status_counts.get("completed", 0)
+    total_ongoing = status_counts.get("ongoing", 0)
+    total_future = status_counts.get("future", 0)
 
     events_markdown += "\n### 📈 Senior vs Excluded Breakdown\n"
     events_markdown += "| Category | Count | Percentage |\n"
@@ -81,6 +60,66 @@ def get_raw_events_summary(raw_events_dir: Path) -> str:
     return events_markdown
 
 
+def get_raw_event_matches_summary(
+    raw_events_dir: Path,
+    raw_event_matches_dir: Path,
+    workers: int = REPORT_WORKERS,
+) -> str:
+    """
+    Get a summary of the match coverage of the completed senior events.
+
+    Per-file aggregates come from the event and match indexes, so only files
+    that changed since the last report are read.
+
+    Args:
+        raw_events_dir (Path): The directory containing the raw events data.
+        raw_event_matches_dir (Path): The directory with <year>/event_matches_<id>.json files.
+        workers (int): Processes used to scan changed match files.
+
+    Returns:
+        matches_markdown: A summary of the match coverage per year.
+    """
+
+    matches_markdown = "# Raw Event Matches Summary\n\n"
+
+    match_files = get_match_index(raw_event_matches_dir, workers).frame()
+    # an event spanning a year boundary is counted once, under its canonical year
+    events = (
+        get_event_index(raw_events_dir)
+        .frame(current_date=datetime.now(), dedupe=True)
+        .filter(pl.col("is_senior") & (pl.col("status") == "completed"))
+    )
+
+    # an event is covered if any year directory has at least one of its matches
+    covered_ids = (
+        match_files.filter(pl.col("matches") > 0)["event_id"].drop_nulls().unique()
+    )
+    coverage = events.group_by("year").agg(
+        pl.len().alias("events"),
+        pl.col("event_id").is_in(covered_ids.implode()).sum().alias("with_matches"),
+    )
+    per_year = match_files.group_by("year").agg(
+        pl.len().alias("files"), pl.col("matches").sum()
+    )
+    table = (
+        coverage.join(per_year, on="year", how="full", coalesce=True)
+        .fill_null(0)
+        .sort("year")
+    )
+
+    matches_markdown += "| Year | Completed Senior Events | With Matches | Without Matches | Match Files | Matches |\n"
+    matches_markdown += "| :--- | :--- | :--- | :--- | :--- | :--- |\n"
+    for row in table.iter_rows(named=True):
+        without = row["events"] - row["with_matches"]
+        matches_markdown += f"| {row['year']} | {row['events']} | {row['with_matches']} | {without} | {row['files']} | {row['matches']} |\n"
+
+    total_events = int(table["events"].sum())
+    total_with = int(table["with_matches"].sum())
+    matches_markdown += f"| **Total** | {total_events} | {total_with} | {total_events - total_with} | {int(table['files'].sum())} | {int(table['matches'].sum())} |\n"
+
+    return matches_markdown
+
+
 if __name__ == "__main__":
 
     generated_on = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -91,6 +130,9 @@ if __name__ == "__main__":
     ]
 
     raw_data_report.append(get_raw_events_summary(RAW_EVENTS_DIR))
+    raw_data_report.append(
+        get_raw_event_matches_summary(RAW_EVENTS_DIR, RAW_EVENT_MATCHES_DIR)
+    )
 
     report_path = Path("data/RAW_DATA_REPORT.md")
     with open(report_path, "w", encoding="utf-8") as f:
@@ -0,0 +1,160 @@
+import fnmatch
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+# Storage format -> suffix appended to the logical ".json" filename
+RAW_FORMAT_SUFFIXES = {
+    "json": "",
+    "json.gz": ".gz",
+    "json.zst": ".zst",
+}
+
+# Errors raised when a stored file is corrupt / truncated / not JSON
+RAW_DECODE_ERRORS: tuple = (ValueError, OSError, EOFError, RuntimeError)
+if zstd is not None:
+    RAW_DECODE_ERRORS += (zstd.ZstdError,)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _require_zstd() -> None:
+    if zstd is None:
+        raise RuntimeError(
+            "json.zst storage needs Python 3.14+ or the 'zstandard' package"
+        )
+
+
+def encode_raw_json(data: Any, storage_format: str) -> bytes:
+    """
+    Serialises a payload for the given storage format.
+    Plain JSON keeps the readable indent=4 layout, compressed formats are written compact.
+
+    Args:
+        data (Any): The payload to serialise.
+        storage_format (str): One of RAW_FORMAT_SUFFIXES.
+
+    Returns:
+        bytes: The bytes to write to disk.
+    """
+    if storage_format == "json":
+        return json.dumps(data, indent=4).encode("utf-8")
+
+    compact = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    if storage_format == "json.gz":
+        return gzip.compress(compact, compresslevel=6)
+    if storage_format == "json.zst":
+        _require_zstd()
+        return zstd.compress(compact)
+    raise ValueError(f"Unknown raw storage format: {storage_format}")
+
+
+def decode_raw_bytes(content: bytes) -> bytes:
+    """
+    Returns the JSON bytes of a stored file, decompressing it if needed.
+    The format is detected from the magic bytes, not the filename.
+    """
+    if content.startswith(_GZIP_MAGIC):
+        return gzip.decompress(content)
+    if content.startswith(_ZSTD_MAGIC):
+        _require_zstd()
+        return zstd.decompress(content)
+    return content
+
+
+def stored_path(folder: Path, filename: str, storage_format: str) -> Path:
+    """
+    Returns the on-disk path of a logical ".json" file in the given format.
+    """
+    return folder / f"{filename}{RAW_FORMAT_SUFFIXES[storage_format]}"
+
+
+def resolve_raw_path(folder: Path, filename: str) -> Optional[Path]:
+    """
+    Finds the stored file for a logical filename, whatever format it was saved in.
+
+    Args:
+        folder (Path): The folder to look in.
+        filename (str): The logical filename, e.g. "events_2024.json".
+
+    Returns:
+        Optional[Path]: The existing stored file, or None if there is none.
+    """
+    for suffix in RAW_FORMAT_SUFFIXES.values():
+        candidate = folder / f"{filename}{suffix}"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def logical_name(path: Path) -> str:
+    """
+    Strips any compression suffix, e.g. "events_2024.json.zst" -> "events_2024.json".
+    """
+    name = path.name
+    for suffix in RAW_FORMAT_SUFFIXES.values():
+        if suffix and name.endswith(f".json{suffix}"):
+            return name[: -len(suffix)]
+    return name
+
+
+def iter_raw_files(folder: Path, pattern: str) -> List[Path]:
+    """
+    Globs a folder for raw files in any storage format.
+
+    Args:
+        folder (Path): The folder to search.
+        pattern (str): A glob for the logical names, e.g. "events_*.json".
+
+    Returns:
+        List[Path]: Sorted logical paths (without compression suffix), one per file.
+    """
+    names = set()
+    for suffix in RAW_FORMAT_SUFFIXES.values():
+        for path in folder.glob(f"{pattern}{suffix}"):
+            names.add(logical_name(path))
+    return [folder / name for name in sorted(names)]
+
+
+def scan_stored_files(folder: Path, pattern: str) -> Dict[str, os.DirEntry]:
+    """
+    Lists the stored raw files of a folder in one directory read.
+
+    Picks the same stored copy as resolve_raw_path when a file exists in more
+    than one format, without a stat / glob per file - for walking large trees.
+
+    Args:
+        folder (Path): The folder to search.
+        pattern (str): A glob for the logical names, e.g. "event_matches_*.json".
+
+    Returns:
+        Dict[str, os.DirEntry]: Logical name -> directory entry of the stored file.
+    """
+    found: Dict[str, os.DirEntry] = {}
+    ranks: Dict[str, int] = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            # same suffix order as resolve_raw_path, a lower rank wins
+            for rank, suffix in enumerate(RAW_FORMAT_SUFFIXES.values()):
+                if entry.name.endswith(f".json{suffix}"):
+                    name = entry.name[: len(entry.name) - len(suffix)]
+                    break
+            else:
+                continue
+            if not fnmatch.fnmatchcase(name, pattern) or not entry.is_file():
+                continue
+            if name not in ranks or rank < ranks[name]:
+                found[name] = entry
+                ranks[name] = rank
+    return found
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+import httpx
+
+from src.config import (
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_MODE,
+    RESPONSE_CACHE_PATH,
+)
+
+# Bump when the table layout changes - the cache is rebuilt
+SCHEMA_VERSION = 1
+
+CACHE_MODES = ("off", "record", "replay")
+
+# ttl value meaning "do not cache this request", None means "never expires"
+NO_CACHE = 0
+
+
+class CacheMissError(LookupError):
+    """
+    Raised in replay mode when a request was never recorded.
+    """
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    stored: int
+    evicted: int
+    size_bytes: int
+
+
+def request_key(
+    method: str,
+    url: str,
+    params: Optional[Dict] = None,
+    json_payload: Optional[Any] = None,
+) -> str:
+    """
+    Returns the cache key of a request: a hash of method, url, params and payload.
+    Headers are not part of the key (they only carry auth / conditional values).
+    """
+    raw = json.dumps(
+        [method.upper(), url, params, json_payload], sort_keys=True, default=str
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite backed record / replay cache of successful WTT responses.
+
+    In "record" mode a cached response is served while it is fresh (per-request
+    TTL, None = never expires), otherwise the request goes to the network and a
+    200 response is stored. In "replay" mode every recorded response is served
+    whatever its age and a request that was never recorded raises CacheMissError,
+    so a recorded run can be replayed offline and deterministically.
+
+    The least recently used responses are evicted once the bodies exceed max_bytes.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = RESPONSE_CACHE_PATH,
+        mode: str = "record",
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown response cache mode: {mode}")
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS responses")
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL,
+                last_used REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+        self._hits = 0
+        self._misses = 0
+        self._stored = 0
+        self._evicted = 0
+        # running total of the stored bodies, summed once instead of per put
+        self._size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def get(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_payload: Optional[Any] = None,
+    ) -> Optional[httpx.Response]:
+        """
+        Returns the cached response of a request, or None on a miss.
+
+        Raises:
+            CacheMissError: In replay mode, if the request was never recorded.
+        """
+        key = request_key(method, url, params, json_payload)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            fresh = row is not None and (row[3] is None or row[3] > now)
+            if row is not None and (fresh or self.mode == "replay"):
+                self._conn.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                )
+                self._hits += 1
+            else:
+                row = None
+                self._misses += 1
+
+        if row is None:
+            if self.mode == "replay":
+                raise CacheMissError(f"No recorded response for {method} {url}")
+            return None
+
+        status, headers, body, _ = row
+        return httpx.Response(
+            status,
+            headers=json.loads(headers),
+            content=body,
+            request=httpx.Request(method, url, params=params),
+        )
+
+    def put(
+        self,
+        response: httpx.Response,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_payload: Optional[Any] = None,
+        ttl: Optional[float] = None,
+    ) -> bool:
+        """
+        Stores a 200 response, then evicts least recently used entries above max_bytes.
+
+        Args:
+            response (httpx.Response): The response to store.
+            method, url, params, json_payload: The request, as passed to the client.
+            ttl (Optional[float]): Seconds the response stays fresh, None = never expires.
+
+        Returns:
+            bool: True if the response was stored.
+        """
+        if self.mode != "record" or response.status_code != 200:
+            return False
+
+        body = response.content
+        now = time.time()
+        # content-encoding / length describe the wire format, the body is stored decoded
+        headers = {
+            k: v
+            for k, v in response.headers.items()
+            if k.lower()
+            not in ("content-encoding", "content-length", "transfer-encoding")
+        }
+        key = request_key(method, url, params, json_payload)
+        with self._lock:
+            replaced = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    method.upper(),
+                    url,
+                    response.status_code,
+                    json.dumps(headers),
+                    body,
+                    len(body),
+                    now,
+                    now + ttl if ttl is not None else None,
+                    now,
+                ),
+            )
+            self._size += len(body) - (replaced[0] if replaced is not None else 0)
+            self._stored += 1
+            self._evict()
+        return True
+
+    def _evict(self) -> None:
+        # called with the lock held, reads only the least recently used rows it needs
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_used LIMIT 16"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    return
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                self._evicted += 1
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            stored=self._stored,
+            evicted=self._evicted,
+            size_bytes=self._size,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_response_cache(
+    mode: str = RESPONSE_CACHE_MODE, db_path: Path = RESPONSE_CACHE_PATH
+) -> Optional[ResponseCache]:
+    """
+    Opens the project response cache, or returns None when the mode is "off".
+    The mode defaults to RESPONSE_CACHE_MODE (TT_RESPONSE_CACHE environment variable).
+    """
+    if mode == "off":
+        return None
+    return ResponseCache(db_path, mode=mode)
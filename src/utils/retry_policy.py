@@ -0,0 +1,147 @@
+import random
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+)
+
+# Statuses that indicate throttling or a transient gateway problem
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class RetryStats(NamedTuple):
+    retries: int  # Total retries performed this run
+    by_reason: Dict[str, int]  # Retries per status code / exception name
+    gave_up: int  # Requests that still failed after their last attempt
+    budget_remaining: int  # Retries left in the per-run budget
+
+
+def parse_retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """
+    Parses the Retry-After header of a response.
+
+    Args:
+        response (Optional[httpx.Response]): The response to inspect.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, None if absent or unparseable.
+    """
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # HTTP-date format
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Retry policy shared by every WTT request of a run.
+
+    Retries on connection errors / timeouts and on 429, 502, 503 and 504.
+    Waits for Retry-After when the server sends one, otherwise uses full-jitter
+    exponential backoff. A per-run retry budget stops a throttled window from
+    turning every task into a long chain of retries.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        max_retry_after: float = 120.0,
+        retry_budget: int = 500,
+        status_codes: frozenset = RETRYABLE_STATUS_CODES,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_budget = retry_budget
+        self.status_codes = status_codes
+
+        self._retries = 0
+        self._by_reason: Counter = Counter()
+        self._gave_up = 0
+
+    def _is_retryable_response(self, response: httpx.Response) -> bool:
+        return response.status_code in self.status_codes
+
+    def _budget_exhausted(self, retry_state: RetryCallState) -> bool:
+        return self._retries >= self.retry_budget
+
+    def _wait(self, retry_state: RetryCallState) -> float:
+        response = None
+        if not retry_state.outcome.failed:
+            response = retry_state.outcome.result()
+        retry_after = parse_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        backoff = self.base_delay * 2 ** (retry_state.attempt_number - 1)
+        return random.uniform(0, min(self.max_delay, backoff))
+
+    def _before_sleep(self, retry_state: RetryCallState) -> None:
+        outcome = retry_state.outcome
+        if outcome.failed:
+            reason = type(outcome.exception()).__name__
+        else:
+            reason = str(outcome.result().status_code)
+        self._retries += 1
+        self._by_reason[reason] += 1
+
+    def _give_up(self, retry_state: RetryCallState) -> httpx.Response:
+        # return the last response so the caller can raise_for_status,
+        # or re-raise the last exception
+        self._gave_up += 1
+        return retry_state.outcome.result()
+
+    async def run(
+        self, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Runs `send` until it returns a non-retryable response or the policy gives up.
+
+        Args:
+            send (Callable[[], Awaitable[httpx.Response]]): Sends one attempt.
+
+        Returns:
+            httpx.Response: The final response, which may still be an error status.
+        """
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts) | self._budget_exhausted,
+            wait=self._wait,
+            retry=(
+                retry_if_exception_type(httpx.RequestError)
+                | retry_if_result(self._is_retryable_response)
+            ),
+            before_sleep=self._before_sleep,
+            retry_error_callback=self._give_up,
+        )
+        return await retrying(send)
+
+    def stats(self) -> RetryStats:
+        return RetryStats(
+            retries=self._retries,
+            by_reason=dict(self._by_reason),
+            gave_up=self._gave_up,
+            budget_remaining=max(0, self.retry_budget - self._retries),
+        )
@@ -1,6 +1,13 @@
 import json
+from datetime import datetime
 from typing import Union
 
+from src.config import (
+    PLAYER_DETAILS_MAX_AGE,
+    RESPONSE_CACHE_TTL_CURRENT_YEAR,
+    RESPONSE_CACHE_TTL_LIVE_EVENT,
+)
+
 
 class WTTRoutes:
     # Use exact headers from CUrl copy.
@@ -34,7 +41,8 @@ class WTTRoutes:
             year (Union[int, str]): The year to filter the events by.
 
         Returns:
-            dict: A dictionary containing the method, url, payload, and headers.
+            dict: A dictionary containing the method, url, payload, headers and the
+                response cache TTL (past years never change, so they never expire).
         """
 
         url = "https://wtt-website-api-prod-3-frontdoor-bddnb2haduafdze9.a01.azurefd.net/api/eventcalendar"
@@ -61,19 +69,26 @@ class WTTRoutes:
             "url": url,
             "json_payload": payload,  # Note: we use 'json_payload' to match our client arg
             "headers": WTTRoutes._BASE_HEADERS,
+            "cache_ttl": (
+                None
+                if int(year) < datetime.now().year
+                else RESPONSE_CACHE_TTL_CURRENT_YEAR
+            ),
         }
 
     @staticmethod
-    def get_event_matches_route(event_id: Union[int, str]):
+    def get_event_matches_route(event_id: Union[int, str], completed: bool = False):
         """
         Gets the matches for a given event id - these match payloads are then used
         to scrape the match details from the WTT API
 
         Args:
             event_id (Union[int, str]): The event id to get the matches for.
+            completed (bool): Whether the event is over, its results are then cached for good.
 
         Returns:
-            dict: A dictionary containing the method, url, payload, and headers.
+            dict: A dictionary containing the method, url, payload, headers and the
+                response cache TTL.
         """
 
         return {
@@ -87,4 +102,63 @@ class WTTRoutes:
                 "User-Agent": "Mozilla/5.0 (Linux; Android 11.0; Surface Duo) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Mobile Safari/537.36",
                 "secapimkey": "S_WTT_882jjh7basdj91834783mds8j2jsd81",
             },
+            "cache_ttl": None if completed else RESPONSE_CACHE_TTL_LIVE_EVENT,
+        }
+
+    @staticmethod
+    def get_match_details_route(
+        event_id: Union[int, str], document_code: str, completed: bool = False
+    ):
+        """
+        Gets the match card (players, game scores) of one match of an event,
+        the document code comes from the event matches payload.
+
+        Args:
+            event_id (Union[int, str]): The event id of the match.
+            document_code (str): The documentCode of the match.
+            completed (bool): Whether the event is over, its match cards are then cached for good.
+
+        Returns:
+            dict: A dictionary containing the method, url, headers and the
+                response cache TTL.
+        """
+
+        return {
+            "url": f"https://wttwebsiteprodapi-liveevents.trafficmanager.net/api/cms/GetMatchCardDetails/{event_id}/{document_code}",
+            "method": "GET",
+            "headers": {
+                "Accept": "application/json, text/plain, */*",
+                "Referer": "https://www.worldtabletennis.com/",
+                "Origin": "https://www.worldtabletennis.com",
+                "User-Agent": "Mozilla/5.0 (Linux; Android 11.0; Surface Duo) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Mobile Safari/537.36",
+                "secapimkey": "S_WTT_882jjh7basdj91834783mds8j2jsd81",
+            },
+            "cache_ttl": None if completed else RESPONSE_CACHE_TTL_LIVE_EVENT,
+        }
+
+    @staticmethod
+    def get_player_details_route(player_id: Union[int, str]):
+        """
+        Gets the profile of one player, the player id comes from the event matches payloads.
+
+        Args:
+            player_id (Union[int, str]): The WTT player id.
+
+        Returns:
+            dict: A dictionary containing the method, url, params, headers and the
+                response cache TTL (the player details freshness window).
+        """
+
+        return {
+            "url": "https://wttwebsiteprodapi-liveevents.trafficmanager.net/api/cms/GetPlayerProfile",
+            "method": "GET",
+            "params": {"PlayerId": str(player_id)},
+            "headers": {
+                "Accept": "application/json, text/plain, */*",
+                "Referer": "https://www.worldtabletennis.com/",
+                "Origin": "https://www.worldtabletennis.com",
+                "User-Agent": "Mozilla/5.0 (Linux; Android 11.0; Surface Duo) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Mobile Safari/537.36",
+                "secapimkey": "S_WTT_882jjh7basdj91834783mds8j2jsd81",
+            },
+            "cache_ttl": PLAYER_DETAILS_MAX_AGE,
         }
@@ -0,0 +1,167 @@
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from src.config import RECENT_EVENT_DAYS
+
+T = TypeVar("T")
+
+# Event priorities, lower runs first
+PRIORITY_ONGOING = 0  # Results change today
+PRIORITY_RECENT = 1  # Completed within RECENT_EVENT_DAYS, late corrections still land
+PRIORITY_HISTORICAL = 2  # Older backfill gaps
+PRIORITY_NAMES = {
+    PRIORITY_ONGOING: "ongoing",
+    PRIORITY_RECENT: "recently completed",
+    PRIORITY_HISTORICAL: "historical",
+}
+
+
+def event_priority(
+    status: Optional[str],
+    end: Optional[datetime],
+    current_date: Optional[datetime] = None,
+    recent_days: int = RECENT_EVENT_DAYS,
+) -> int:
+    """
+    Returns the scheduling priority of an event, lower is more urgent.
+
+    Args:
+        status (Optional[str]): "future", "ongoing" or "completed" (see get_date_statuses).
+        end (Optional[datetime]): The end date of the event.
+        current_date (Optional[datetime]): The date to compare against, defaults to now.
+        recent_days (int): Completed events that ended within this many days are recent.
+
+    Returns:
+        int: PRIORITY_ONGOING, PRIORITY_RECENT or PRIORITY_HISTORICAL.
+    """
+    if status == "ongoing":
+        return PRIORITY_ONGOING
+    current_date = current_date or datetime.now()
+    if end is not None and end >= current_date - timedelta(days=recent_days):
+        return PRIORITY_RECENT
+    return PRIORITY_HISTORICAL
+
+
+def count_by_priority(
+    items: Iterable[Any], priorities: Dict[Any, int]
+) -> Dict[str, int]:
+    """
+    Counts items per priority name, e.g. to report what is left of a queue.
+
+    Args:
+        items (Iterable[Any]): The items.
+        priorities (Dict[Any, int]): Priority per item, a missing item counts as historical.
+
+    Returns:
+        Dict[str, int]: Count per priority name, most urgent first, empty ones left out.
+    """
+    counts = {name: 0 for name in PRIORITY_NAMES.values()}
+    for item in items:
+        counts[PRIORITY_NAMES[priorities.get(item, PRIORITY_HISTORICAL)]] += 1
+    return {name: count for name, count in counts.items() if count}
+
+
+class RunBudget:
+    """
+    Time, task and request budget of a scrape run.
+
+    take() hands out work items until any budget runs out, the items it did
+    not hand out are kept in `remaining`. The clock starts when the budget is
+    created, so planning time counts against max_seconds - a cron slot of N
+    seconds never overruns by more than the tasks in flight. max_requests
+    counts the HTTP requests actually sent (read from requests_sent, e.g.
+    TTStatsClient.requests_sent), retries, revalidations and follow-up calls
+    included; the tasks in flight when it runs out may still send a few.
+    Call admit() when a handed-out item starts, take() runs ahead of the
+    workers by the queue.
+    """
+
+    def __init__(
+        self,
+        max_seconds: Optional[float] = None,
+        max_tasks: Optional[int] = None,
+        max_requests: Optional[int] = None,
+        requests_sent: Optional[Callable[[], int]] = None,
+    ):
+        if max_requests is not None and requests_sent is None:
+            raise ValueError("max_requests needs a requests_sent counter")
+        self.max_seconds = max_seconds
+        self.max_tasks = max_tasks
+        self.max_requests = max_requests
+        self._requests_sent = requests_sent
+        # only the requests of this run count, not those of earlier runs of the client
+        self._requests_before = requests_sent() if requests_sent is not None else 0
+        self.started = time.monotonic()
+        self.dispatched = 0  # Items handed out by take() and admitted
+        self.remaining: List[Any] = []  # Items not handed out once the budget ran out
+
+    @property
+    def limited(self) -> bool:
+        return (
+            self.max_seconds is not None
+            or self.max_tasks is not None
+            or self.max_requests is not None
+        )
+
+    @property
+    def requests(self) -> int:
+        # requests sent since the budget was created
+        if self._requests_sent is None:
+            return 0
+        return self._requests_sent() - self._requests_before
+
+    def exhausted_by(self) -> Optional[str]:
+        """
+        Returns the budget that ran out, "max_seconds", "max_tasks" or
+        "max_requests", else None.
+        """
+        if self.max_tasks is not None and self.dispatched >= self.max_tasks:
+            return "max_tasks"
+        return self._spent()
+
+    def _spent(self) -> Optional[str]:
+        # the budgets spent while items run, unlike max_tasks which take() enforces
+        if self.max_requests is not None and self.requests >= self.max_requests:
+            return "max_requests"
+        if (
+            self.max_seconds is not None
+            and time.monotonic() - self.started >= self.max_seconds
+        ):
+            return "max_seconds"
+        return None
+
+    def take(self, items: Iterable[T]) -> Iterator[T]:
+        """
+        Yields items, in order, while there is budget left.
+
+        Args:
+            items (Iterable[T]): The work items, e.g. a priority ordered queue.
+
+        Yields:
+            T: The next item to run.
+        """
+        iterator = iter(items)
+        for item in iterator:
+            if self.exhausted_by() is not None:
+                self.remaining.extend([item, *iterator])
+                return
+            self.dispatched += 1
+            yield item
+
+    def admit(self, item: T) -> bool:
+        """
+        Re-checks the time and request budgets right before a handed-out item starts.
+
+        Args:
+            item (T): An item handed out by take().
+
+        Returns:
+            bool: True if the item may start, False if the budget ran out while it
+                was queued - it is then kept in `remaining`.
+        """
+        if self._spent() is None:
+            return True
+        self.dispatched -= 1
+        self.remaining.append(item)
+        return False
@@ -0,0 +1,249 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from src.config import TASK_JOURNAL_PATH
+
+# Bump when the table layout changes - the journal is rebuilt (old runs are dropped)
+SCHEMA_VERSION = 1
+
+# Task states, in the order a task moves through them
+PLANNED = "planned"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+Task = Tuple[Union[int, str], int]  # (event_id, year)
+
+
+class JournalRun(NamedTuple):
+    run_id: int
+    scraper: str  # e.g. "event_matches"
+    started: float  # Unix timestamp
+    finished: Optional[float]  # None while running, or if the run crashed
+
+
+class JournalSummary(NamedTuple):
+    planned: int  # Not started yet
+    in_flight: int  # Started, no outcome recorded (running, or lost in a crash)
+    done: int
+    failed: int
+    errors: Dict[str, int]  # Failed tasks per error class
+
+
+class TaskJournal:
+    """
+    SQLite write-ahead journal of the (event_id, year) tasks of scrape runs.
+
+    A run records its whole plan before the first request, every task is
+    marked in flight before it is sent and done / failed (with the error
+    class) once it completes, each in its own small transaction. After a
+    crash the planned and in-flight tasks of the unfinished run are exactly
+    the work left (see pending), and the failed tasks of any run can be
+    re-planned as a new run (see failed).
+    """
+
+    def __init__(self, db_path: Path = TASK_JOURNAL_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS tasks")
+            self._conn.execute("DROP TABLE IF EXISTS runs")
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scraper TEXT NOT NULL,
+                started REAL NOT NULL,
+                finished REAL
+            )
+            """)
+        # event_id has no type so ids keep the type they were planned with
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                run_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                event_id NOT NULL,
+                year INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated REAL NOT NULL,
+                PRIMARY KEY (run_id, event_id, year)
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (run_id, status)"
+        )
+
+    def start_run(self, scraper: str, tasks: Sequence[Task]) -> int:
+        """
+        Records a new run and its planned tasks in one transaction.
+
+        Args:
+            scraper (str): The scraper the run belongs to, e.g. "event_matches".
+            tasks (Sequence[Task]): The planned (event_id, year) tasks, in queue order.
+
+        Returns:
+            int: The run id.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            run_id = self._conn.execute(
+                "INSERT INTO runs (scraper, started) VALUES (?, ?)", (scraper, now)
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks "
+                "(run_id, position, event_id, year, status, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, position, event_id, year, PLANNED, now)
+                    for position, (event_id, year) in enumerate(tasks)
+                ],
+            )
+            self._conn.execute("COMMIT")
+        return run_id
+
+    def finish_run(self, run_id: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET finished = ? WHERE run_id = ?", (time.time(), run_id)
+            )
+
+    def latest_run(
+        self, scraper: str, unfinished: bool = False
+    ) -> Optional[JournalRun]:
+        """
+        Returns the most recent run of a scraper.
+
+        Args:
+            scraper (str): The scraper, e.g. "event_matches".
+            unfinished (bool): Only return the run if it never finished (crashed /
+                interrupted). An older unfinished run is never returned, a later
+                run that finished has superseded its tasks.
+
+        Returns:
+            Optional[JournalRun]: The run, None if there is none.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id, scraper, started, finished FROM runs "
+                "WHERE scraper = ? ORDER BY run_id DESC LIMIT 1",
+                (scraper,),
+            ).fetchone()
+        if row is None:
+            return None
+        run = JournalRun(*row)
+        if unfinished and run.finished is not None:
+            return None
+        return run
+
+    def _set_status(
+        self, run_id: int, task: Task, status: str, error: Optional[str] = None
+    ) -> None:
+        event_id, year = task
+        started = 1 if status == IN_FLIGHT else 0
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, attempts = attempts + ?, "
+                "updated = ? WHERE run_id = ? AND event_id = ? AND year = ?",
+                (status, error, started, time.time(), run_id, event_id, year),
+            )
+
+    def mark_in_flight(self, run_id: int, task: Task) -> None:
+        # written before the request is sent, so a crash leaves it in flight
+        self._set_status(run_id, task, IN_FLIGHT)
+
+    def mark_done(self, run_id: int, task: Task) -> None:
+        self._set_status(run_id, task, DONE)
+
+    def mark_failed(self, run_id: int, task: Task, error: str) -> None:
+        """
+        Records a failed task with its error class, e.g. "ReadTimeout" or "HTTPStatusError".
+        """
+        self._set_status(run_id, task, FAILED, error)
+
+    def _tasks(
+        self,
+        run_id: int,
+        statuses: Iterable[str],
+        errors: Optional[List[str]] = None,
+    ) -> List[Task]:
+        statuses = list(statuses)
+        query = (
+            "SELECT event_id, year FROM tasks WHERE run_id = ? "
+            f"AND status IN ({', '.join('?' * len(statuses))})"
+        )
+        params: list = [run_id, *statuses]
+        if errors:
+            query += f" AND error IN ({', '.join('?' * len(errors))})"
+            params += list(errors)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY position", params).fetchall()
+        return [(event_id, year) for event_id, year in rows]
+
+    def pending(self, run_id: int) -> List[Task]:
+        """
+        Returns the tasks of a run without an outcome - planned, or in flight
+        when the run stopped - in their original queue order.
+        """
+        return self._tasks(run_id, (PLANNED, IN_FLIGHT))
+
+    def failed(self, run_id: int, errors: Optional[Iterable[str]] = None) -> List[Task]:
+        """
+        Returns the failed tasks of a run, optionally only those of some error classes.
+
+        Args:
+            run_id (int): The run.
+            errors (Optional[Iterable[str]]): Error class names to keep, None keeps all.
+
+        Returns:
+            List[Task]: The failed (event_id, year) tasks, in queue order.
+        """
+        return self._tasks(run_id, (FAILED,), list(errors) if errors else None)
+
+    def summary(self, run_id: int) -> JournalSummary:
+        """
+        Returns the number of tasks of a run per state, and the failures per error class.
+        """
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM tasks WHERE run_id = ? GROUP BY status",
+                    (run_id,),
+                ).fetchall()
+            )
+            errors = dict(
+                self._conn.execute(
+                    "SELECT error, COUNT(*) FROM tasks WHERE run_id = ? AND status = ? "
+                    "GROUP BY error ORDER BY COUNT(*) DESC",
+                    (run_id, FAILED),
+                ).fetchall()
+            )
+        return JournalSummary(
+            planned=counts.get(PLANNED, 0),
+            in_flight=counts.get(IN_FLIGHT, 0),
+            done=counts.get(DONE, 0),
+            failed=counts.get(FAILED, 0),
+            errors=errors,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "TaskJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
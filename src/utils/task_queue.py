@@ -0,0 +1,145 @@
+import asyncio
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Sentinel telling a worker that the producer is done
+_STOP = object()
+
+
+async def run_worker_pool(
+    items: Iterable[T],
+    handler: Callable[[T], Awaitable[R]],
+    num_workers: int,
+    on_result: Optional[Callable[[T, R], None]] = None,
+    queue_size: Optional[int] = None,
+) -> int:
+    """
+    Runs `handler` over `items` with a fixed number of async workers.
+
+    Items are fed through a bounded asyncio.Queue, so the producer blocks
+    (backpressure) instead of creating one pending coroutine per item. Memory
+    and file handle use stay flat however many items there are. Each result is
+    passed to `on_result` as soon as it completes.
+
+    Args:
+        items (Iterable[T]): The work items, consumed lazily.
+        handler (Callable[[T], Awaitable[R]]): Coroutine function processing one item.
+        num_workers (int): Number of concurrent workers.
+        on_result (Optional[Callable[[T, R], None]]): Called with (item, result) per completed item.
+        queue_size (Optional[int]): Max queued items, defaults to twice the number of workers.
+
+    Returns:
+        int: The number of items processed.
+    """
+    num_workers = max(1, num_workers)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or num_workers * 2)
+    processed = 0
+
+    async def producer() -> None:
+        for item in items:
+            await queue.put(item)
+        for _ in range(num_workers):
+            await queue.put(_STOP)
+
+    async def worker() -> None:
+        nonlocal processed
+        while True:
+            item = await queue.get()
+            if item is _STOP:
+                return
+            result = await handler(item)
+            processed += 1
+            if on_result is not None:
+                on_result(item, result)
+
+    # a failing worker cancels the producer and the other workers
+    async with asyncio.TaskGroup() as task_group:
+        task_group.create_task(producer())
+        for _ in range(num_workers):
+            task_group.create_task(worker())
+
+    return processed
+
+
+# Passed to a stage handler to push an item to the next stage (waits while it is full)
+Emit = Callable[[Any], Awaitable[None]]
+
+
+class Stage(NamedTuple):
+    name: str
+    handler: Callable[[Any, Emit], Awaitable[None]]  # Processes one item, emits 0..n
+    num_workers: int  # Concurrency limit of this stage
+    queue_size: Optional[int] = None  # Max items waiting, defaults to twice the workers
+
+
+async def run_stages(items: Iterable[Any], stages: Sequence[Stage]) -> List[int]:
+    """
+    Runs items through a chain of stages connected by bounded queues.
+
+    Each stage has its own pool of workers. An item emitted by a stage is
+    picked up by the next stage straight away, so the first results reach the
+    last stage while earlier stages are still working. A full queue blocks the
+    emitting worker (backpressure), so a slow stage throttles the ones before
+    it instead of piling up items. A stage stops once every worker of the
+    stage before it has stopped and its queue is drained.
+
+    Args:
+        items (Iterable[Any]): The work items of the first stage, consumed lazily.
+        stages (Sequence[Stage]): The stages, in order. Items emitted by the
+            last stage are dropped.
+
+    Returns:
+        List[int]: The number of items processed by each stage.
+    """
+    queues = [
+        asyncio.Queue(maxsize=stage.queue_size or max(1, stage.num_workers) * 2)
+        for stage in stages
+    ]
+    processed = [0] * len(stages)
+
+    async def drop(item: Any) -> None:
+        return None
+
+    async def producer() -> None:
+        for item in items:
+            await queues[0].put(item)
+        await queues[0].put(_STOP)
+
+    async def worker(position: int, emit: Emit) -> None:
+        queue = queues[position]
+        while True:
+            item = await queue.get()
+            if item is _STOP:
+                # wake the next worker of this stage, it stops as well
+                await queue.put(_STOP)
+                return
+            await stages[position].handler(item, emit)
+            processed[position] += 1
+
+    async def run_stage(position: int, emit: Emit) -> None:
+        async with asyncio.TaskGroup() as stage_group:
+            for _ in range(max(1, stages[position].num_workers)):
+                stage_group.create_task(worker(position, emit))
+        if position + 1 < len(stages):
+            await queues[position + 1].put(_STOP)
+
+    # a failing worker cancels every stage
+    async with asyncio.TaskGroup() as task_group:
+        task_group.create_task(producer())
+        for position in range(len(stages)):
+            emit = queues[position + 1].put if position + 1 < len(stages) else drop
+            task_group.create_task(run_stage(position, emit))
+
+    return processed
@@ -0,0 +1,118 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Set
+
+from src.utils.io_handler import save_raw_json
+from src.utils.raw_catalog import FetchSource, RawCatalog
+
+
+class WriterStats(NamedTuple):
+    written: int  # Files saved successfully
+    failed: int  # Files that could not be saved
+    pending: int  # Writes submitted but not finished yet
+
+
+def save_outcome(future: asyncio.Future) -> Optional[str]:
+    """
+    Returns None if the write behind a future of WriteBehindWriter.submit
+    succeeded, else an error class name (e.g. to journal the task as failed).
+    """
+    if future.cancelled():
+        return "CancelledError"
+    if future.exception() is not None:
+        return type(future.exception()).__name__
+    return None if future.result() else "SaveError"
+
+
+class WriteBehindWriter:
+    """
+    Async write-behind stage for raw JSON payloads.
+
+    Collectors hand payloads to `submit` and carry on with the next request,
+    serialisation and the atomic write happen in a thread pool. At most
+    `max_pending` writes are outstanding, beyond that `submit` waits, which
+    keeps memory bounded if the disk falls behind the network.
+    Call `flush` (or leave the `async with` block) before reading the files back.
+    """
+
+    def __init__(self, max_pending: int = 64, max_workers: int = 4):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="raw-writer"
+        )
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending: Set[asyncio.Future] = set()
+        self._written = 0
+        self._failed = 0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # created lazily so the writer can be built outside of a running loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def submit(
+        self,
+        data: Any,
+        folder: Path,
+        filename: str,
+        catalog: Optional[RawCatalog] = None,
+        source: Optional[FetchSource] = None,
+    ) -> asyncio.Future:
+        """
+        Queues a payload to be saved with save_raw_json in the thread pool.
+
+        Args:
+            data (Any): The data to be saved as a raw JSON file.
+            folder (Path): The folder in which to save the file.
+            filename (str): The filename to use for the saved file.
+            catalog (Optional[RawCatalog]): If given, the file is recorded in the raw catalog.
+            source (Optional[FetchSource]): The HTTP response the data came from.
+
+        Returns:
+            asyncio.Future: Resolves to the result of save_raw_json once the file is written.
+        """
+        slots = self._get_slots()
+        await slots.acquire()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor,
+            partial(save_raw_json, data, folder, filename, catalog, source=source),
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: asyncio.Future) -> None:
+        self._pending.discard(future)
+        self._get_slots().release()
+        if not future.cancelled() and future.exception() is None and future.result():
+            self._written += 1
+        else:
+            self._failed += 1
+
+    async def flush(self) -> None:
+        """
+        Waits until every submitted write has finished.
+        """
+        while self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+            # gather over finished futures does not yield, give _on_done a chance to run
+            await asyncio.sleep(0)
+
+    async def close(self) -> None:
+        await self.flush()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> WriterStats:
+        return WriterStats(
+            written=self._written, failed=self._failed, pending=len(self._pending)
+        )
+
+    async def __aenter__(self) -> "WriteBehindWriter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
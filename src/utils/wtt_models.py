@@ -0,0 +1,230 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import msgspec
+
+# Typed views of the WTT payloads, decoded straight from the JSON bytes.
+# Only the fields the pipeline reads are declared, anything else in the
+# payload is skipped by the decoder (unknown fields are tolerated).
+# Field names follow the payload, ids are int or str depending on the route.
+# gc=False: the structs hold no reference cycles, so the garbage collector
+# does not need to track (and repeatedly scan) hundreds of thousands of them.
+
+Id = Union[int, str, None]
+
+
+class EventRow(msgspec.Struct, gc=False):
+    """
+    One row of the eventcalendar route.
+    """
+
+    EventId: Id = None
+    EventName: Optional[str] = None
+    StartDateTime: Optional[str] = None
+    EndDateTime: Optional[str] = None
+
+
+class EventsPage(msgspec.Struct, gc=False):
+    Count: Optional[int] = None
+    rows: List[EventRow] = []
+
+
+class Player(msgspec.Struct, gc=False):
+    playerId: Id = None
+    playerName: Optional[str] = None
+    playerOrgCode: Optional[str] = None
+    playerOrg: Optional[str] = None
+
+
+class Competitor(msgspec.Struct, gc=False):
+    competitorType: Optional[str] = None  # "H" (home) or "A" (away)
+    competitorId: Id = None
+    competitorName: Optional[str] = None
+    competitorOrg: Optional[str] = None
+    players: Optional[List[Player]] = None
+
+
+class MatchFields(msgspec.Struct, gc=False):
+    """
+    Fields of a GetOfficialResult match, either on the row or in its match_card.
+    """
+
+    documentCode: Optional[str] = None
+    eventId: Id = None
+    subEventName: Optional[str] = None
+    subEventDescription: Optional[str] = None
+    matchDateTime: Union[str, Dict[str, Any], None] = None
+    resultStatus: Optional[str] = None
+    overallScores: Optional[str] = None
+    resultOverallScores: Optional[str] = None
+    gameScores: Union[str, List[str], None] = None
+    resultGameScores: Union[str, List[str], None] = None
+    # "competitiors" (sic) is how WTT spells it
+    competitiors: Optional[List[Competitor]] = None
+    competitors: Optional[List[Competitor]] = None
+
+
+class MatchRecord(MatchFields):
+    """
+    One row of the GetOfficialResult route, optionally wrapping a match_card.
+    """
+
+    match_card: Optional[MatchFields] = None
+
+    @property
+    def card(self) -> MatchFields:
+        # the fields to read: the match_card if there is one, else the row itself
+        return self.match_card if self.match_card is not None else self
+
+
+_events_decoder = msgspec.json.Decoder(List[EventsPage])
+_matches_decoder = msgspec.json.Decoder(List[MatchRecord])
+_any_decoder = msgspec.json.Decoder()
+
+
+def _convert_each(data: Any, item_type: type) -> list:
+    # lenient fallback: keep every item that converts, drop the rest
+    if not isinstance(data, list):
+        return []
+    items = []
+    for item in data:
+        try:
+            items.append(msgspec.convert(item, item_type, strict=False))
+        except msgspec.ValidationError:
+            continue
+    return items
+
+
+def decode_event_rows(content: bytes) -> List[EventRow]:
+    """
+    Decodes an eventcalendar payload ([{"Count": n, "rows": [...]}]) into its rows.
+
+    Args:
+        content (bytes): The JSON bytes, e.g. response.content or a stored file.
+
+    Returns:
+        List[EventRow]: The rows of the first page, [] for an unexpected payload.
+
+    Raises:
+        msgspec.DecodeError: If the bytes are not valid JSON.
+    """
+    try:
+        pages = _events_decoder.decode(content)
+    except msgspec.ValidationError:
+        pages = _convert_each(_any_decoder.decode(content), EventsPage)
+    return pages[0].rows if pages else []
+
+
+def decode_match_records(content: bytes) -> List[MatchRecord]:
+    """
+    Decodes a GetOfficialResult payload into match records.
+
+    Rows that do not fit the schema (e.g. a string instead of an object) are
+    dropped, a payload that is not a list gives no records.
+
+    Args:
+        content (bytes): The JSON bytes, e.g. response.content or a stored file.
+
+    Returns:
+        List[MatchRecord]: One record per match row.
+
+    Raises:
+        msgspec.DecodeError: If the bytes are not valid JSON.
+    """
+    try:
+        return _matches_decoder.decode(content)
+    except msgspec.ValidationError:
+        return _convert_each(_any_decoder.decode(content), MatchRecord)
+
+
+def to_match_records(data: Any) -> List[MatchRecord]:
+    """
+    Converts an already decoded payload (lists / dicts) into match records.
+    """
+    return _convert_each(data, MatchRecord)
+
+
+class _RowsPage(msgspec.Struct, gc=False):
+    # the first element of an events payload, rows kept as undecoded spans
+    rows: Union[List[msgspec.Raw], None, msgspec.UnsetType] = msgspec.UNSET
+
+
+_raw_list_decoder = msgspec.json.Decoder(List[msgspec.Raw])
+_rows_page_decoder = msgspec.json.Decoder(_RowsPage)
+
+
+def count_payload_rows(content: bytes) -> int:
+    """
+    Counts the rows of a raw WTT payload without building its object tree.
+
+    Same result as raw_catalog.count_rows on the decoded payload: the "rows"
+    of an events payload ([{"rows": [...]}]) or the length of a flat event
+    matches list, 0 for anything else. Rows are only scanned for their
+    boundaries (msgspec.Raw spans), none of their fields are decoded.
+
+    Args:
+        content (bytes): The JSON bytes of the payload.
+
+    Returns:
+        int: The number of rows.
+
+    Raises:
+        msgspec.DecodeError: If the bytes are not valid JSON.
+    """
+    try:
+        items = _raw_list_decoder.decode(content)
+    except msgspec.ValidationError:
+        return 0
+    if not items:
+        return 0
+    try:
+        first = _rows_page_decoder.decode(items[0])
+    except msgspec.ValidationError:
+        # not an object, or "rows" is not a list - a flat list of rows
+        return len(items)
+    if first.rows is msgspec.UNSET:
+        return len(items)
+    return len(first.rows or [])
+
+
+class _CardKey(msgspec.Struct, gc=False):
+    documentCode: Optional[str] = None
+
+
+class _MatchKey(msgspec.Struct, gc=False):
+    # only the fields identifying a match, everything else is skipped
+    documentCode: Optional[str] = None
+    match_card: Optional[_CardKey] = None
+
+
+_match_key_decoder = msgspec.json.Decoder(_MatchKey)
+
+
+def split_match_rows(content: bytes) -> List[Tuple[str, bytes]]:
+    """
+    Splits an event matches payload into (match key, row bytes) pairs.
+
+    The key is the documentCode of the match (of its match_card first, like
+    get_match_detail_tasks), or "#<position>" for a row without one. Only
+    the keys are decoded, each row is returned as its undecoded JSON span so
+    it can be hashed and compared with an earlier version of the payload.
+
+    Args:
+        content (bytes): The JSON bytes of a GetOfficialResult payload.
+
+    Returns:
+        List[Tuple[str, bytes]]: One pair per row, in payload order.
+
+    Raises:
+        msgspec.DecodeError: If the bytes are not a valid JSON list.
+    """
+    rows = []
+    for position, raw in enumerate(_raw_list_decoder.decode(content)):
+        try:
+            key = _match_key_decoder.decode(raw)
+            document_code = (
+                key.match_card.documentCode if key.match_card is not None else None
+            ) or key.documentCode
+        except msgspec.ValidationError:
+            document_code = None
+        rows.append((document_code or f"#{position}", bytes(raw)))
+    return rows
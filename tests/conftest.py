@@ -2,6 +2,7 @@ import pytest
 import respx
 from pathlib import Path
 from src.utils.api_client import TTStatsClient
+from src.utils.retry_policy import RetryPolicy
 
 
 @pytest.fixture
@@ -24,8 +25,12 @@ def events_by_year_fixtures_dir(fixtures_dir):
 def stats_client():
     """
     Returns a TTStatsClient instance.
+    Retries are kept but without backoff so retryable status tests stay fast.
     """
-    return TTStatsClient(max_pause_duration=0.01)
+    return TTStatsClient(
+        max_pause_duration=0.01,
+        retry_policy=RetryPolicy(base_delay=0.0, max_delay=0.0),
+    )
 
 
 @pytest.fixture
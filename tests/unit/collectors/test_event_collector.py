@@ -3,9 +3,16 @@ import respx
 import httpx
 import asyncio
 import json
+import time
 from pathlib import Path
-from src.collectors.event_collector import process_year, get_years_to_scrape
+from src.collectors import event_collector
+from src.collectors.event_collector import (
+    get_years_to_scrape,
+    process_year,
+    run_event_scraper,
+)
 from src.utils.api_client import TTStatsClient
+from src.utils.raw_catalog import RawCatalog
 
 
 @pytest.mark.parametrize(
@@ -159,3 +166,115 @@ async def test_process_year_handles_bad_response(
     assert added == 0
     excepted_file = tmp_path / f"events_{year}.json"
     assert not excepted_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_process_year_skips_unchanged_payload(
+    stats_client: TTStatsClient,
+    wtt_api_mock: respx.MockRouter,
+    tmp_path: Path,
+):
+    """
+    Tests that re-fetching an identical payload neither rewrites the file
+    nor moves its changed_at, and that the stored ETag is sent on the next request.
+
+    Asserts:
+        The second fetch returns the stored count with 0 added, the file is untouched,
+        the request carries If-None-Match, and the catalog counts it as a no-op.
+    """
+    year = 2024
+    payload = [{"Count": 2, "rows": [{"EventId": 1}, {"EventId": 2}]}]
+    route = wtt_api_mock.post(url__regex=r".*/api/.*").mock(
+        return_value=httpx.Response(200, json=payload, headers={"ETag": '"v1"'})
+    )
+
+    with RawCatalog(tmp_path / "catalog.sqlite") as catalog:
+        async with httpx.AsyncClient() as http_client:
+            first = await process_year(
+                stats_client, http_client, year, output_dir=tmp_path, catalog=catalog
+            )
+            saved_file = tmp_path / f"events_{year}.json"
+            mtime_ns = saved_file.stat().st_mtime_ns
+            changed_at = catalog.get(saved_file).changed_at
+            second_run = time.time()
+
+            second = await process_year(
+                stats_client, http_client, year, output_dir=tmp_path, catalog=catalog
+            )
+
+        assert first == (2, 2)
+        assert second == (2, 0)
+        assert saved_file.stat().st_mtime_ns == mtime_ns
+        assert catalog.get(saved_file).changed_at == changed_at
+        assert route.calls.last.request.headers["If-None-Match"] == '"v1"'
+        assert catalog.fetch_summary(since=second_run) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_process_year_not_modified(
+    stats_client: TTStatsClient,
+    wtt_api_mock: respx.MockRouter,
+    tmp_path: Path,
+):
+    """
+    Tests that a 304 Not Modified keeps the stored file instead of being treated as an error.
+
+    Asserts:
+        The stored count is returned with 0 added and the file still holds the first payload.
+    """
+    year = 2024
+    payload = [{"Count": 1, "rows": [{"EventId": 1}]}]
+    wtt_api_mock.post(url__regex=r".*/api/.*").mock(
+        side_effect=[
+            httpx.Response(200, json=payload, headers={"ETag": '"v1"'}),
+            httpx.Response(304),
+        ]
+    )
+
+    with RawCatalog(tmp_path / "catalog.sqlite") as catalog:
+        async with httpx.AsyncClient() as http_client:
+            await process_year(
+                stats_client, http_client, year, output_dir=tmp_path, catalog=catalog
+            )
+            count, added = await process_year(
+                stats_client, http_client, year, output_dir=tmp_path, catalog=catalog
+            )
+
+    assert (count, added) == (1, 0)
+    with (tmp_path / f"events_{year}.json").open("r", encoding="utf-8") as f:
+        assert json.load(f) == payload
+
+
+@pytest.mark.asyncio
+async def test_run_event_scraper_closes_its_own_client(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Tests that a client created by the scraper is closed with the response cache off.
+
+    Asserts:
+        The client's shared AsyncClient is closed once the run is done.
+    """
+    monkeypatch.setattr(event_collector, "open_response_cache", lambda: None)
+    opened = []
+    original = TTStatsClient.http_client
+
+    def tracking_http_client(self, transport=None) -> httpx.AsyncClient:
+        client = original(self, transport)
+        opened.append(client)
+        return client
+
+    monkeypatch.setattr(TTStatsClient, "http_client", tracking_http_client)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=[{"Count": 0, "rows": []}])
+
+    with RawCatalog(tmp_path / "catalog.sqlite") as catalog:
+        await run_event_scraper(
+            [2024],
+            output_dir=tmp_path,
+            catalog=catalog,
+            transport=httpx.MockTransport(handler),
+        )
+
+    assert opened and all(client.is_closed for client in opened)
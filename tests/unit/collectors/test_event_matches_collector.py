@@ -0,0 +1,384 @@
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.collectors.event_matches_collector import (
+    get_event_tasks,
+    run_event_matches_scraper,
+)
+from src.utils.api_client import TTStatsClient
+from src.utils.io_handler import save_raw_json
+from src.utils.raw_catalog import RawCatalog
+from src.utils.task_journal import TaskJournal
+
+
+def make_event(event_id: int, name: str, start: datetime, end: datetime) -> dict:
+    """
+    Returns one row of an events payload.
+    """
+    return {
+        "EventId": event_id,
+        "EventName": name,
+        "StartDateTime": start.strftime("%Y-%m-%dT%H:%M:%S"),
+        "EndDateTime": end.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def test_get_event_tasks_collapses_year_boundary_duplicates(tmp_path: Path):
+    """
+    Tests that an event listed in two year files is queued once, under its start year.
+
+    Asserts:
+        The queue holds one task per EventId and the summary counts the collapsed duplicate.
+    """
+    events_dir = tmp_path / "events"
+    matches_dir = tmp_path / "event_matches"
+    now = datetime.now()
+    start = now - timedelta(days=2)
+    boundary = make_event(7, "WTT Finals", start, now + timedelta(days=3))
+    single = make_event(8, "WTT Contender", start, now + timedelta(days=1))
+    youth = make_event(9, "WTT Youth Star", start, now + timedelta(days=1))
+
+    save_raw_json(
+        [{"rows": [boundary, single, youth]}], events_dir, f"events_{start.year}.json"
+    )
+    save_raw_json([{"rows": [boundary]}], events_dir, f"events_{start.year + 1}.json")
+
+    analysis = get_event_tasks(events_dir, matches_dir, now.year, now)
+
+    assert analysis.queue == [(7, start.year), (8, start.year)]
+    assert analysis.total_found == 4
+    assert analysis.total_duplicates == 1
+    assert analysis.total_senior == 2
+    assert analysis.total_skipped == 1
+
+
+def test_get_event_tasks_orders_queue_by_priority(tmp_path: Path):
+    """
+    Tests that ongoing events come first, then recently completed, then historical.
+
+    Asserts:
+        The queue is in priority order, latest events first within a priority.
+    """
+    events_dir = tmp_path / "events"
+    now = datetime.now()
+    events = {
+        1: now - timedelta(days=400),  # historical
+        2: now - timedelta(days=10),  # recently completed
+        3: now + timedelta(days=2),  # ongoing
+        4: now - timedelta(days=20),  # recently completed, older
+    }
+    by_year = {}
+    for event_id, end in events.items():
+        start = end - timedelta(days=5)
+        by_year.setdefault(start.year, []).append(
+            make_event(event_id, "WTT Contender", start, end)
+        )
+    for year, rows in by_year.items():
+        save_raw_json([{"rows": rows}], events_dir, f"events_{year}.json")
+
+    analysis = get_event_tasks(
+        events_dir, tmp_path / "event_matches", now.year, now + timedelta(days=1)
+    )
+
+    assert [event_id for event_id, _ in analysis.queue] == [3, 2, 4, 1]
+    assert analysis.by_priority == {
+        "ongoing": 1,
+        "recently completed": 2,
+        "historical": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_run_event_matches_scraper_with_transport(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that the scraper can run end to end against an injected transport
+    with its own directories and catalog, e.g. a local fake WTT server.
+
+    Asserts:
+        Every pending event is fetched once and saved in its year directory.
+    """
+    events_dir = tmp_path / "events"
+    matches_dir = tmp_path / "event_matches"
+    now = datetime.now()
+    start = now - timedelta(days=20)
+    events = [
+        make_event(event_id, "WTT Contender", start, start + timedelta(days=5))
+        for event_id in (11, 12)
+    ]
+    save_raw_json([{"rows": events}], events_dir, f"events_{start.year}.json")
+
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.params["EventId"])
+        return httpx.Response(200, json=[{"matchId": 1}, {"matchId": 2}])
+
+    with (
+        RawCatalog(tmp_path / "catalog.sqlite") as catalog,
+        TaskJournal(tmp_path / "journal.sqlite") as journal,
+    ):
+        await run_event_matches_scraper(
+            num_workers=2,
+            events_dir=events_dir,
+            output_dir=matches_dir,
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            journal=journal,
+        )
+
+    assert sorted(requested) == ["11", "12"]
+    for event_id in (11, 12):
+        saved = matches_dir / str(start.year) / f"event_matches_{event_id}.json"
+        assert json.loads(saved.read_text(encoding="utf-8")) == [
+            {"matchId": 1},
+            {"matchId": 2},
+        ]
+
+
+def save_ongoing_events(events_dir: Path, event_ids) -> int:
+    """
+    Saves an events file with ongoing senior events and returns its year.
+    """
+    start = datetime.now() - timedelta(days=2)
+    events = [
+        make_event(event_id, "WTT Contender", start, start + timedelta(days=5))
+        for event_id in event_ids
+    ]
+    save_raw_json([{"rows": events}], events_dir, f"events_{start.year}.json")
+    return start.year
+
+
+@pytest.mark.asyncio
+async def test_resume_runs_only_unfinished_tasks(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that --resume continues an interrupted run without re-planning.
+
+    Asserts:
+        Only the planned and in-flight tasks of the crashed run are fetched,
+        and the run is marked finished.
+    """
+    events_dir = tmp_path / "events"
+    year = save_ongoing_events(events_dir, (11, 12, 13))
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.params["EventId"])
+        return httpx.Response(200, json=[{"matchId": 1}])
+
+    with (
+        RawCatalog(tmp_path / "catalog.sqlite") as catalog,
+        TaskJournal(tmp_path / "journal.sqlite") as journal,
+    ):
+        # a run that died with 11 done and 12 in flight
+        run_id = journal.start_run(
+            "event_matches", [(11, year), (12, year), (13, year)]
+        )
+        journal.mark_in_flight(run_id, (11, year))
+        journal.mark_done(run_id, (11, year))
+        journal.mark_in_flight(run_id, (12, year))
+
+        await run_event_matches_scraper(
+            num_workers=2,
+            events_dir=events_dir,
+            output_dir=tmp_path / "event_matches",
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            journal=journal,
+            resume=True,
+        )
+
+        assert sorted(requested) == ["12", "13"]
+        assert journal.summary(run_id).done == 3
+        assert journal.latest_run("event_matches", unfinished=True) is None
+
+
+@pytest.mark.asyncio
+async def test_resume_after_completed_run_plans_new_run(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that --resume ignores a crashed run that a later completed run superseded.
+
+    Asserts:
+        The stale pending tasks of the crashed run are not fetched, a new run
+        is planned from the events instead.
+    """
+    events_dir = tmp_path / "events"
+    year = save_ongoing_events(events_dir, (11,))
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.params["EventId"])
+        return httpx.Response(200, json=[{"matchId": 1}])
+
+    with (
+        RawCatalog(tmp_path / "catalog.sqlite") as catalog,
+        TaskJournal(tmp_path / "journal.sqlite") as journal,
+    ):
+        kwargs = dict(
+            num_workers=2,
+            events_dir=events_dir,
+            output_dir=tmp_path / "event_matches",
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            journal=journal,
+        )
+        # run 1 crashed with a task that is no longer listed
+        crashed = journal.start_run("event_matches", [(99, year), (11, year)])
+        journal.mark_in_flight(crashed, (99, year))
+        # run 2 completed
+        await run_event_matches_scraper(**kwargs)
+        requested.clear()
+
+        await run_event_matches_scraper(**kwargs, resume=True)
+
+        assert "99" not in requested
+        assert journal.latest_run("event_matches").run_id > crashed + 1
+        assert journal.summary(crashed).in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_failed_targets_error_class(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that failures are journaled with their error class and can be retried alone.
+
+    Asserts:
+        The retry run only fetches the failed event.
+    """
+    events_dir = tmp_path / "events"
+    save_ongoing_events(events_dir, (11, 12))
+    requested = []
+    failing = {"12"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        event_id = request.url.params["EventId"]
+        requested.append(event_id)
+        if event_id in failing:
+            return httpx.Response(500)
+        return httpx.Response(200, json=[{"matchId": 1}])
+
+    with (
+        RawCatalog(tmp_path / "catalog.sqlite") as catalog,
+        TaskJournal(tmp_path / "journal.sqlite") as journal,
+    ):
+        kwargs = dict(
+            num_workers=2,
+            events_dir=events_dir,
+            output_dir=tmp_path / "event_matches",
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            journal=journal,
+        )
+        await run_event_matches_scraper(**kwargs)
+        first = journal.latest_run("event_matches")
+        assert journal.summary(first.run_id).errors == {"HTTPStatusError": 1}
+
+        requested.clear()
+        failing.clear()
+        await run_event_matches_scraper(
+            **kwargs, retry_failed=True, retry_errors=["HTTPStatusError"]
+        )
+        retry = journal.latest_run("event_matches")
+
+        assert requested == ["12"]
+        assert retry.run_id != first.run_id
+        assert journal.summary(retry.run_id).done == 1
+
+
+@pytest.mark.asyncio
+async def test_task_budget_stops_run_for_resume(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that a run stops cleanly once its task budget is spent.
+
+    Asserts:
+        Only max_tasks events are fetched, the rest stays planned in the
+        unfinished journal run and a resume fetches exactly those.
+    """
+    events_dir = tmp_path / "events"
+    save_ongoing_events(events_dir, (11, 12, 13))
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.params["EventId"])
+        return httpx.Response(200, json=[{"matchId": 1}])
+
+    with (
+        RawCatalog(tmp_path / "catalog.sqlite") as catalog,
+        TaskJournal(tmp_path / "journal.sqlite") as journal,
+    ):
+        kwargs = dict(
+            num_workers=2,
+            events_dir=events_dir,
+            output_dir=tmp_path / "event_matches",
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            journal=journal,
+        )
+        await run_event_matches_scraper(**kwargs, max_tasks=2)
+        first = list(requested)
+        run = journal.latest_run("event_matches", unfinished=True)
+        assert len(first) == 2
+        assert run is not None and journal.summary(run.run_id).planned == 1
+
+        await run_event_matches_scraper(**kwargs, resume=True)
+
+    assert sorted(requested) == ["11", "12", "13"]
+
+
+@pytest.mark.asyncio
+async def test_request_budget_counts_retries(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that max_requests counts the HTTP requests sent, retries included.
+
+    Asserts:
+        A retried event uses up the budget of two requests, the other events
+        stay planned for --resume.
+    """
+    events_dir = tmp_path / "events"
+    save_ongoing_events(events_dir, (11, 12, 13))
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.params["EventId"])
+        if len(requested) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json=[{"matchId": 1}])
+
+    with (
+        RawCatalog(tmp_path / "catalog.sqlite") as catalog,
+        TaskJournal(tmp_path / "journal.sqlite") as journal,
+    ):
+        await run_event_matches_scraper(
+            num_workers=1,
+            events_dir=events_dir,
+            output_dir=tmp_path / "event_matches",
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            journal=journal,
+            max_requests=2,
+        )
+        run = journal.latest_run("event_matches", unfinished=True)
+
+        assert len(requested) == 2 and len(set(requested)) == 1
+        assert stats_client.requests_sent == 2
+        assert run is not None and journal.summary(run.run_id).planned == 2
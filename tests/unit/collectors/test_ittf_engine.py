@@ -0,0 +1,142 @@
+import threading
+
+import httpx
+import pytest
+
+from src.collectors.ittf_engine import ITTFRequest, run_ittf_engine
+from src.utils.api_client import TTStatsClient
+
+
+def make_client(handler) -> TTStatsClient:
+    return TTStatsClient(
+        max_pause_duration=0.0, ittf_transport=httpx.MockTransport(handler)
+    )
+
+
+def test_engine_fetches_and_parses_every_request():
+    """
+    Tests that every page is fetched and parsed off the request threads.
+
+    Asserts:
+        One result per request, parsed on a parse thread, never on a fetch thread.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=f"<h1>{request.url.params['id']}</h1>")
+
+    parse_threads = set()
+
+    def parse(request: ITTFRequest, html: str) -> str:
+        parse_threads.add(threading.current_thread().name)
+        return html.removeprefix("<h1>").removesuffix("</h1>")
+
+    requests = (
+        ITTFRequest(key=i, url="https://results.ittf.link/", params={"id": i})
+        for i in range(20)
+    )
+    results = list(
+        run_ittf_engine(
+            requests,
+            parse,
+            stats_client=make_client(handler),
+            fetch_workers=4,
+            parse_workers=2,
+        )
+    )
+
+    assert sorted(result.request.key for result in results) == list(range(20))
+    assert all(result.error is None for result in results)
+    assert all(result.value == str(result.request.key) for result in results)
+    assert all(name.startswith("ittf-parse") for name in parse_threads)
+
+
+def test_engine_yields_errors_and_keeps_going():
+    """
+    Tests that a failed fetch or parse is reported instead of stopping the engine.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["id"] == "1":
+            return httpx.Response(500)
+        return httpx.Response(200, text=request.url.params["id"])
+
+    def parse(request: ITTFRequest, html: str) -> int:
+        if html == "2":
+            raise ValueError("unexpected page")
+        return int(html)
+
+    requests = [
+        ITTFRequest(key=i, url="https://results.ittf.link/", params={"id": i})
+        for i in range(4)
+    ]
+    results = {
+        result.request.key: result
+        for result in run_ittf_engine(
+            requests, parse, stats_client=make_client(handler), fetch_workers=2
+        )
+    }
+
+    assert isinstance(results[1].error, httpx.HTTPStatusError)
+    assert isinstance(results[2].error, ValueError)
+    assert results[0].value == 0 and results[3].value == 3
+
+
+def test_engine_reuses_one_client_per_fetch_thread():
+    """
+    Tests that the fetch threads keep their client between requests.
+
+    Asserts:
+        No more clients are opened than there are fetch workers. The engine
+        leaves a given client open, its owner closes the thread clients.
+    """
+    stats_client = make_client(lambda request: httpx.Response(200, text="ok"))
+    opened = []
+    original = stats_client._ittf_client
+
+    def tracking_client() -> httpx.Client:
+        client = original()
+        if client not in opened:
+            opened.append(client)
+        return client
+
+    stats_client._ittf_client = tracking_client
+    requests = [ITTFRequest(key=i, url="https://results.ittf.link/") for i in range(30)]
+    results = list(
+        run_ittf_engine(
+            requests,
+            lambda request, html: html,
+            stats_client=stats_client,
+            fetch_workers=3,
+        )
+    )
+
+    assert len(results) == 30
+    assert 1 <= len(opened) <= 3
+    assert not any(client.is_closed for client in opened)
+    stats_client.close()
+    assert all(client.is_closed for client in opened)
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 5])
+def test_engine_bounds_requests_in_flight(max_in_flight: int):
+    """
+    Tests that no more than max_in_flight requests are pulled ahead of the results.
+    """
+    pulled = 0
+
+    def requests():
+        nonlocal pulled
+        for i in range(10):
+            pulled += 1
+            yield ITTFRequest(key=i, url="https://results.ittf.link/")
+
+    engine = run_ittf_engine(
+        requests(),
+        lambda request, html: html,
+        stats_client=make_client(lambda request: httpx.Response(200, text="ok")),
+        fetch_workers=2,
+        max_in_flight=max_in_flight,
+    )
+    next(engine)
+    assert pulled <= max_in_flight + 1
+    engine.close()
@@ -0,0 +1,189 @@
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.collectors.live_poller import (
+    diff_match_rows,
+    next_poll_interval,
+    row_digest,
+    run_live_poller,
+)
+from src.utils.api_client import TTStatsClient
+from src.utils.event_index import EventRecord
+from src.utils.io_handler import load_raw_json, save_raw_json
+from src.utils.raw_catalog import RawCatalog
+from src.utils.wtt_models import split_match_rows
+
+
+def make_match(document_code: str, score: str) -> dict:
+    return {"documentCode": document_code, "overallScores": score}
+
+
+def test_row_digest_ignores_formatting():
+    """
+    Tests that a stored (indented) and a fresh (compact) copy of a row hash the same.
+    """
+    row = {"documentCode": "M1", "overallScores": "3-1", "gameScores": ["11-9"]}
+    indented = json.dumps(row, indent=4).encode()
+    compact = json.dumps(dict(reversed(row.items())), separators=(",", ":")).encode()
+
+    assert row_digest(indented) == row_digest(compact)
+    assert row_digest(compact) != row_digest(json.dumps({**row, "x": 1}).encode())
+
+
+def test_diff_match_rows_reports_new_and_changed():
+    before = json.dumps([make_match("M1", "1-0"), make_match("M2", "0-0")]).encode()
+    after = json.dumps(
+        [make_match("M1", "1-0"), make_match("M2", "1-0"), make_match("M3", "")]
+    ).encode()
+
+    digests, changes = diff_match_rows({}, split_match_rows(before))
+    assert [(key, change) for key, change, _ in changes] == [
+        ("M1", "new"),
+        ("M2", "new"),
+    ]
+
+    _, changes = diff_match_rows(digests, split_match_rows(after))
+    assert [(key, change) for key, change, _ in changes] == [
+        ("M2", "changed"),
+        ("M3", "new"),
+    ]
+
+
+def test_next_poll_interval_adapts():
+    """
+    Tests that idle polls back off up to the maximum and a change resets the interval.
+    """
+    assert next_poll_interval(10, False, 10, 60, 2.0) == 20
+    assert next_poll_interval(40, False, 10, 60, 2.0) == 60
+    assert next_poll_interval(60, True, 10, 60, 2.0) == 10
+
+
+@pytest.mark.asyncio
+async def test_live_poller_emits_only_changes(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests a polling session against a payload that changes between polls.
+
+    Asserts:
+        Matches unchanged since the stored copy are not reported, only new or
+        changed matches are logged and emitted, and the file is rewritten once
+        with the latest payload.
+    """
+    now = datetime.now()
+    event = EventRecord(
+        event_id=42,
+        name="WTT Contender",
+        year=now.year,
+        start=now - timedelta(days=1),
+        end=now + timedelta(days=3),
+        is_senior=True,
+    )
+    matches_dir = tmp_path / "event_matches"
+    deltas_dir = tmp_path / "live_deltas"
+    # stored copy from the last scraper run
+    save_raw_json(
+        [make_match("M1", "3-0")], matches_dir / str(now.year), "event_matches_42.json"
+    )
+
+    responses = [
+        [make_match("M1", "3-0")],  # same as the stored copy
+        [make_match("M1", "3-0"), make_match("M2", "1-0")],  # M2 starts
+        [make_match("M1", "3-0"), make_match("M2", "1-0")],  # idle
+        [make_match("M1", "3-0"), make_match("M2", "3-2")],  # M2 finishes
+    ]
+    served = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = responses[min(len(served), len(responses) - 1)]
+        served.append(request.url.params["EventId"])
+        return httpx.Response(200, json=payload)
+
+    emitted = []
+    with RawCatalog(tmp_path / "catalog.sqlite") as catalog:
+        summary = await run_live_poller(
+            events=[event],
+            event_matches_dir=matches_dir,
+            deltas_dir=deltas_dir,
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            min_interval=0.0,
+            max_interval=0.0,
+            max_polls=4,
+            on_delta=emitted.append,
+        )
+
+    assert served == ["42"] * 4
+    assert [(d.document_code, d.change) for d in emitted] == [
+        ("M2", "new"),
+        ("M2", "changed"),
+    ]
+    assert emitted[-1].match == make_match("M2", "3-2")
+    assert (summary.polls, summary.unchanged) == (4, 2)
+    assert (summary.new_matches, summary.changed_matches) == (1, 1)
+
+    log = (deltas_dir / str(now.year) / "event_matches_42.jsonl").read_text()
+    assert [json.loads(line)["change"] for line in log.splitlines()] == [
+        "new",
+        "changed",
+    ]
+    assert load_raw_json(matches_dir / str(now.year), "event_matches_42.json") == [
+        make_match("M1", "3-0"),
+        make_match("M2", "3-2"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_live_poller_saves_removed_matches(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that a poll that only drops matches still reaches the event matches file.
+
+    Asserts:
+        No delta is emitted, and the consolidated file no longer holds the
+        removed match.
+    """
+    now = datetime.now()
+    event = EventRecord(
+        event_id=43,
+        name="WTT Contender",
+        year=now.year,
+        start=now - timedelta(days=1),
+        end=now + timedelta(days=3),
+        is_senior=True,
+    )
+    matches_dir = tmp_path / "event_matches"
+    save_raw_json(
+        [make_match("M1", "3-0"), make_match("M2", "1-0")],
+        matches_dir / str(now.year),
+        "event_matches_43.json",
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=[make_match("M1", "3-0")])
+
+    emitted = []
+    with RawCatalog(tmp_path / "catalog.sqlite") as catalog:
+        await run_live_poller(
+            events=[event],
+            event_matches_dir=matches_dir,
+            deltas_dir=tmp_path / "live_deltas",
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            min_interval=0.0,
+            max_interval=0.0,
+            max_polls=2,
+            on_delta=emitted.append,
+        )
+
+    assert emitted == []
+    assert load_raw_json(matches_dir / str(now.year), "event_matches_43.json") == [
+        make_match("M1", "3-0")
+    ]
@@ -0,0 +1,168 @@
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.collectors.match_details_collector import match_details_filename
+from src.collectors.pipeline import run_pipeline
+from src.utils.api_client import TTStatsClient
+from src.utils.io_handler import save_raw_json
+from src.utils.raw_catalog import RawCatalog
+
+
+def make_event(event_id: int, name: str, start: datetime, end: datetime) -> dict:
+    """
+    Returns one row of an events payload.
+    """
+    return {
+        "EventId": event_id,
+        "EventName": name,
+        "StartDateTime": start.strftime("%Y-%m-%dT%H:%M:%S"),
+        "EndDateTime": end.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_pipeline_collects_new_event_down_to_match_cards(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that one run fetches the calendar, the matches of the senior events
+    to scrape and the match card of every match.
+
+    Asserts:
+        Youth events and completed events with stored matches are not fetched.
+        An event listed in two year files is fetched once.
+        Every match of a fetched event gets its match card file.
+    """
+    dirs = {
+        name: tmp_path / name for name in ("events", "event_matches", "match_details")
+    }
+    now = datetime(2025, 6, 15)
+    start = now - timedelta(days=20)
+    calendar = {
+        2025: [
+            make_event(1, "WTT Contender", start, start + timedelta(days=5)),
+            make_event(2, "WTT Youth Contender", start, start + timedelta(days=5)),
+            make_event(3, "WTT Star Contender", start, start + timedelta(days=5)),
+            make_event(4, "WTT Champions", now - timedelta(days=1), now),
+        ],
+        2026: [make_event(4, "WTT Champions", now - timedelta(days=1), now)],
+    }
+    # event 3 is completed and already stored
+    save_raw_json(
+        [{"documentCode": "OLD"}],
+        dirs["event_matches"] / "2025",
+        "event_matches_3.json",
+    )
+
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/eventcalendar"):
+            custom_filter = json.loads(json.loads(request.content)["custom_filter"])
+            rows = calendar[int(custom_filter[0]["value"])]
+            return httpx.Response(200, json=[{"Count": len(rows), "rows": rows}])
+        if path.endswith("/GetOfficialResult"):
+            event_id = request.url.params["EventId"]
+            requested.append(f"event {event_id}")
+            return httpx.Response(
+                200,
+                json=[
+                    {"documentCode": f"M{event_id}-{i}", "resultOverallScores": "3-1"}
+                    for i in range(2)
+                ],
+            )
+        requested.append(path.split("/GetMatchCardDetails/", 1)[1])
+        return httpx.Response(200, json={"match_card": {"gameScores": "11-5"}})
+
+    with RawCatalog(tmp_path / "catalog.sqlite") as catalog:
+        summary = await run_pipeline(
+            [2025, 2026],
+            events_dir=dirs["events"],
+            event_matches_dir=dirs["event_matches"],
+            match_details_dir=dirs["match_details"],
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            current_date=now,
+        )
+
+    assert sorted(r for r in requested if r.startswith("event")) == [
+        "event 1",
+        "event 4",
+    ]
+    assert sorted(r for r in requested if not r.startswith("event")) == [
+        "1/M1-0",
+        "1/M1-1",
+        "4/M4-0",
+        "4/M4-1",
+    ]
+    assert summary.years == 2
+    assert summary.events_queued == 2
+    assert summary.matches == 4
+    assert summary.details_saved == 4
+    assert summary.first_details_s is not None
+    for event_id in (1, 4):
+        for i in range(2):
+            saved = (
+                dirs["match_details"]
+                / "2025"
+                / match_details_filename(event_id, f"M{event_id}-{i}")
+            )
+            assert json.loads(saved.read_text(encoding="utf-8")) == {
+                "match_card": {"gameScores": "11-5"}
+            }
+    assert (dirs["events"] / "events_2026.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_scrapes_event_missing_from_its_start_year(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that the canonical copy of a year boundary event matches dedupe_events.
+
+    Asserts:
+        An event listed in both years is fetched once, under its start year.
+        An event whose start year file does not list it is still fetched,
+        under the year that lists it.
+    """
+    now = datetime(2025, 1, 2)
+    start = datetime(2024, 12, 28)
+    both = make_event(6, "WTT Champions", start, now + timedelta(days=1))
+    missing = make_event(7, "WTT Contender", start, now + timedelta(days=1))
+    calendar = {2024: [both], 2025: [both, missing]}
+
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/eventcalendar"):
+            custom_filter = json.loads(json.loads(request.content)["custom_filter"])
+            rows = calendar[int(custom_filter[0]["value"])]
+            return httpx.Response(200, json=[{"Count": len(rows), "rows": rows}])
+        if path.endswith("/GetOfficialResult"):
+            requested.append(request.url.params["EventId"])
+            return httpx.Response(200, json=[])
+        return httpx.Response(404)
+
+    with RawCatalog(tmp_path / "catalog.sqlite") as catalog:
+        summary = await run_pipeline(
+            [2025, 2024],
+            events_dir=tmp_path / "events",
+            event_matches_dir=tmp_path / "event_matches",
+            match_details_dir=tmp_path / "match_details",
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+            current_date=now,
+        )
+
+    assert sorted(requested) == ["6", "7"]
+    assert summary.events_queued == 2
+    assert (tmp_path / "event_matches" / "2024" / "event_matches_6.json").exists()
+    assert (tmp_path / "event_matches" / "2025" / "event_matches_7.json").exists()
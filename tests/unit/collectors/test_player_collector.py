@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.collectors.player_collector import run_player_scraper
+from src.utils.api_client import TTStatsClient
+from src.utils.io_handler import save_raw_json
+from src.utils.player_index import PlayerIndex
+from src.utils.raw_catalog import RawCatalog
+
+
+@pytest.mark.asyncio
+async def test_run_player_scraper_fetches_each_player_once(
+    stats_client: TTStatsClient, tmp_path: Path
+):
+    """
+    Tests that players appearing in many matches are fetched once, and not again
+    while their details are fresh.
+
+    Asserts:
+        One request and one file per unique player, none on the second run.
+        A failed fetch is retried on the next run.
+    """
+    matches_dir = tmp_path / "event_matches"
+    players_dir = tmp_path / "players"
+    rows = [
+        {
+            "documentCode": f"M{i}",
+            "competitiors": [
+                {"competitorType": "H", "competitorId": str(i % 3)},
+                {"competitorType": "A", "competitorId": str((i + 1) % 3)},
+            ],
+        }
+        for i in range(30)
+    ]
+    save_raw_json(rows, matches_dir / "2024", "event_matches_1.json")
+
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        player_id = request.url.params["PlayerId"]
+        requested.append(player_id)
+        if player_id == "2" and requested.count("2") == 1:
+            return httpx.Response(404, json={"error": "Not Found"})
+        return httpx.Response(200, json={"playerId": player_id})
+
+    with (
+        PlayerIndex(tmp_path / "players.sqlite") as player_index,
+        RawCatalog(tmp_path / "catalog.sqlite") as catalog,
+    ):
+        for _ in range(2):
+            await run_player_scraper(
+                num_workers=2,
+                event_matches_dir=matches_dir,
+                output_dir=players_dir,
+                player_index=player_index,
+                catalog=catalog,
+                stats_client=stats_client,
+                transport=httpx.MockTransport(handler),
+            )
+
+    assert sorted(requested) == ["0", "1", "2", "2"]
+    for player_id in ("0", "1", "2"):
+        saved = players_dir / f"player_{player_id}.json"
+        assert json.loads(saved.read_text(encoding="utf-8")) == {"playerId": player_id}
+
+
+@pytest.mark.asyncio
+async def test_failed_write_leaves_player_due(
+    stats_client: TTStatsClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Tests that a player is only recorded as fetched once its file is on disk.
+
+    Asserts:
+        A player whose background write failed is requested again on the next run.
+    """
+    import src.utils.write_behind as write_behind
+
+    matches_dir = tmp_path / "event_matches"
+    rows = [
+        {
+            "documentCode": "M1",
+            "competitiors": [
+                {"competitorType": "H", "competitorId": "1"},
+                {"competitorType": "A", "competitorId": "2"},
+            ],
+        }
+    ]
+    save_raw_json(rows, matches_dir / "2024", "event_matches_1.json")
+
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.params["PlayerId"])
+        return httpx.Response(200, json={"playerId": request.url.params["PlayerId"]})
+
+    save = write_behind.save_raw_json
+
+    def failing_save(data, folder, filename, *args, **kwargs):
+        if filename == "player_2.json":
+            return False
+        return save(data, folder, filename, *args, **kwargs)
+
+    with (
+        PlayerIndex(tmp_path / "players.sqlite") as player_index,
+        RawCatalog(tmp_path / "catalog.sqlite") as catalog,
+    ):
+        kwargs = dict(
+            num_workers=2,
+            event_matches_dir=matches_dir,
+            output_dir=tmp_path / "players",
+            player_index=player_index,
+            catalog=catalog,
+            stats_client=stats_client,
+            transport=httpx.MockTransport(handler),
+        )
+        monkeypatch.setattr(write_behind, "save_raw_json", failing_save)
+        await run_player_scraper(**kwargs)
+        monkeypatch.undo()
+        requested.clear()
+
+        await run_player_scraper(**kwargs)
+
+    assert requested == ["2"]
@@ -0,0 +1,209 @@
+import os
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from src.transforms.event_matches_transform import (
+    TABLE_SCHEMAS,
+    build_event_matches_intermediate,
+    flatten_event_matches,
+    scan_table,
+    table_path,
+)
+from src.utils.io_handler import save_raw_json
+from src.utils.wtt_models import to_match_records
+
+
+def make_match(document_code: str, event_id: int = 3001, scores: str = "3-1") -> dict:
+    return {
+        "documentCode": document_code,
+        "match_card": {
+            "eventId": str(event_id),
+            "documentCode": document_code,
+            "subEventName": "Men's Singles",
+            "overallScores": scores,
+            "gameScores": "11-7,9-11,11-5,11-3,0-0",
+            "resultStatus": "OFFICIAL",
+            "competitiors": [
+                {
+                    "competitorType": "H",
+                    "competitorId": "101",
+                    "competitorName": "Player A",
+                    "competitorOrg": "CHN",
+                    "players": [
+                        {
+                            "playerId": "101",
+                            "playerName": "Player A",
+                            "playerOrgCode": "CHN",
+                        }
+                    ],
+                },
+                {
+                    "competitorType": "A",
+                    "competitorId": "202",
+                    "competitorName": "Player B",
+                    "competitorOrg": "JPN",
+                },
+            ],
+        },
+    }
+
+
+@pytest.fixture
+def dirs(tmp_path: Path):
+    """
+    Returns the (raw, output) directories of a build.
+    """
+    return tmp_path / "raw", tmp_path / "intermediate"
+
+
+def test_flatten_event_matches():
+    """
+    Tests that one match card gives a match, two competitors, two players
+    and the played games.
+    """
+    tables = flatten_event_matches(
+        to_match_records([make_match("M1")]), 2024, "2024/event_matches_3001.json"
+    )
+
+    match = tables["matches"][0]
+    assert match["event_id"] == 3001
+    assert (match["home_games"], match["away_games"], match["winner"]) == (3, 1, "H")
+    assert (match["home_competitor_id"], match["away_competitor_id"]) == ("101", "202")
+    assert len(tables["competitors"]) == 2
+    assert [p["player_id"] for p in tables["players"]] == ["101", "202"]
+    assert [(g["home_points"], g["away_points"]) for g in tables["games"]] == [
+        (11, 7),
+        (9, 11),
+        (11, 5),
+        (11, 3),
+    ]
+
+
+@pytest.mark.parametrize("data", [{"error": "Not Found"}, [], ["x", {"noCode": 1}]])
+def test_flatten_unexpected_payloads(data):
+    """
+    Tests that payloads without match rows give no rows instead of failing.
+    """
+    tables = flatten_event_matches(
+        to_match_records(data), 2024, "2024/event_matches_1.json"
+    )
+    assert all(rows == [] for rows in tables.values())
+
+
+def test_build_writes_typed_tables(dirs):
+    """
+    Tests that a first build writes every table with its schema for each year.
+    """
+    raw_dir, output_dir = dirs
+    save_raw_json(
+        [make_match("M1"), make_match("M2")], raw_dir / "2023", "event_matches_1.json"
+    )
+    save_raw_json(
+        [make_match("M3", event_id=2)], raw_dir / "2024", "event_matches_2.json"
+    )
+
+    summary = build_event_matches_intermediate(raw_dir, output_dir)
+
+    assert (summary.files, summary.parsed, summary.years_rewritten) == (
+        2,
+        2,
+        [2023, 2024],
+    )
+    for table, schema in TABLE_SCHEMAS.items():
+        assert table_path(output_dir, table, 2023).exists()
+        assert dict(scan_table(table, output_dir).collect_schema()) == schema
+    assert scan_table("matches", output_dir).collect().height == 3
+    assert scan_table("games", output_dir).collect().height == 12
+
+
+def test_rebuild_only_parses_changed_files(dirs):
+    """
+    Tests that a second build skips unchanged files and replaces only the rows
+    of the changed file, keeping the other files' rows of the same year.
+    """
+    raw_dir, output_dir = dirs
+    save_raw_json([make_match("M1")], raw_dir / "2024", "event_matches_1.json")
+    save_raw_json(
+        [make_match("M2", event_id=2)], raw_dir / "2024", "event_matches_2.json"
+    )
+    save_raw_json(
+        [make_match("M3", event_id=3)], raw_dir / "2023", "event_matches_3.json"
+    )
+    build_event_matches_intermediate(raw_dir, output_dir)
+
+    summary = build_event_matches_intermediate(raw_dir, output_dir)
+    assert (summary.parsed, summary.unchanged, summary.years_rewritten) == (0, 3, [])
+
+    save_raw_json(
+        [make_match("M2", event_id=2), make_match("M4", event_id=2, scores="1-3")],
+        raw_dir / "2024",
+        "event_matches_2.json",
+    )
+    summary = build_event_matches_intermediate(raw_dir, output_dir)
+
+    assert (summary.parsed, summary.unchanged, summary.years_rewritten) == (
+        1,
+        2,
+        [2024],
+    )
+    matches = pl.read_parquet(table_path(output_dir, "matches", 2024))
+    assert sorted(matches["document_code"].to_list()) == ["M1", "M2", "M4"]
+    assert matches.filter(pl.col("document_code") == "M4")["winner"].item() == "A"
+
+
+def test_touched_file_is_not_reparsed(dirs):
+    """
+    Tests that a file with a new mtime but the same content is only hashed.
+    """
+    raw_dir, output_dir = dirs
+    save_raw_json([make_match("M1")], raw_dir / "2024", "event_matches_1.json")
+    build_event_matches_intermediate(raw_dir, output_dir)
+
+    path = raw_dir / "2024" / "event_matches_1.json"
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    summary = build_event_matches_intermediate(raw_dir, output_dir)
+
+    assert (summary.parsed, summary.unchanged) == (0, 1)
+
+
+def test_removed_file_rows_are_dropped(dirs):
+    """
+    Tests that the rows of a deleted raw file are removed, and a year without
+    files loses its Parquet files.
+    """
+    raw_dir, output_dir = dirs
+    save_raw_json([make_match("M1")], raw_dir / "2024", "event_matches_1.json")
+    save_raw_json(
+        [make_match("M2", event_id=2)], raw_dir / "2024", "event_matches_2.json"
+    )
+    save_raw_json(
+        [make_match("M3", event_id=3)], raw_dir / "2023", "event_matches_3.json"
+    )
+    build_event_matches_intermediate(raw_dir, output_dir)
+
+    (raw_dir / "2024" / "event_matches_1.json").unlink()
+    (raw_dir / "2023" / "event_matches_3.json").unlink()
+    summary = build_event_matches_intermediate(raw_dir, output_dir)
+
+    assert summary.removed == 2
+    assert scan_table("matches", output_dir).collect()["document_code"].to_list() == [
+        "M2"
+    ]
+    assert not table_path(output_dir, "matches", 2023).exists()
+
+
+def test_deleted_output_is_rebuilt(dirs):
+    """
+    Tests that a year whose Parquet file was deleted is rebuilt from the raw files.
+    """
+    raw_dir, output_dir = dirs
+    save_raw_json([make_match("M1")], raw_dir / "2024", "event_matches_1.json")
+    build_event_matches_intermediate(raw_dir, output_dir)
+
+    table_path(output_dir, "games", 2024).unlink()
+    summary = build_event_matches_intermediate(raw_dir, output_dir)
+
+    assert summary.parsed == 1
+    assert table_path(output_dir, "games", 2024).exists()
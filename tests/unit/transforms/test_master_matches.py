@@ -0,0 +1,137 @@
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from src.transforms.event_matches_transform import build_event_matches_intermediate
+from src.transforms.master_matches import (
+    MASTER_SCHEMA,
+    build_master_matches,
+    load_partition_stats,
+    partition_path,
+    prune_partitions,
+    scan_master_matches,
+)
+from src.utils.io_handler import save_raw_json
+
+
+def make_match(document_code: str, event_id: int, home: str = "101", away: str = "202"):
+    return {
+        "documentCode": document_code,
+        "eventId": event_id,
+        "resultOverallScores": "3-0",
+        "gameScores": ["11-1", "11-2", "11-3"],
+        "competitiors": [
+            {"competitorType": "H", "competitorId": home, "competitorName": f"P{home}"},
+            {"competitorType": "A", "competitorId": away, "competitorName": f"P{away}"},
+        ],
+    }
+
+
+@pytest.fixture
+def tree(tmp_path: Path):
+    """
+    Returns (raw_dir, build) where build() runs the intermediate and master builds.
+    """
+    raw_dir = tmp_path / "raw"
+    intermediate_dir = tmp_path / "intermediate"
+    master_dir = tmp_path / "master"
+
+    def build():
+        build_event_matches_intermediate(raw_dir, intermediate_dir)
+        return build_master_matches(intermediate_dir, master_dir)
+
+    save_raw_json(
+        [make_match("M1", 1), make_match("M2", 1, away="303")],
+        raw_dir / "2023",
+        "event_matches_1.json",
+    )
+    save_raw_json([make_match("M3", 2)], raw_dir / "2024", "event_matches_2.json")
+    return raw_dir, master_dir, build
+
+
+def test_build_writes_partitions_and_stats(tree):
+    """
+    Tests that every year gets a partition in the master schema, with statistics.
+    """
+    raw_dir, master_dir, build = tree
+    summary = build()
+
+    assert (summary.partitions, summary.rewritten, summary.rows) == (2, [2023, 2024], 3)
+    frame = pl.read_parquet(partition_path(master_dir, 2023))
+    assert dict(frame.schema) == MASTER_SCHEMA
+    assert frame["match_key"].to_list() == ["1:M1", "1:M2"]
+    assert frame["game_scores"].to_list() == ["11-1,11-2,11-3"] * 2
+    assert frame["home_competitor_name"].to_list() == ["P101", "P101"]
+
+    stats = load_partition_stats(master_dir)
+    assert stats[2023].rows == 2
+    assert stats[2023].event_ids == [1]
+    assert stats[2023].player_ids == ["101", "202", "303"]
+
+
+def test_upsert_only_rewrites_changed_partition(tree):
+    """
+    Tests that re-scraping one event rewrites only its year's partition.
+    """
+    raw_dir, master_dir, build = tree
+    build()
+    untouched = partition_path(master_dir, 2023).stat().st_mtime_ns
+
+    assert build().rewritten == []
+
+    save_raw_json(
+        [make_match("M3", 2), make_match("M4", 2)],
+        raw_dir / "2024",
+        "event_matches_2.json",
+    )
+    summary = build()
+
+    assert summary.rewritten == [2024]
+    assert partition_path(master_dir, 2023).stat().st_mtime_ns == untouched
+    assert scan_master_matches(master_dir, year=2024).collect().height == 2
+
+
+def test_duplicate_matches_kept_in_earliest_year(tree):
+    """
+    Tests that a match listed under two years is only kept in the earliest one.
+    """
+    raw_dir, master_dir, build = tree
+    save_raw_json([make_match("M1", 1)], raw_dir / "2024", "event_matches_1.json")
+    summary = build()
+
+    assert summary.duplicates == 1
+    assert (
+        scan_master_matches(master_dir).collect()["match_key"].to_list().count("1:M1")
+        == 1
+    )
+
+
+def test_removed_year_partition_is_deleted(tree):
+    """
+    Tests that a year without intermediate data loses its partition.
+    """
+    raw_dir, master_dir, build = tree
+    build()
+    (raw_dir / "2024" / "event_matches_2.json").unlink()
+
+    assert build().removed == [2024]
+    assert not partition_path(master_dir, 2024).exists()
+
+
+def test_pruned_scans(tree):
+    """
+    Tests that the partition statistics prune by event and player, and the
+    scan filters rows within the remaining partitions.
+    """
+    raw_dir, master_dir, build = tree
+    build()
+    stats = load_partition_stats(master_dir)
+
+    assert prune_partitions(stats, event_id=2) == [2024]
+    assert prune_partitions(stats, player_id="303") == [2023]
+    assert prune_partitions(stats, player_id="999") == []
+    assert scan_master_matches(master_dir, player_id="303").collect()[
+        "match_key"
+    ].to_list() == ["1:M2"]
+    assert scan_master_matches(master_dir, player_id="999").collect().height == 0
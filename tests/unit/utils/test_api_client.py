@@ -0,0 +1,146 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from src.utils.api_client import TTStatsClient
+from src.utils.response_cache import ResponseCache
+from src.utils.routes import WTTRoutes
+
+
+@pytest.mark.asyncio
+async def test_identical_fetches_are_coalesced(
+    stats_client: TTStatsClient, wtt_api_mock: respx.Router
+):
+    """
+    Tests that concurrent fetches of the same route share one HTTP request,
+    while a different route is still sent on its own.
+
+    Asserts:
+        Three callers of one route see the same response from a single request.
+    """
+
+    async def slow_response(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=[{"matchId": 1}])
+
+    route = wtt_api_mock.get(url__regex=r".*/api/.*").mock(side_effect=slow_response)
+
+    async with httpx.AsyncClient() as http_client:
+        responses = await asyncio.gather(
+            *(
+                stats_client.fetch_route_async(
+                    http_client, WTTRoutes.get_event_matches_route("3001")
+                )
+                for _ in range(3)
+            ),
+            stats_client.fetch_route_async(
+                http_client, WTTRoutes.get_event_matches_route("3002")
+            ),
+        )
+
+    assert route.call_count == 2
+    assert responses[0] is responses[1] is responses[2]
+    assert stats_client.coalesced == 2
+
+
+@pytest.mark.asyncio
+async def test_sequential_fetches_are_not_coalesced(
+    stats_client: TTStatsClient, wtt_api_mock: respx.Router
+):
+    """
+    Tests that a finished request is not reused for a later fetch.
+    """
+    route = wtt_api_mock.get(url__regex=r".*/api/.*").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+
+    async with httpx.AsyncClient() as http_client:
+        for _ in range(2):
+            await stats_client.fetch_route_async(
+                http_client, WTTRoutes.get_event_matches_route("3001")
+            )
+
+    assert route.call_count == 2
+    assert stats_client.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_route_is_not_refetched(
+    stats_client: TTStatsClient, wtt_api_mock: respx.Router, tmp_path
+):
+    """
+    Tests that with a response cache, a completed event is only fetched once,
+    while a live event (short TTL) is served from the cache within its TTL.
+
+    Asserts:
+        Two fetches of each route send one request per route.
+    """
+    route = wtt_api_mock.get(url__regex=r".*/api/.*").mock(
+        return_value=httpx.Response(200, json=[{"matchId": 1}])
+    )
+
+    with ResponseCache(tmp_path / "cache.sqlite") as cache:
+        stats_client.cache = cache
+        async with httpx.AsyncClient() as http_client:
+            for _ in range(2):
+                completed = await stats_client.fetch_route_async(
+                    http_client,
+                    WTTRoutes.get_event_matches_route("3001", completed=True),
+                )
+                live = await stats_client.fetch_route_async(
+                    http_client, WTTRoutes.get_event_matches_route("3002")
+                )
+
+        assert route.call_count == 2
+        assert completed.json() == live.json() == [{"matchId": 1}]
+        assert cache.stats().hits == 2
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared_until_closed(stats_client: TTStatsClient):
+    """
+    Tests that every caller gets the same pooled AsyncClient per transport.
+
+    Asserts:
+        Repeated calls return one client, another transport gets its own,
+        and aclose() closes them so the next call opens a fresh one.
+    """
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+
+    shared = stats_client.http_client()
+    assert stats_client.http_client() is shared
+    other = stats_client.http_client(transport)
+    assert other is not shared
+    assert stats_client.http_client(transport) is other
+
+    await stats_client.aclose()
+    assert shared.is_closed and other.is_closed
+    assert stats_client.http_client() is not shared
+    await stats_client.aclose()
+
+
+def test_ittf_threaded_reuses_the_thread_client():
+    """
+    Tests that threaded ITTF requests of one thread share a keep-alive client.
+    """
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url)
+        return httpx.Response(200, text="<html></html>")
+
+    stats_client = TTStatsClient(
+        max_pause_duration=0.0, ittf_transport=httpx.MockTransport(handler)
+    )
+    assert stats_client.get_ittf_threaded("https://results.ittf.link/a") == (
+        "<html></html>"
+    )
+    client = stats_client._ittf_client()
+    stats_client.get_ittf_threaded("https://results.ittf.link/b")
+
+    assert stats_client._ittf_client() is client
+    assert len(seen) == 2
+    stats_client.close()
+    assert client.is_closed
@@ -0,0 +1,82 @@
+import hashlib
+
+import httpx
+import pytest
+
+from src.utils.change_detection import (
+    conditional_headers,
+    fetch_source,
+    is_unchanged,
+)
+from src.utils.raw_catalog import CatalogEntry
+
+
+def make_entry(**overrides) -> CatalogEntry:
+    """
+    Returns a valid catalog entry, with the given fields overridden.
+    """
+    fields = dict(
+        path="/raw/events_2024.json",
+        stored_path="/raw/events_2024.json",
+        size=10,
+        mtime_ns=0,
+        content_hash="abc",
+        row_count=2,
+        is_valid=True,
+        updated_at=0.0,
+        source_hash=hashlib.sha256(b"[1, 2]").hexdigest(),
+        etag=None,
+        last_modified=None,
+        checked_at=0.0,
+        changed_at=0.0,
+    )
+    fields.update(overrides)
+    return CatalogEntry(**fields)
+
+
+def test_conditional_headers():
+    """
+    Tests that the stored validators are turned into conditional request headers.
+
+    Asserts:
+        Only the validators that were stored are sent, and nothing for a missing or invalid entry.
+    """
+    entry = make_entry(etag='"v1"', last_modified="Wed, 01 Jan 2025 00:00:00 GMT")
+    assert conditional_headers(entry) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+    assert conditional_headers(make_entry()) == {}
+    assert conditional_headers(make_entry(etag='"v1"', is_valid=False)) == {}
+    assert conditional_headers(None) == {}
+
+
+def test_fetch_source():
+    """
+    Tests that the body hash and validators are taken from the response.
+    """
+    response = httpx.Response(200, content=b"[1, 2]", headers={"ETag": '"v1"'})
+    source = fetch_source(response)
+
+    assert source.source_hash == hashlib.sha256(b"[1, 2]").hexdigest()
+    assert source.etag == '"v1"'
+    assert source.last_modified is None
+
+
+@pytest.mark.parametrize(
+    "response, entry, expected",
+    [
+        (httpx.Response(304), make_entry(), True),
+        (httpx.Response(200, content=b"[1, 2]"), make_entry(), True),
+        (httpx.Response(200, content=b"[1, 2, 3]"), make_entry(), False),
+        (httpx.Response(200, content=b"[1, 2]"), make_entry(source_hash=None), False),
+        (httpx.Response(200, content=b"[1, 2]"), make_entry(is_valid=False), False),
+        (httpx.Response(200, content=b"[1, 2]"), None, False),
+        (httpx.Response(503, content=b"[1, 2]"), make_entry(), False),
+    ],
+)
+def test_is_unchanged(response, entry, expected):
+    """
+    Tests that only a 304 or an identical 200 body count as unchanged.
+    """
+    assert is_unchanged(response, entry) is expected
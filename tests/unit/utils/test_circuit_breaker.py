@@ -0,0 +1,99 @@
+import time
+
+import httpx
+import pytest
+import respx
+
+from src.utils.api_client import TTStatsClient
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.retry_policy import RetryPolicy
+
+
+def test_breaker_opens_after_consecutive_failures():
+    """
+    Tests that the breaker trips after failure_threshold failures in a row.
+
+    Asserts:
+        A success in between resets the count, the trip rejects requests.
+    """
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_response(200)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.allow()
+    assert breaker.state == "closed"
+
+    breaker.record_response(503)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow("wtt.test")
+
+    snapshot = breaker.snapshot()
+    assert snapshot.trips == 1
+    assert snapshot.rejected == 1
+
+
+def test_breaker_half_open_probe():
+    """
+    Tests that after reset_timeout a single probe is let through.
+
+    Asserts:
+        A failed probe re-opens the breaker, a successful one closes it.
+    """
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.state == "half_open"
+    breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.snapshot().trips == 2
+
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.record_response(200)
+    assert breaker.state == "closed"
+    breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_failing_host_does_not_affect_other_host(wtt_api_mock: respx.Router):
+    """
+    Tests that each host has its own limiter and breaker.
+
+    Asserts:
+        The failing host fails fast once tripped without reaching the network,
+        the healthy host keeps serving, and the trip is in the summary.
+    """
+    down = wtt_api_mock.get(url__regex=r"https://down\.test/.*").mock(
+        return_value=httpx.Response(503)
+    )
+    wtt_api_mock.get(url__regex=r"https://up\.test/.*").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+    stats_client = TTStatsClient(
+        retry_policy=RetryPolicy(max_attempts=1, base_delay=0.0, max_delay=0.0)
+    )
+
+    async with httpx.AsyncClient() as http_client:
+        for _ in range(5):
+            await stats_client.request_async(http_client, "GET", "https://down.test/x")
+        with pytest.raises(CircuitOpenError):
+            await stats_client.request_async(http_client, "GET", "https://down.test/x")
+        response = await stats_client.request_async(
+            http_client, "GET", "https://up.test/x"
+        )
+
+    assert down.call_count == 5
+    assert response.status_code == 200
+    assert stats_client.limiter_for("up.test") is not stats_client.limiter_for(
+        "down.test"
+    )
+    assert stats_client.breaker_for("https://up.test/x").state == "closed"
+    assert any("down.test tripped 1x" in line for line in stats_client.summary())
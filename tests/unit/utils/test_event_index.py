@@ -0,0 +1,193 @@
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.utils import event_index as event_index_module
+from src.utils.event_index import (
+    EventIndex,
+    EventRecord,
+    build_event_records,
+    dedupe_events,
+    get_event_index,
+)
+from src.utils.io_handler import save_raw_json
+
+
+def events_payload(*names: str) -> list:
+    """
+    Returns an events payload in the WTT [{"rows": [...]}] structure.
+    """
+    start = (datetime.now() - timedelta(days=10)).strftime("%Y-%m-%dT%H:%M:%S")
+    end = (datetime.now() - timedelta(days=5)).strftime("%Y-%m-%dT%H:%M:%S")
+    rows = [
+        {
+            "EventId": i + 1,
+            "EventName": name,
+            "StartDateTime": start,
+            "EndDateTime": end,
+        }
+        for i, name in enumerate(names)
+    ]
+    return [{"Count": len(rows), "rows": rows}]
+
+
+@pytest.fixture
+def events_dir(tmp_path: Path) -> Path:
+    """
+    Returns an events directory with two year files.
+    """
+    folder = tmp_path / "events"
+    save_raw_json(
+        events_payload("WTT Champions", "WTT Youth Contender"),
+        folder,
+        "events_2023.json",
+    )
+    save_raw_json(events_payload("World Championships"), folder, "events_2024.json")
+    return folder
+
+
+def test_build_event_records():
+    """
+    Tests that rows are turned into records with parsed dates and the senior flag.
+
+    Asserts:
+        Every row gives a record, malformed payloads give none.
+    """
+    records = build_event_records(events_payload("WTT Champions", "U19 Open"), 2024)
+
+    assert [r.event_id for r in records] == [1, 2]
+    assert [r.is_senior for r in records] == [True, False]
+    assert records[0].year == 2024
+    assert records[0].status() == "completed"
+    assert build_event_records({"error": "Not Found"}, 2024) == []
+    assert build_event_records([], 2024) == []
+
+
+def test_event_index_reads_every_year(events_dir: Path):
+    """
+    Tests that the index exposes the events of every year file.
+    """
+    index = EventIndex(events_dir).refresh()
+
+    assert index.years() == [2023, 2024]
+    assert index.row_count(2023) == 2
+    assert index.row_count(2030) == 0
+    assert [e.name for e in index.events()] == [
+        "WTT Champions",
+        "WTT Youth Contender",
+        "World Championships",
+    ]
+    assert index.parsed == 2
+
+
+def test_event_index_snapshot_skips_parsing(events_dir: Path, monkeypatch):
+    """
+    Tests that a second index over unchanged files is served from the snapshot.
+
+    Asserts:
+        No file is parsed and the records match the first build.
+    """
+    first = EventIndex(events_dir).refresh()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("events file was parsed")
+
+    monkeypatch.setattr(event_index_module, "decode_event_rows", fail)
+    second = EventIndex(events_dir).refresh()
+
+    assert second.parsed == 0
+    assert second.events() == first.events()
+
+
+def test_event_index_reparses_changed_files_only(events_dir: Path):
+    """
+    Tests that a touched file with the same content is not re-parsed,
+    a rewritten file is, and a removed file is dropped.
+    """
+    EventIndex(events_dir).refresh()
+
+    touched = events_dir / "events_2023.json"
+    os.utime(touched, ns=(0, touched.stat().st_mtime_ns + 10**9))
+    save_raw_json(
+        events_payload("World Cup", "WTT Finals"), events_dir, "events_2024.json"
+    )
+
+    index = EventIndex(events_dir).refresh()
+    assert index.parsed == 1
+    assert index.row_count(2024) == 2
+
+    touched.unlink()
+    index.refresh()
+    assert index.years() == [2024]
+
+
+def test_event_index_rebuilds_corrupt_snapshot(events_dir: Path):
+    """
+    Tests that an unreadable snapshot is ignored and rebuilt.
+    """
+    index = EventIndex(events_dir).refresh()
+    index.snapshot_path.write_bytes(b"not a pickle")
+
+    rebuilt = EventIndex(events_dir).refresh()
+
+    assert rebuilt.parsed == 2
+    assert rebuilt.years() == [2023, 2024]
+
+
+def test_get_event_index_is_shared(events_dir: Path):
+    """
+    Tests that one index instance is shared per directory and picks up new files.
+    """
+    index = get_event_index(events_dir)
+    save_raw_json(events_payload("WTT Star Contender"), events_dir, "events_2025.json")
+
+    assert get_event_index(events_dir) is index
+    assert index.years() == [2023, 2024, 2025]
+
+
+def test_dedupe_events_prefers_start_year():
+    """
+    Tests that an event listed in two year files is kept once, from its start year file.
+
+    Asserts:
+        The start year copy is kept even when it is not the first one seen,
+        records without an EventId are left alone.
+    """
+    start = datetime(2024, 12, 28)
+    end = datetime(2025, 1, 3)
+    boundary_2025 = EventRecord(7, "WTT Finals", 2025, start, end, True)
+    boundary_2024 = EventRecord(7, "WTT Finals", 2024, start, end, True)
+    other = EventRecord(8, "WTT Contender", 2025, end, end, True)
+    no_id = EventRecord(None, "Unknown", 2025, None, None, True)
+
+    unique, duplicates = dedupe_events([boundary_2025, other, no_id, boundary_2024])
+
+    assert unique == [other, no_id, boundary_2024]
+    assert duplicates == 1
+
+
+def test_dedupe_events_falls_back_to_earliest_year():
+    """
+    Tests that without a start year copy the earliest year file wins.
+    """
+    late = EventRecord(7, "WTT Finals", 2026, None, None, True)
+    early = EventRecord(7, "WTT Finals", 2025, None, None, True)
+
+    assert dedupe_events([late, early]) == ([early], 1)
+
+
+def test_event_index_frame(events_dir: Path):
+    """
+    Tests that the frame holds every record with a status against one reference date.
+    """
+    index = EventIndex(events_dir).refresh()
+
+    frame = index.frame()
+    assert frame["event_id"].to_list() == [1, 2, 1]
+    assert frame["is_senior"].to_list() == [True, False, True]
+    assert frame["status"].to_list() == ["completed"] * 3
+
+    past = index.frame(2023, current_date=datetime.now() - timedelta(days=30))
+    assert past["status"].to_list() == ["future", "future"]
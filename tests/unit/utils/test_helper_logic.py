@@ -1,6 +1,13 @@
 import pytest
 from datetime import datetime, timedelta
-from src.utils.helper_logic import get_event_date_status, is_senior_event
+from src.utils.helper_logic import (
+    classify_events,
+    get_date_status,
+    get_date_statuses,
+    get_event_date_status,
+    is_senior_event,
+    parse_event_date,
+)
 
 
 @pytest.mark.parametrize(
@@ -58,3 +65,82 @@ def test_is_senior_event_result(name, expected):
     """
 
     assert is_senior_event(name) == expected
+
+
+def test_classify_events_matches_row_by_row():
+    """
+    Tests that the vectorized classification agrees with is_senior_event and
+    get_date_status for every row, including missing and malformed values.
+
+    Asserts:
+        Senior flags and statuses are identical to the row by row functions.
+    """
+    now = datetime(2025, 6, 15, 12, 0, 0)
+
+    def day(offset):
+        return (now + timedelta(days=offset)).strftime("%Y-%m-%dT%H:%M:%S")
+
+    rows = [
+        {
+            "EventName": "WTT Star Contender Bangkok",
+            "StartDateTime": day(5),
+            "EndDateTime": day(10),
+        },
+        {
+            "EventName": "WTT Youth Contender Berlin",
+            "StartDateTime": day(-2),
+            "EndDateTime": day(2),
+        },
+        {
+            "EventName": "U19 Boys Singles",
+            "StartDateTime": day(-10),
+            "EndDateTime": day(-5),
+        },
+        {
+            "EventName": "Doha VETERANS Open",
+            "StartDateTime": day(1),
+            "EndDateTime": day(3),
+        },
+        {"EventName": "", "StartDateTime": "not a date", "EndDateTime": day(1)},
+        {"StartDateTime": day(-1)},
+    ]
+
+    classified = classify_events(rows, current_date=now)
+
+    assert classified["is_senior"].to_list() == [
+        is_senior_event(row.get("EventName")) for row in rows
+    ]
+    assert classified["status"].to_list() == [
+        get_date_status(
+            parse_event_date(row.get("StartDateTime")),
+            parse_event_date(row.get("EndDateTime")),
+            now,
+        )
+        for row in rows
+    ]
+
+
+def test_get_date_statuses_uses_one_reference_date():
+    """
+    Tests the vectorized statuses against an explicit reference date.
+    """
+    now = datetime(2025, 6, 15)
+    starts = [
+        now + timedelta(days=5),
+        now - timedelta(days=1),
+        now - timedelta(days=9),
+        None,
+    ]
+    ends = [
+        now + timedelta(days=9),
+        now + timedelta(days=1),
+        now - timedelta(days=2),
+        now,
+    ]
+
+    assert get_date_statuses(starts, ends, now) == [
+        "future",
+        "ongoing",
+        "completed",
+        None,
+    ]
@@ -1,5 +1,11 @@
 import json
-from src.utils.io_handler import save_raw_json, json_exists
+from src.utils.io_handler import (
+    count_raw_rows,
+    json_exists,
+    raw_meta_path,
+    read_raw_meta,
+    save_raw_json,
+)
 from src.utils.helper_logic import get_event_count_from_file
 import pytest
 
@@ -151,3 +157,49 @@ def test_get_event_count_matches_api_response(events_by_year_fixtures_dir, year_
         data = json.load(f)
         api_provided_count = data[0].get("Count", 0)
     assert function_count == api_provided_count
+
+
+def test_save_raw_json_writes_sidecar_metadata(tmp_path):
+    """
+    Tests that save_raw_json writes row count, hash and save time next to the file,
+    and that the count is answered from it without reading the payload.
+
+    Asserts:
+        The sidecar describes the stored file and is not picked up by raw globs.
+        count_raw_rows returns the sidecar row count.
+    """
+    data = [{"Count": 3, "rows": [{"EventId": 1}, {"EventId": 2}, {"EventId": 3}]}]
+    assert save_raw_json(data, tmp_path, "events_2024.json") is True
+
+    meta = read_raw_meta(tmp_path, "events_2024.json")
+    assert meta is not None
+    assert meta.stored_name == "events_2024.json"
+    assert meta.row_count == 3
+    assert len(meta.content_hash) == 64
+    assert meta.fetched_at > 0
+    assert raw_meta_path(tmp_path, "events_2024.json").exists()
+    assert [p.name for p in tmp_path.glob("*.json*")] == ["events_2024.json"]
+
+    assert count_raw_rows(tmp_path, "events_2024.json") == 3
+
+
+def test_count_raw_rows_ignores_stale_sidecar(tmp_path):
+    """
+    Tests that a file rewritten outside save_raw_json is counted from its bytes.
+
+    Asserts:
+        The stale sidecar is ignored and the rows are counted from the file.
+        Missing and corrupt files count as 0.
+    """
+    filename = "event_matches_1.json"
+    save_raw_json([{"documentCode": "A"}], tmp_path, filename)
+
+    with open(tmp_path / filename, "w", encoding="utf-8") as f:
+        json.dump([{"documentCode": "A"}, {"documentCode": "B"}], f, indent=4)
+
+    assert read_raw_meta(tmp_path, filename) is None
+    assert count_raw_rows(tmp_path, filename) == 2
+
+    (tmp_path / filename).write_text("{not json", encoding="utf-8")
+    assert count_raw_rows(tmp_path, filename) == 0
+    assert count_raw_rows(tmp_path, "missing.json") == 0
@@ -0,0 +1,141 @@
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.utils import match_index as match_index_module
+from src.utils.io_handler import save_raw_json
+from src.utils.match_index import MatchIndex
+from src.utils.raw_data_reporter import get_raw_event_matches_summary
+
+
+def matches_payload(count: int) -> list:
+    """
+    Returns an event matches payload with the given number of rows.
+    """
+    return [{"documentCode": f"TTE{i}"} for i in range(count)]
+
+
+@pytest.fixture
+def event_matches_dir(tmp_path: Path) -> Path:
+    """
+    Returns an event matches directory with files in two year directories.
+    """
+    folder = tmp_path / "event_matches"
+    save_raw_json(matches_payload(3), folder / "2023", "event_matches_1.json")
+    save_raw_json(matches_payload(0), folder / "2023", "event_matches_2.json")
+    save_raw_json(
+        matches_payload(5),
+        folder / "2024",
+        "event_matches_3.json",
+        storage_format="json.gz",
+    )
+    return folder
+
+
+def test_match_index_counts_every_file(event_matches_dir: Path):
+    """
+    Tests that every file gives one row with its year, event id and match count.
+    """
+    frame = MatchIndex(event_matches_dir).refresh(workers=1).frame()
+
+    assert frame.sort("source_file").rows() == [
+        ("2023/event_matches_1.json", 2023, 1, 3),
+        ("2023/event_matches_2.json", 2023, 2, 0),
+        ("2024/event_matches_3.json", 2024, 3, 5),
+    ]
+
+
+def test_match_index_only_scans_changed_files(event_matches_dir: Path):
+    """
+    Tests that files are served from the snapshot or their sidecar, and only
+    files rewritten outside save_raw_json are read.
+
+    Asserts:
+        Files saved by save_raw_json are answered from their sidecars.
+        A file with a current sidecar is not scanned, an edited file is.
+    """
+    first = MatchIndex(event_matches_dir).refresh(workers=1)
+    assert first.scanned == 0  # every file has a save_raw_json sidecar
+
+    save_raw_json(
+        matches_payload(4), event_matches_dir / "2023", "event_matches_2.json"
+    )
+    with open(event_matches_dir / "2023" / "event_matches_1.json", "w") as f:
+        json.dump(matches_payload(7), f)
+
+    second = MatchIndex(event_matches_dir).refresh(workers=1)
+    counts = dict(second.frame().select("event_id", "matches").rows())
+
+    assert second.scanned == 1
+    assert counts == {1: 7, 2: 4, 3: 5}
+
+
+def test_match_index_scans_in_process_pool(event_matches_dir: Path, monkeypatch):
+    """
+    Tests that a pool scan gives the same aggregates as an in-process scan.
+    """
+    monkeypatch.setattr(match_index_module, "POOL_MIN_FILES", 1)
+    for path in event_matches_dir.glob("*/.*.meta"):
+        path.unlink()
+
+    pooled = MatchIndex(event_matches_dir).refresh(workers=2)
+    assert pooled.scanned == 3
+    assert pooled.frame().sort("source_file")["matches"].to_list() == [3, 0, 5]
+
+
+def test_raw_event_matches_summary(tmp_path: Path, event_matches_dir: Path):
+    """
+    Tests the coverage of completed senior events by event matches files.
+
+    Asserts:
+        Events with a non-empty matches file count as covered, matches are summed per year.
+    """
+    start = (datetime.now() - timedelta(days=10)).strftime("%Y-%m-%dT%H:%M:%S")
+    end = (datetime.now() - timedelta(days=5)).strftime("%Y-%m-%dT%H:%M:%S")
+    rows = [
+        {
+            "EventId": event_id,
+            "EventName": name,
+            "StartDateTime": start,
+            "EndDateTime": end,
+        }
+        for event_id, name in [
+            (1, "WTT Champions"),
+            (2, "WTT Contender"),
+            (4, "WTT Youth Contender"),
+        ]
+    ]
+    events_dir = tmp_path / "events"
+    save_raw_json([{"Count": len(rows), "rows": rows}], events_dir, "events_2023.json")
+
+    summary = get_raw_event_matches_summary(events_dir, event_matches_dir, workers=1)
+
+    assert "| 2023 | 2 | 1 | 1 | 2 | 3 |" in summary
+    assert "| 2024 | 0 | 0 | 0 | 1 | 5 |" in summary
+    assert "| **Total** | 2 | 1 | 1 | 3 | 8 |" in summary
+
+
+def test_raw_event_matches_summary_counts_boundary_events_once(
+    tmp_path: Path, event_matches_dir: Path
+):
+    """
+    Tests that an event listed in two year files is counted once, under its start year.
+    """
+    start = datetime(2023, 12, 28)
+    row = {
+        "EventId": 1,
+        "EventName": "WTT Champions",
+        "StartDateTime": start.strftime("%Y-%m-%dT%H:%M:%S"),
+        "EndDateTime": (start + timedelta(days=6)).strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    events_dir = tmp_path / "events"
+    for year in (2023, 2024):
+        save_raw_json([{"Count": 1, "rows": [row]}], events_dir, f"events_{year}.json")
+
+    summary = get_raw_event_matches_summary(events_dir, event_matches_dir, workers=1)
+
+    assert "| 2023 | 1 | 1 | 0 |" in summary
+    assert "| 2024 | 0 | 0 | 0 |" in summary
+    assert "| **Total** | 1 | 1 | 0 |" in summary
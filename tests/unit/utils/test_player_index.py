@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils.io_handler import save_raw_json
+from src.utils.player_index import PlayerIndex, extract_players
+from src.utils.wtt_models import to_match_records
+
+
+def singles(document_code: str, home: str, away: str) -> dict:
+    """
+    Returns an event matches row between two singles players.
+    """
+    return {
+        "documentCode": document_code,
+        "competitiors": [
+            {"competitorType": "H", "competitorId": home, "competitorName": home},
+            {"competitorType": "A", "competitorId": away, "competitorName": away},
+        ],
+    }
+
+
+@pytest.fixture
+def player_index(tmp_path: Path):
+    """
+    Returns a player index in a temporary database.
+    """
+    with PlayerIndex(tmp_path / "players.sqlite") as index:
+        yield index
+
+
+def test_extract_players_singles_and_doubles():
+    """
+    Tests that singles competitors and the players of doubles pairs are extracted once.
+    """
+    doubles = {
+        "documentCode": "MD",
+        "competitiors": [
+            {
+                "competitorId": "PAIR",
+                "players": [
+                    {"playerId": 1, "playerName": "A", "playerOrgCode": "CHN"},
+                    {"playerId": 2, "playerName": "B", "playerOrgCode": "CHN"},
+                ],
+            }
+        ],
+    }
+    records = to_match_records([singles("M1", "1", "3"), doubles])
+
+    assert extract_players(records) == {
+        "1": ("A", "CHN"),
+        "2": ("B", "CHN"),
+        "3": ("3", None),
+    }
+
+
+def test_harvest_only_reads_new_or_changed_files(tmp_path: Path, player_index):
+    """
+    Tests that players are deduplicated across files and runs.
+
+    Asserts:
+        Players shared by many matches are stored once.
+        A second harvest reads nothing, a changed file is read again.
+    """
+    matches_dir = tmp_path / "event_matches"
+    save_raw_json(
+        [singles("M1", "1", "2"), singles("M2", "1", "3")],
+        matches_dir / "2024",
+        "event_matches_10.json",
+    )
+    save_raw_json(
+        [singles("M1", "2", "3")], matches_dir / "2025", "event_matches_11.json"
+    )
+
+    first = player_index.harvest(matches_dir)
+    second = player_index.harvest(matches_dir)
+    with open(matches_dir / "2025" / "event_matches_11.json", "w") as f:
+        json.dump([singles("M1", "2", "4"), singles("M2", "5", "5")], f)
+    third = player_index.harvest(matches_dir)
+
+    assert (first.files, first.parsed, first.new_players) == (2, 2, 3)
+    assert (second.parsed, second.new_players) == (0, 0)
+    assert (third.parsed, third.new_players) == (1, 2)
+    assert player_index.stats(max_age=60).players == 5
+
+
+def test_due_respects_freshness_window(tmp_path: Path, player_index):
+    """
+    Tests that only players never fetched or fetched before the window are due.
+    """
+    matches_dir = tmp_path / "event_matches"
+    save_raw_json(
+        [singles("M1", "1", "2"), singles("M2", "3", "4")],
+        matches_dir / "2024",
+        "event_matches_10.json",
+    )
+    player_index.harvest(matches_dir)
+
+    player_index.mark_fetched(["1"], fetched_at=1_000.0)
+    player_index.mark_fetched(["2"], fetched_at=1_900.0)
+
+    assert player_index.due(max_age=500, now=2_000.0) == ["3", "4", "1"]
+    assert player_index.due(max_age=500, now=2_000.0, limit=2) == ["3", "4"]
+    assert player_index.stats(max_age=500, now=2_000.0) == (4, 2, 3)
@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from src.utils.api_client import TTStatsClient
+from src.utils.rate_limiter import AdaptiveRateLimiter
+
+
+def test_limiter_increases_while_healthy():
+    """
+    Tests that fast, successful responses ramp rate and concurrency up.
+
+    Asserts:
+        Rate and concurrency grow but never exceed their maximums.
+    """
+    limiter = AdaptiveRateLimiter(
+        initial_rate=5, max_rate=8, initial_concurrency=2, max_concurrency=4
+    )
+
+    for _ in range(200):
+        limiter.record_response(200, latency=0.05)
+
+    state = limiter.state()
+    assert state.rate == 8
+    assert state.concurrency == 4
+    assert state.throttled == 0
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 503])
+def test_limiter_backs_off_once_per_burst(status_code: int):
+    """
+    Tests that throttling responses halve rate and concurrency, and that a burst
+    of failures inside the cooldown only backs off once.
+
+    Asserts:
+        Rate and concurrency are halved once and all failures are counted.
+    """
+    limiter = AdaptiveRateLimiter(
+        initial_rate=20, initial_concurrency=10, decrease_cooldown=60
+    )
+
+    for _ in range(5):
+        limiter.record_response(status_code, latency=0.1)
+
+    state = limiter.state()
+    assert state.rate == 10
+    assert state.concurrency == 5
+    assert state.throttled == 5
+    assert state.decreases == 1
+
+
+def test_limiter_failure_counts_as_throttle():
+    """
+    Tests that timeouts / connection errors reported via record_failure back off.
+
+    Asserts:
+        The rate never drops below min_rate.
+    """
+    limiter = AdaptiveRateLimiter(initial_rate=1.5, min_rate=1, decrease_cooldown=0)
+
+    limiter.record_failure()
+    limiter.record_failure()
+
+    assert limiter.state().rate == 1
+    assert limiter.state().decreases == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_in_flight_requests():
+    """
+    Tests that no more than `concurrency` requests hold a slot at once.
+
+    Asserts:
+        The observed peak of in-flight requests equals the concurrency limit.
+    """
+    limiter = AdaptiveRateLimiter(
+        initial_rate=1000, max_rate=1000, initial_concurrency=3, max_concurrency=3
+    )
+    peak = 0
+
+    async def worker():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.state().in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(worker() for _ in range(12)))
+
+    assert peak == 3
+    assert limiter.state().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_client_feeds_responses_to_limiter(wtt_api_mock: respx.Router):
+    """
+    Tests that TTStatsClient reports every response to its limiter.
+
+    Asserts:
+        The limiter counted both requests and the 429 as throttled.
+    """
+    wtt_api_mock.get(url__regex=r".*/ok").mock(return_value=httpx.Response(200))
+    wtt_api_mock.get(url__regex=r".*/busy").mock(return_value=httpx.Response(429))
+    stats_client = TTStatsClient()
+
+    async with httpx.AsyncClient() as http_client:
+        await stats_client.send_async(http_client, "GET", "https://wtt.test/ok")
+        await stats_client.send_async(http_client, "GET", "https://wtt.test/busy")
+
+    state = stats_client.limiter_for("https://wtt.test").state()
+    assert state.requests == 2
+    assert state.throttled == 1
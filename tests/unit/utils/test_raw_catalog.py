@@ -0,0 +1,114 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils.io_handler import save_raw_json, json_exists
+from src.utils.raw_catalog import FetchSource, RawCatalog, count_rows
+
+
+@pytest.fixture
+def catalog(tmp_path: Path):
+    """
+    Returns a RawCatalog stored in the temporary directory.
+    """
+    with RawCatalog(tmp_path / "catalog.sqlite") as raw_catalog:
+        yield raw_catalog
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ([{"Count": 2, "rows": [{"EventId": 1}, {"EventId": 2}]}], 2),
+        ([{"matchId": 1}, {"matchId": 2}, {"matchId": 3}], 3),
+        ([], 0),
+        ({"error": "Not Found"}, 0),
+    ],
+)
+def test_count_rows(data, expected):
+    """
+    Tests that count_rows handles both events and event matches payloads.
+
+    Asserts:
+        The function returns the expected number of rows.
+    """
+    assert count_rows(data) == expected
+
+
+def test_save_raw_json_records_entry(tmp_path: Path, catalog: RawCatalog):
+    """
+    Tests that save_raw_json records the written file in the catalog.
+
+    Asserts:
+        The entry matches the file on disk and the payload row count.
+    """
+    data = [{"matchId": 1}, {"matchId": 2}]
+    assert save_raw_json(data, tmp_path, "event_matches_1.json", catalog=catalog)
+
+    filepath = tmp_path / "event_matches_1.json"
+    entry = catalog.get(filepath)
+
+    assert entry is not None
+    assert entry.is_valid is True
+    assert entry.row_count == 2
+    assert entry.size == filepath.stat().st_size
+    assert json_exists(tmp_path, "event_matches_1.json", catalog) is True
+
+
+def test_catalog_lookup_does_not_open_recorded_files(
+    tmp_path: Path, catalog: RawCatalog, monkeypatch
+):
+    """
+    Tests that a recorded, unchanged file is answered from the catalog alone.
+
+    Asserts:
+        The file contents are never read during the lookup.
+    """
+    save_raw_json([{"matchId": 1}], tmp_path, "event_matches_1.json", catalog=catalog)
+
+    def fail_read(*args, **kwargs):
+        raise AssertionError("file should not be read")
+
+    monkeypatch.setattr(Path, "read_bytes", fail_read)
+
+    assert catalog.is_valid_json(tmp_path, "event_matches_1.json") is True
+
+
+def test_catalog_revalidates_externally_modified_file(
+    tmp_path: Path, catalog: RawCatalog
+):
+    """
+    Tests that files changed outside save_raw_json are re-validated.
+
+    Asserts:
+        An unknown valid file is recorded, a corrupted file is reported as invalid
+        and a deleted file is reported as missing.
+    """
+    filepath = tmp_path / "events_2025.json"
+    filepath.write_text(json.dumps([{"rows": [{"EventId": 1}]}]))
+
+    assert catalog.is_valid_json(tmp_path, filepath.name) is True
+    assert catalog.get(filepath).row_count == 1
+
+    filepath.write_text("{This is not valid JSON, and is longer than before}")
+    assert catalog.is_valid_json(tmp_path, filepath.name) is False
+
+    filepath.unlink()
+    assert catalog.is_valid_json(tmp_path, filepath.name) is False
+    assert catalog.get(filepath) is None
+
+
+def test_record_without_source_keeps_validators(tmp_path: Path, catalog: RawCatalog):
+    """
+    Tests that re-recording a file without a response (e.g. a migration) keeps
+    the validators of the response it was fetched from.
+
+    Asserts:
+        source_hash, etag and last_modified survive the save without a source.
+    """
+    source = FetchSource("abc123", etag='"v1"', last_modified="Mon, 06 Jan 2025")
+    save_raw_json([{"matchId": 1}], tmp_path, "m.json", catalog=catalog, source=source)
+    save_raw_json([{"matchId": 1}], tmp_path, "m.json", catalog=catalog)
+
+    entry = catalog.get(tmp_path / "m.json")
+    assert (entry.source_hash, entry.etag, entry.last_modified) == source
@@ -0,0 +1,133 @@
+from pathlib import Path
+
+import pytest
+
+from src.utils.io_handler import json_exists, load_raw_json, save_raw_json
+from src.utils.helper_logic import get_event_count_from_file
+from src.utils.migrate_raw_storage import migrate_raw_tree
+from src.utils.raw_catalog import RawCatalog
+from src.utils.raw_storage import iter_raw_files, resolve_raw_path, scan_stored_files
+
+EVENTS_PAYLOAD = [{"Count": 2, "rows": [{"EventId": 1}, {"EventId": 2}]}]
+
+
+@pytest.mark.parametrize(
+    "storage_format, stored_name",
+    [
+        ("json", "events_2025.json"),
+        ("json.gz", "events_2025.json.gz"),
+        ("json.zst", "events_2025.json.zst"),
+    ],
+)
+def test_save_and_load_round_trip(tmp_path: Path, storage_format, stored_name):
+    """
+    Tests that every storage format is readable through the logical filename.
+
+    Asserts:
+        The file is stored with the format suffix and all readers see the payload.
+    """
+    assert save_raw_json(
+        EVENTS_PAYLOAD, tmp_path, "events_2025.json", storage_format=storage_format
+    )
+
+    assert resolve_raw_path(tmp_path, "events_2025.json").name == stored_name
+    assert load_raw_json(tmp_path, "events_2025.json") == EVENTS_PAYLOAD
+    assert json_exists(tmp_path, "events_2025.json") is True
+    assert get_event_count_from_file(tmp_path, "events_2025.json") == 2
+    assert iter_raw_files(tmp_path, "events_*.json") == [tmp_path / "events_2025.json"]
+
+
+def test_compressed_storage_is_compact(tmp_path: Path):
+    """
+    Tests that compressed storage is smaller than the indented plain JSON.
+
+    Asserts:
+        The zst file is smaller than the plain file for a repetitive payload.
+    """
+    payload = [{"matchId": i, "teamA": "CHN", "teamB": "JPN"} for i in range(500)]
+    save_raw_json(payload, tmp_path / "plain", "m.json", storage_format="json")
+    save_raw_json(payload, tmp_path / "zst", "m.json", storage_format="json.zst")
+
+    plain_size = (tmp_path / "plain" / "m.json").stat().st_size
+    zst_size = (tmp_path / "zst" / "m.json.zst").stat().st_size
+    assert zst_size * 5 < plain_size
+
+
+def test_save_replaces_copies_in_other_formats(tmp_path: Path):
+    """
+    Tests that re-saving in a new format leaves a single stored copy.
+
+    Asserts:
+        Only the latest format remains and the catalog follows it.
+    """
+    with RawCatalog(tmp_path / "catalog.sqlite") as catalog:
+        save_raw_json([1], tmp_path, "e.json", catalog, storage_format="json")
+        save_raw_json([1, 2], tmp_path, "e.json", catalog, storage_format="json.gz")
+
+        assert sorted(p.name for p in tmp_path.glob("e.json*")) == ["e.json.gz"]
+        entry = catalog.lookup(tmp_path / "e.json")
+        assert entry.row_count == 2
+        assert entry.stored_path.endswith("e.json.gz")
+
+
+def test_migrate_raw_tree(tmp_path: Path):
+    """
+    Tests the one-shot migration of an existing plain JSON tree.
+
+    Asserts:
+        Every file is converted once, payloads are unchanged and a second
+        run has nothing left to do.
+    """
+    raw_dir = tmp_path / "raw"
+    save_raw_json(EVENTS_PAYLOAD, raw_dir / "events", "events_2024.json")
+    save_raw_json(
+        [{"matchId": 1}], raw_dir / "event_matches" / "2024", "event_matches_7.json"
+    )
+
+    result = migrate_raw_tree(raw_dir, "json.zst")
+
+    assert result.converted == 2
+    assert result.failed == 0
+    assert not list(raw_dir.rglob("*.json"))
+    assert load_raw_json(raw_dir / "events", "events_2024.json") == EVENTS_PAYLOAD
+    assert migrate_raw_tree(raw_dir, "json.zst").converted == 0
+
+
+def test_json_exists_detects_corrupt_compressed_file(tmp_path: Path):
+    """
+    Tests that a truncated compressed file is reported as invalid.
+
+    Asserts:
+        json_exists returns False for the corrupt file.
+    """
+    save_raw_json(EVENTS_PAYLOAD, tmp_path, "e.json", storage_format="json.gz")
+    stored = tmp_path / "e.json.gz"
+    stored.write_bytes(stored.read_bytes()[:10])
+
+    assert json_exists(tmp_path, "e.json") is False
+
+
+def test_scan_stored_files_picks_same_copy_as_resolve(tmp_path: Path):
+    """
+    Tests that one directory read finds the same stored files as resolve_raw_path,
+    including a file left behind in two formats.
+
+    Asserts:
+        Logical names map to the stored copy resolve_raw_path would pick.
+        Sidecars, temporary files and other names are ignored.
+    """
+    save_raw_json(EVENTS_PAYLOAD, tmp_path, "event_matches_1.json")
+    save_raw_json(
+        EVENTS_PAYLOAD, tmp_path, "event_matches_2.json", storage_format="json.gz"
+    )
+    (tmp_path / "event_matches_1.json.gz").write_bytes(b"stale copy")
+    (tmp_path / ".event_matches_3.json.abc.tmp").write_bytes(b"")
+    (tmp_path / "events_2024.json").write_text("[]")
+
+    found = scan_stored_files(tmp_path, "event_matches_*.json")
+
+    assert {name: entry.name for name, entry in found.items()} == {
+        name: resolve_raw_path(tmp_path, name).name
+        for name in ("event_matches_1.json", "event_matches_2.json")
+    }
+    assert found["event_matches_1.json"].name == "event_matches_1.json"
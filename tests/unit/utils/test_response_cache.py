@@ -0,0 +1,120 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.utils import response_cache
+from src.utils.response_cache import CacheMissError, ResponseCache
+
+URL = "https://example.com/api/cms/GetOfficialResult"
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    """
+    Returns a recording ResponseCache stored in the temporary directory.
+    """
+    with ResponseCache(tmp_path / "cache.sqlite") as response_cache:
+        yield response_cache
+
+
+def make_response(body: bytes = b'[{"matchId": 1}]', status: int = 200):
+    return httpx.Response(
+        status, content=body, headers={"content-type": "application/json"}
+    )
+
+
+def test_put_and_get(cache: ResponseCache):
+    """
+    Tests that a stored response is served back for the same request only.
+
+    Asserts:
+        Same method, url and params hit, different params miss.
+    """
+    assert cache.put(make_response(), "GET", URL, params={"EventId": "1"})
+
+    cached = cache.get("GET", URL, params={"EventId": "1"})
+    assert cached is not None
+    assert cached.status_code == 200
+    assert cached.json() == [{"matchId": 1}]
+    assert cache.get("GET", URL, params={"EventId": "2"}) is None
+    assert cache.stats()[:3] == (1, 1, 1)
+
+
+def test_expired_entry_is_a_miss(cache: ResponseCache, monkeypatch):
+    """
+    Tests that a response is no longer served once its TTL has passed,
+    while a response without TTL never expires.
+    """
+    now = 1_000_000.0
+    monkeypatch.setattr(response_cache.time, "time", lambda: now)
+    cache.put(make_response(), "GET", URL, params={"EventId": "1"}, ttl=60)
+    cache.put(make_response(), "GET", URL, params={"EventId": "2"}, ttl=None)
+
+    now += 61
+    assert cache.get("GET", URL, params={"EventId": "1"}) is None
+    assert cache.get("GET", URL, params={"EventId": "2"}) is not None
+
+
+def test_least_recently_used_are_evicted(tmp_path: Path, monkeypatch):
+    """
+    Tests that the least recently used responses are evicted above max_bytes.
+    """
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(response_cache.time, "time", lambda: float(next(clock)))
+    body = b"x" * 100
+    with ResponseCache(tmp_path / "cache.sqlite", max_bytes=250) as cache:
+        cache.put(make_response(body), "GET", URL, params={"EventId": "1"})
+        cache.put(make_response(body), "GET", URL, params={"EventId": "2"})
+        # touch 1, so 2 is the least recently used
+        assert cache.get("GET", URL, params={"EventId": "1"}) is not None
+        cache.put(make_response(body), "GET", URL, params={"EventId": "3"})
+
+        assert cache.get("GET", URL, params={"EventId": "2"}) is None
+        assert cache.get("GET", URL, params={"EventId": "1"}) is not None
+        assert cache.get("GET", URL, params={"EventId": "3"}) is not None
+        assert cache.stats().evicted == 1
+        assert cache.stats().size_bytes == 200
+
+
+def test_size_is_tracked_across_replaces_and_reopen(tmp_path: Path):
+    """
+    Tests that the running size total follows replaced entries and a reopened cache.
+    """
+    db_path = tmp_path / "cache.sqlite"
+    with ResponseCache(db_path) as cache:
+        cache.put(make_response(b"x" * 100), "GET", URL, params={"EventId": "1"})
+        cache.put(make_response(b"x" * 40), "GET", URL, params={"EventId": "1"})
+        cache.put(make_response(b"x" * 10), "GET", URL, params={"EventId": "2"})
+        assert cache.stats().size_bytes == 50
+
+    with ResponseCache(db_path) as cache:
+        assert cache.stats().size_bytes == 50
+
+
+def test_errors_are_not_cached(cache: ResponseCache):
+    """
+    Tests that only 200 responses are stored.
+    """
+    assert not cache.put(make_response(b"", 304), "GET", URL)
+    assert not cache.put(make_response(b"{}", 503), "GET", URL)
+    assert cache.get("GET", URL) is None
+
+
+def test_replay_ignores_expiry_and_raises_on_miss(tmp_path: Path, monkeypatch):
+    """
+    Tests that replay mode serves expired recordings and fails on unrecorded requests.
+    """
+    now = 1_000_000.0
+    monkeypatch.setattr(response_cache.time, "time", lambda: now)
+    db_path = tmp_path / "cache.sqlite"
+    with ResponseCache(db_path) as cache:
+        cache.put(make_response(), "POST", URL, json_payload={"year": 2020}, ttl=60)
+
+    now += 3600
+    with ResponseCache(db_path, mode="replay") as cache:
+        assert cache.get("POST", URL, json_payload={"year": 2020}) is not None
+        with pytest.raises(CacheMissError):
+            cache.get("POST", URL, json_payload={"year": 2021})
+        # replay never records
+        assert not cache.put(make_response(), "POST", URL, json_payload={"year": 2021})
@@ -0,0 +1,152 @@
+import httpx
+import pytest
+import respx
+
+from src.utils.api_client import TTStatsClient
+from src.utils.rate_limiter import AdaptiveRateLimiter
+from src.utils.retry_policy import RetryPolicy, parse_retry_after
+from src.utils.routes import WTTRoutes
+
+
+def fast_client(retry_policy: RetryPolicy) -> TTStatsClient:
+    """
+    Returns a client whose limiter never throttles the test.
+    """
+    limiter = AdaptiveRateLimiter(initial_rate=1000, max_rate=1000)
+    return TTStatsClient(limiter=limiter, retry_policy=retry_policy)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("7", 7.0),
+        ("0", 0.0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),  # a date in the past
+        ("soon", None),
+        (None, None),
+    ],
+)
+def test_parse_retry_after(header, expected):
+    """
+    Tests parsing of Retry-After as seconds or an HTTP-date.
+
+    Asserts:
+        The parsed delay matches the expected number of seconds.
+    """
+    headers = {"retry-after": header} if header is not None else {}
+    response = httpx.Response(429, headers=headers)
+
+    assert parse_retry_after(response) == expected
+
+
+@pytest.mark.parametrize("status_code", [429, 502, 503, 504])
+@pytest.mark.asyncio
+async def test_retries_retryable_status_then_succeeds(
+    wtt_api_mock: respx.Router, status_code: int
+):
+    """
+    Tests that every WTTRoutes route is retried on throttling / gateway statuses.
+
+    Asserts:
+        The final response is the successful one and the retry is counted by status.
+    """
+    policy = RetryPolicy(base_delay=0.0, max_delay=0.0)
+    client = fast_client(policy)
+    route = WTTRoutes.get_event_matches_route(3001)
+    wtt_api_mock.get(url__regex=r".*GetOfficialResult.*").mock(
+        side_effect=[httpx.Response(status_code), httpx.Response(200, json=[])]
+    )
+
+    async with httpx.AsyncClient() as http_client:
+        response = await client.fetch_route_async(http_client, route)
+
+    assert response.status_code == 200
+    assert policy.stats().retries == 1
+    assert policy.stats().by_reason == {str(status_code): 1}
+
+
+@pytest.mark.asyncio
+async def test_retry_honours_retry_after(wtt_api_mock: respx.Router, monkeypatch):
+    """
+    Tests that the wait before a retry comes from the Retry-After header.
+
+    Asserts:
+        The policy slept for exactly the Retry-After duration.
+    """
+    policy = RetryPolicy(base_delay=100.0, max_delay=100.0)
+    client = fast_client(policy)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("asyncio.sleep", fake_sleep)
+    wtt_api_mock.post(url__regex=r".*/api/eventcalendar").mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(200, json=[{"rows": []}]),
+        ]
+    )
+    route = WTTRoutes.get_events_year_route(2025)
+
+    async with httpx.AsyncClient() as http_client:
+        data = await client.post_wtt_async(
+            http_client, route["url"], route["json_payload"], route["headers"]
+        )
+
+    assert data == [{"rows": []}]
+    assert 3.0 in sleeps
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_status_is_not_retried(wtt_api_mock: respx.Router):
+    """
+    Tests that client errors such as 404 fail straight away.
+
+    Asserts:
+        Only one request was sent and no retry was counted.
+    """
+    policy = RetryPolicy(base_delay=0.0, max_delay=0.0)
+    client = fast_client(policy)
+    mock_route = wtt_api_mock.get(url__regex=r".*GetOfficialResult.*").mock(
+        return_value=httpx.Response(404)
+    )
+
+    async with httpx.AsyncClient() as http_client:
+        response = await client.fetch_route_async(
+            http_client, WTTRoutes.get_event_matches_route(1)
+        )
+
+    assert response.status_code == 404
+    assert mock_route.call_count == 1
+    assert policy.stats().retries == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_is_shared_across_requests(wtt_api_mock: respx.Router):
+    """
+    Tests that the per-run retry budget stops retries once it is spent.
+
+    Asserts:
+        Retries stop at the budget and the exhausted requests are reported as gave up.
+    """
+    policy = RetryPolicy(base_delay=0.0, max_delay=0.0, max_attempts=5, retry_budget=3)
+    client = fast_client(policy)
+    mock_route = wtt_api_mock.get(url__regex=r".*GetOfficialResult.*").mock(
+        return_value=httpx.Response(503)
+    )
+
+    async with httpx.AsyncClient() as http_client:
+        first = await client.fetch_route_async(
+            http_client, WTTRoutes.get_event_matches_route(1)
+        )
+        second = await client.fetch_route_async(
+            http_client, WTTRoutes.get_event_matches_route(2)
+        )
+
+    stats = policy.stats()
+    assert first.status_code == second.status_code == 503
+    assert mock_route.call_count == 5  # 1 + 3 retries, then 1 without budget
+    assert stats.retries == 3
+    assert stats.budget_remaining == 0
+    assert stats.gave_up == 2
@@ -0,0 +1,110 @@
+import time
+from datetime import datetime, timedelta
+
+from src.utils.scheduler import (
+    PRIORITY_HISTORICAL,
+    PRIORITY_ONGOING,
+    PRIORITY_RECENT,
+    RunBudget,
+    count_by_priority,
+    event_priority,
+)
+
+
+def test_event_priority():
+    """
+    Tests the ongoing > recently completed > historical classification.
+    """
+    now = datetime(2025, 6, 1)
+
+    assert event_priority("ongoing", now - timedelta(days=90), now) == PRIORITY_ONGOING
+    assert event_priority("completed", now - timedelta(days=5), now) == PRIORITY_RECENT
+    assert (
+        event_priority("completed", now - timedelta(days=5), now, recent_days=3)
+        == PRIORITY_HISTORICAL
+    )
+    assert (
+        event_priority("completed", now - timedelta(days=900), now)
+        == PRIORITY_HISTORICAL
+    )
+    assert event_priority("completed", None, now) == PRIORITY_HISTORICAL
+
+
+def test_budget_limits_requests_and_keeps_remaining():
+    """
+    Tests that take() stops at max_tasks and keeps the items it did not hand out.
+    """
+    budget = RunBudget(max_tasks=3)
+
+    assert list(budget.take(range(10))) == [0, 1, 2]
+    assert budget.remaining == list(range(3, 10))
+    assert budget.exhausted_by() == "max_tasks"
+
+    assert count_by_priority([0, 1, 2], {0: PRIORITY_ONGOING, 1: PRIORITY_RECENT}) == {
+        "ongoing": 1,
+        "recently completed": 1,
+        "historical": 1,
+    }
+
+
+def test_budget_limits_sent_requests():
+    """
+    Tests that take() stops once max_requests were sent since the budget was created.
+
+    Asserts:
+        Requests sent before the budget do not count, retries of a task do.
+    """
+    sent = [5]  # sent by an earlier run of the client
+    budget = RunBudget(max_requests=4, requests_sent=lambda: sent[0])
+    taken = []
+    for item in budget.take(range(10)):
+        taken.append(item)
+        sent[0] += 2  # one request and one retry per item
+
+    assert taken == [0, 1]
+    assert budget.requests == 4
+    assert budget.exhausted_by() == "max_requests"
+
+
+def test_budget_admit_rechecks_queued_items():
+    """
+    Tests that an item handed out before the budget ran out does not start after.
+
+    Asserts:
+        The item is refused, kept in remaining and no longer counted as dispatched.
+    """
+    sent = [0]
+    budget = RunBudget(max_requests=1, requests_sent=lambda: sent[0])
+    items = budget.take(range(5))
+    queued = [next(items), next(items)]  # the queue runs ahead of the workers
+
+    assert budget.admit(queued[0]) is True
+    sent[0] += 1
+    assert budget.admit(queued[1]) is False
+    assert list(items) == []
+    assert sorted(budget.remaining) == [1, 2, 3, 4]
+    assert budget.dispatched == 1
+
+
+def test_budget_limits_time():
+    """
+    Tests that take() stops handing out items once max_seconds have passed.
+    """
+    budget = RunBudget(max_seconds=0.05)
+    taken = []
+    for item in budget.take(range(100)):
+        taken.append(item)
+        time.sleep(0.02)
+
+    assert 1 <= len(taken) < 100
+    assert len(taken) + len(budget.remaining) == 100
+    assert budget.exhausted_by() == "max_seconds"
+
+
+def test_unlimited_budget_takes_everything():
+    budget = RunBudget()
+
+    assert not budget.limited
+    assert list(budget.take(range(5))) == list(range(5))
+    assert budget.remaining == []
+    assert budget.exhausted_by() is None
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from src.utils.task_journal import TaskJournal
+
+
+def test_journal_tracks_task_states(tmp_path: Path):
+    """
+    Tests the planned -> in flight -> done / failed life cycle of a run.
+
+    Asserts:
+        pending keeps queue order and includes in-flight tasks, failures
+        keep their error class and can be filtered by it.
+    """
+    with TaskJournal(tmp_path / "journal.sqlite") as journal:
+        tasks = [(30, 2024), (10, 2024), ("abc", 2023), (20, 2025)]
+        run_id = journal.start_run("event_matches", tasks)
+
+        journal.mark_in_flight(run_id, (30, 2024))
+        journal.mark_done(run_id, (30, 2024))
+        journal.mark_in_flight(run_id, (10, 2024))
+        journal.mark_failed(run_id, (10, 2024), "ReadTimeout")
+        journal.mark_in_flight(run_id, ("abc", 2023))
+        journal.mark_failed(run_id, ("abc", 2023), "HTTPStatusError")
+        journal.mark_in_flight(run_id, (20, 2025))
+
+        assert journal.pending(run_id) == [(20, 2025)]
+        assert journal.failed(run_id) == [(10, 2024), ("abc", 2023)]
+        assert journal.failed(run_id, ["ReadTimeout"]) == [(10, 2024)]
+
+        summary = journal.summary(run_id)
+        assert (summary.planned, summary.in_flight) == (0, 1)
+        assert (summary.done, summary.failed) == (1, 2)
+        assert summary.errors == {"ReadTimeout": 1, "HTTPStatusError": 1}
+
+
+def test_journal_survives_reopen(tmp_path: Path):
+    """
+    Tests that an unfinished run is found again by a new journal (e.g. after a crash).
+    """
+    db_path = tmp_path / "journal.sqlite"
+    with TaskJournal(db_path) as journal:
+        finished = journal.start_run("event_matches", [(1, 2024)])
+        journal.finish_run(finished)
+        crashed = journal.start_run("event_matches", [(1, 2024), (2, 2024)])
+        journal.mark_in_flight(crashed, (1, 2024))
+
+    with TaskJournal(db_path) as journal:
+        run = journal.latest_run("event_matches", unfinished=True)
+        assert run.run_id == crashed
+        assert run.finished is None
+        assert journal.pending(crashed) == [(1, 2024), (2, 2024)]
+        assert journal.latest_run("players") is None
+
+
+def test_finished_run_supersedes_crashed_run(tmp_path: Path):
+    """
+    Tests that a crashed run is not resumed once a later run of the scraper finished.
+    """
+    with TaskJournal(tmp_path / "journal.sqlite") as journal:
+        crashed = journal.start_run("event_matches", [(1, 2024), (2, 2024)])
+        journal.mark_in_flight(crashed, (1, 2024))
+        completed = journal.start_run("event_matches", [(1, 2024)])
+        journal.finish_run(completed)
+
+        assert journal.latest_run("event_matches", unfinished=True) is None
+        assert journal.latest_run("event_matches").run_id == completed
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from src.utils.task_queue import Stage, run_stages, run_worker_pool
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_processes_all_items_with_bounded_concurrency():
+    """
+    Tests that every item is handled while never exceeding num_workers in flight.
+
+    Asserts:
+        All results are streamed to on_result and the peak concurrency is num_workers.
+    """
+    in_flight = 0
+    peak = 0
+    results = {}
+
+    async def handler(item: int) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return item * 2
+
+    processed = await run_worker_pool(
+        range(100),
+        handler,
+        num_workers=4,
+        on_result=lambda item, result: results.__setitem__(item, result),
+    )
+
+    assert processed == 100
+    assert results == {i: i * 2 for i in range(100)}
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_applies_backpressure_to_producer():
+    """
+    Tests that items are pulled lazily rather than all queued up front.
+
+    Asserts:
+        The producer never runs further ahead of the completed items than the
+        workers plus the queue can hold.
+    """
+    pulled = 0
+    completed = 0
+    max_lead = 0
+
+    def items():
+        nonlocal pulled
+        for i in range(200):
+            pulled += 1
+            yield i
+
+    async def handler(item: int) -> None:
+        nonlocal completed, max_lead
+        max_lead = max(max_lead, pulled - completed)
+        await asyncio.sleep(0.001)
+        completed += 1
+
+    await run_worker_pool(items(), handler, num_workers=2, queue_size=3)
+
+    assert pulled == 200
+    assert max_lead <= 2 + 3 + 1
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_propagates_handler_errors():
+    """
+    Tests that an unexpected handler error stops the pool instead of hanging.
+
+    Asserts:
+        The error is raised to the caller.
+    """
+
+    async def handler(item: int) -> None:
+        if item == 5:
+            raise ValueError("boom")
+
+    with pytest.raises(ExceptionGroup):
+        await run_worker_pool(range(20), handler, num_workers=3)
+
+
+@pytest.mark.asyncio
+async def test_run_stages_streams_items_through_every_stage():
+    """
+    Tests that emitted items reach the next stage before the first stage is done,
+    with each stage bounded by its own number of workers.
+
+    Asserts:
+        Every item is processed by every stage, the last stage starts before the
+        first one finishes and no stage exceeds its workers.
+    """
+    in_flight = {"split": 0, "square": 0}
+    peak = {"split": 0, "square": 0}
+    events = []
+    results = []
+
+    async def track(stage: str) -> None:
+        in_flight[stage] += 1
+        peak[stage] = max(peak[stage], in_flight[stage])
+        await asyncio.sleep(0.001)
+        in_flight[stage] -= 1
+
+    async def split(item: int, emit) -> None:
+        await track("split")
+        events.append(("split", item))
+        for part in (item * 10, item * 10 + 1):
+            await emit(part)
+
+    async def square(item: int, emit) -> None:
+        await track("square")
+        events.append(("square", item))
+        results.append(item * item)
+
+    processed = await run_stages(
+        range(20), [Stage("split", split, 2), Stage("square", square, 3)]
+    )
+
+    assert processed == [20, 40]
+    assert sorted(results) == sorted(
+        (i * 10 + j) ** 2 for i in range(20) for j in (0, 1)
+    )
+    assert events.index(("square", 0)) < events.index(("split", 19))
+    assert peak == {"split": 2, "square": 3}
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from src.utils.io_handler import raw_meta_path, save_raw_json
+from src.utils.raw_catalog import RawCatalog
+from src.utils.write_behind import WriteBehindWriter
+
+
+def test_save_raw_json_failure_keeps_previous_file(tmp_path: Path):
+    """
+    Tests that a failed write never replaces or truncates the existing file.
+
+    Asserts:
+        The old contents survive and no temporary files are left behind.
+    """
+    filename = "events_2025.json"
+    assert save_raw_json({"old": True}, tmp_path, filename)
+
+    # sets are not JSON serialisable, so this save fails
+    assert save_raw_json({"new": {1, 2}}, tmp_path, filename) is False
+
+    assert json.loads((tmp_path / filename).read_text()) == {"old": True}
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [filename, raw_meta_path(tmp_path, filename).name]
+    )
+
+
+@pytest.mark.asyncio
+async def test_write_behind_writes_all_files_on_flush(tmp_path: Path):
+    """
+    Tests that queued payloads are all written and recorded once flushed.
+
+    Asserts:
+        Every file exists with the right contents, is in the catalog and the
+        stats report them as written.
+    """
+    with RawCatalog(tmp_path / "catalog.sqlite") as catalog:
+        async with WriteBehindWriter(max_pending=2, max_workers=2) as writer:
+            for i in range(10):
+                await writer.submit(
+                    [{"matchId": i}],
+                    tmp_path / "2025",
+                    f"event_matches_{i}.json",
+                    catalog,
+                )
+            await writer.flush()
+
+            stats = writer.stats()
+            assert stats.written == 10
+            assert stats.failed == 0
+            assert stats.pending == 0
+
+        for i in range(10):
+            filepath = tmp_path / "2025" / f"event_matches_{i}.json"
+            assert json.loads(filepath.read_text()) == [{"matchId": i}]
+            assert catalog.get(filepath).row_count == 1
+
+
+@pytest.mark.asyncio
+async def test_write_behind_counts_failed_writes(tmp_path: Path):
+    """
+    Tests that failed background writes are reported rather than lost.
+
+    Asserts:
+        The failed write is counted.
+    """
+    async with WriteBehindWriter() as writer:
+        await writer.submit({"bad": {1}}, tmp_path, "bad.json")
+        await writer.flush()
+
+        assert writer.stats().failed == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_after_write_already_finished(tmp_path: Path):
+    """
+    Tests that flush returns when a write has finished in the thread pool but its
+    completion has not been processed by the event loop yet.
+
+    Asserts:
+        flush completes and the write is counted.
+    """
+    async with WriteBehindWriter(max_workers=1) as writer:
+        await writer.submit([{"matchId": 1}], tmp_path, "event_matches_1.json")
+        # block the loop until the thread is done, so the completion is queued
+        # ahead of the flush task in the same loop iteration
+        time.sleep(0.2)
+        await asyncio.create_task(writer.flush())
+
+        assert writer.stats().written == 1
+        assert writer.stats().pending == 0
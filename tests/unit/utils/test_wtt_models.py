@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from src.utils.raw_catalog import count_rows
+from src.utils.wtt_models import (
+    EventRow,
+    MatchRecord,
+    count_payload_rows,
+    decode_event_rows,
+    decode_match_records,
+    split_match_rows,
+    to_match_records,
+)
+
+
+def test_decode_event_rows_ignores_unknown_fields():
+    """
+    Tests that event rows decode from bytes with unknown fields skipped.
+
+    Asserts:
+        The declared fields are read, the extra ones are not kept.
+    """
+    content = json.dumps(
+        [
+            {
+                "Count": 1,
+                "rows": [
+                    {
+                        "EventId": 2860,
+                        "EventName": "WTT Champions Doha",
+                        "StartDateTime": "2024-01-07T00:00:00",
+                        "EndDateTime": "2024-01-12T00:00:00",
+                        "Country": "QAT",
+                        "Extra": {"nested": [1, 2]},
+                    }
+                ],
+            }
+        ]
+    ).encode()
+
+    assert decode_event_rows(content) == [
+        EventRow(
+            EventId=2860,
+            EventName="WTT Champions Doha",
+            StartDateTime="2024-01-07T00:00:00",
+            EndDateTime="2024-01-12T00:00:00",
+        )
+    ]
+
+
+@pytest.mark.parametrize("payload", [{"error": "Not Found"}, [], [{"rows": "x"}]])
+def test_decode_event_rows_unexpected_payloads(payload):
+    """
+    Tests that payloads without the usual structure give no rows.
+    """
+    assert decode_event_rows(json.dumps(payload).encode()) == []
+
+
+def test_decode_match_records_reads_match_card():
+    """
+    Tests that the match_card fields are exposed through .card and rows
+    that are not objects are dropped.
+    """
+    content = json.dumps(
+        [
+            "not a match",
+            {
+                "documentCode": "TTEMSINGLES",
+                "match_card": {
+                    "eventId": "2860",
+                    "overallScores": "3-1",
+                    "gameScores": "11-7,9-11,11-5,11-3",
+                    "competitiors": [
+                        {"competitorType": "H", "competitorId": 101, "players": []}
+                    ],
+                },
+            },
+        ]
+    ).encode()
+
+    records = decode_match_records(content)
+
+    assert len(records) == 1
+    assert records[0].documentCode == "TTEMSINGLES"
+    assert records[0].card.eventId == "2860"
+    assert records[0].card.competitiors[0].competitorId == 101
+
+
+def test_flat_record_is_its_own_card():
+    """
+    Tests that a row without match_card exposes its own fields through .card.
+    """
+    (record,) = to_match_records([{"documentCode": "M1", "resultOverallScores": "3-0"}])
+
+    assert isinstance(record, MatchRecord)
+    assert record.card is record
+    assert record.card.resultOverallScores == "3-0"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [{"Count": 2, "rows": [{"EventId": 1}, {"EventId": 2}]}],
+        [{"Count": 0, "rows": None}],
+        [{"documentCode": "A"}, {"documentCode": "B"}, {"documentCode": "C"}],
+        [],
+        {"error": "Not Found"},
+        ["a", "b"],
+    ],
+)
+def test_count_payload_rows_matches_count_rows(payload):
+    """
+    Tests that counting on the raw bytes agrees with count_rows on the decoded payload.
+    """
+    assert count_payload_rows(json.dumps(payload).encode()) == count_rows(payload)
+
+
+def test_split_match_rows_keys_rows_by_document_code():
+    """
+    Tests that a payload is split into its rows, keyed like get_match_detail_tasks.
+
+    Asserts:
+        The match_card documentCode wins over the row's own, a row without one
+        is keyed by its position, and each row span decodes to the original row.
+    """
+    payload = [
+        {"documentCode": "ROW", "match_card": {"documentCode": "CARD"}},
+        {"documentCode": "M2", "match_card": None},
+        {"overallScores": "3-0"},
+    ]
+
+    rows = split_match_rows(json.dumps(payload, indent=4).encode())
+
+    assert [key for key, _ in rows] == ["CARD", "M2", "#2"]
+    assert [json.loads(raw) for _, raw in rows] == payload